@@ -79,6 +79,7 @@ COMMONS_ARGS = ['encoding', 'fee_per_kb', 'regular_dust_size',
 
 API_MAX_LOG_SIZE = 10 * 1024 * 1024 #max log size of 20 MB before rotation (make configurable later)
 API_MAX_LOG_COUNT = 10
+API_DB_POOL_TIMEOUT = 30 # seconds a request waits for a database connection
 JSON_RPC_ERROR_API_COMPOSE = -32001 #code to use for error composing transaction result
 
 current_api_status_code = None #is updated by the APIStatusPoller
@@ -119,7 +120,6 @@ def check_database_state(db, blockcount):
 # TODO: ALL queries EVERYWHERE should be done with these methods
 def db_query(db, statement, bindings=(), callback=None, **callback_args):
     """Allow direct access to the database in a parametrized manner."""
-    cursor = db.cursor()
 
     # Sanitize.
     forbidden_words = ['pragma', 'attach', 'database', 'begin', 'transaction']
@@ -128,14 +128,13 @@ def db_query(db, statement, bindings=(), callback=None, **callback_args):
         if re.search(r"\b"+word+"\b", statement.lower()):
             raise APIError("Forbidden word in query: '{}'.".format(word))
 
+    # Dicts, for JSON and the `adjust_*()` functions.
     if hasattr(callback, '__call__'):
-        cursor.execute(statement, bindings)
-        for row in cursor:
+        for row in database.dict_rows(db, statement, bindings):
             callback(row, **callback_args)
         results = None
     else:
-        results = list(cursor.execute(statement, bindings))
-    cursor.close()
+        results = list(database.dict_rows(db, statement, bindings))
     return results
 
 def get_rows(db, table, filters=None, filterop='AND', order_by=None, order_dir=None, start_block=None, end_block=None,
@@ -489,6 +488,10 @@ class APIStatusPoller(threading.Thread):
 
         while self.stop_event.is_set() != True:
             try:
+                # Check that the database passed the checks deferred at startup, if any.
+                code = 13
+                database.check_integrity_status()
+
                 # Check that backend is running, communicable, and caught up with the blockchain.
                 # Check that the database has caught up with bitcoind.
                 if time.time() - self.last_database_check > 10 * 60: # Ten minutes since last check.
@@ -500,7 +503,7 @@ class APIStatusPoller(threading.Thread):
                         logger.debug('Checking database state.')
                         check_database_state(db, backend.getblockcount())
                         self.last_database_check = time.time()
-            except (BackendError, DatabaseError) as e:
+            except (BackendError, DatabaseError, database.DatabaseIntegrityError) as e:
                 exception_name = e.__class__.__name__
                 exception_text = str(e)
                 logger.debug("API Status Poller: %s", exception_text)
@@ -513,23 +516,46 @@ class APIStatusPoller(threading.Thread):
             time.sleep(config.BACKEND_POLL_INTERVAL)
 
 class APIServer(threading.Thread):
-    """Handle JSON-RPC API calls."""
+    """Handle JSON-RPC API calls.
+
+    Each request reads from a connection of `self.pool`, unless a connection
+    is given, which is then shared by all the requests."""
     def __init__(self, db=None):
         self.db = db
+        self.pool = None
         self.is_ready = False
         threading.Thread.__init__(self)
         self.stop_event = threading.Event()
 
+    @property
+    def db(self):
+        if self._db is None and self.pool is not None:
+            return self.pool.get()
+        return self._db
+
+    @db.setter
+    def db(self, db):
+        self._db = db
+
     def stop(self):
         self.join()
         self.stop_event.set()
 
     def run(self):
         logger.info('Starting API Server.')
-        self.db = self.db or database.get_connection(read_only=True, integrity_check=False)
+        if self._db is None:
+            if config.API_DB_POOL_SIZE:
+                self.pool = database.ConnectionPool(config.API_DB_POOL_SIZE, timeout=API_DB_POOL_TIMEOUT)
+            else:
+                self.db = database.get_connection(read_only=True, integrity_check=False)
         app = flask.Flask(__name__)
         auth = HTTPBasicAuth()
 
+        @app.teardown_request
+        def release_db(exception):
+            if self.pool is not None:
+                self.pool.release(discard=isinstance(exception, apsw.Error))
+
         @auth.get_password
         def get_pw(username):
             if username == config.RPC_USER:
@@ -799,7 +825,8 @@ class APIServer(threading.Thread):
                 'running_testcoin': config.TESTCOIN,
                 'version_major': config.VERSION_MAJOR,
                 'version_minor': config.VERSION_MINOR,
-                'version_revision': config.VERSION_REVISION
+                'version_revision': config.VERSION_REVISION,
+                'db_integrity_check': dict(database.INTEGRITY_CHECK, errors=database.INTEGRITY_CHECK['errors'][:10])
             }
 
         @dispatcher.add_method
@@ -1138,7 +1165,10 @@ class APIServer(threading.Thread):
         self.is_ready = True
         app.run(host=config.RPC_HOST, port=config.RPC_PORT, threaded=True)
 
-        self.db.close()
+        if self.pool is not None:
+            self.pool.close()
+        if self._db is not None:
+            self._db.close()
         return
 
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
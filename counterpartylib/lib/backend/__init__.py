@@ -9,7 +9,7 @@ from decimal import Decimal as D
 
 import bitcoin as bitcoinlib
 import bitcoin.rpc as bitcoinlib_rpc
-from bitcoin.core import CBlock
+from bitcoin.core import CBlock, CBlockHeader
 
 from counterpartylib.lib import util
 from counterpartylib.lib import script
@@ -55,6 +55,10 @@ def getblock(block_hash):
     block_hex = BACKEND().getblock(block_hash)
     return CBlock.deserialize(util.unhexlify(block_hex))
 
+def getblockheader(block_hash):
+    header_hex = BACKEND().getblockheader(block_hash)
+    return CBlockHeader.deserialize(util.unhexlify(header_hex))
+
 def cache_pretx(txid, rawtx):
     PRETX_CACHE[binascii.hexlify(txid).decode('utf8')] = binascii.hexlify(rawtx).decode('utf8')
 
@@ -127,12 +131,12 @@ def is_valid(address):
 def get_txhash_list(block):
     return [bitcoinlib.core.b2lx(ctx.GetHash()) for ctx in block.vtx]
 
-def get_tx_list(block):
+def get_tx_list(block, block_index=None):
     raw_transactions = {}
     tx_hash_list = []
 
     for ctx in block.vtx:
-        if util.enabled('correct_segwit_txids'):
+        if util.enabled('correct_segwit_txids', block_index=block_index):
             hsh = ctx.GetTxid()
         else:
             hsh = ctx.GetHash()
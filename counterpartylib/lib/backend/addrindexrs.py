@@ -156,6 +156,9 @@ def getblockhash(blockcount):
 def getblock(block_hash):
     return rpc('getblock', [block_hash, False])
 
+def getblockheader(block_hash):
+    return rpc('getblockheader', [block_hash, False])
+
 def getrawtransaction(tx_hash, verbose=False, skip_missing=False):
     return getrawtransaction_batch([tx_hash], verbose=verbose, skip_missing=skip_missing)[tx_hash]
 
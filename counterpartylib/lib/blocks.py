@@ -18,6 +18,15 @@ import apsw
 import csv
 import copy
 import http
+import queue
+import threading
+import multiprocessing
+import signal
+import atexit
+try:
+    import zmq
+except ImportError:
+    zmq = None
 
 import bitcoin as bitcoinlib
 from bitcoin.core.script import CScriptInvalidError
@@ -30,6 +39,10 @@ from counterpartylib.lib import script
 from counterpartylib.lib import backend
 from counterpartylib.lib import log
 from counterpartylib.lib import database
+from counterpartylib.lib import outpoints
+from counterpartylib.lib import snapshots
+from counterpartylib.lib import supplies
+from counterpartylib.lib import expirations
 from counterpartylib.lib import message_type
 from counterpartylib.lib import arc4
 from counterpartylib.lib.transaction_helper import p2sh_encoding
@@ -55,6 +68,11 @@ TABLES = ['credits', 'debits', 'messages'] + \
 UNDOLOG_TABLES = copy.copy(TABLES)
 UNDOLOG_TABLES.remove('messages')
 UNDOLOG_TABLES += ['balances']
+UNDOLOG_ENABLED = True  # see `disable_undolog()`
+# The undolog records, for each change of a row of these tables, the table,
+# the operation, the rowid, and for updates and deletes the values of the
+# columns before the change (`v1`, `v2`…, in the order of the columns).
+UNDOLOG_INSERT, UNDOLOG_UPDATE, UNDOLOG_DELETE = 0, 1, 2
 
 CURR_DIR = os.path.dirname(os.path.realpath(__file__))
 with open(CURR_DIR + '/../mainnet_burns.csv', 'r') as f:
@@ -149,24 +167,7 @@ def parse_tx(db, tx):
         cursor.close()
 
 
-def parse_block(db, block_index, block_time,
-                previous_ledger_hash=None, ledger_hash=None,
-                previous_txlist_hash=None, txlist_hash=None,
-                previous_messages_hash=None):
-    """Parse the block, return hash of new ledger, txlist and messages.
-
-    The unused arguments `ledger_hash` and `txlist_hash` are for the test suite.
-    """
-    undolog_cursor = db.cursor()
-    #remove the row tracer and exec tracer on this cursor, so we don't utilize them with undolog operations...
-    undolog_cursor.setexectrace(None)
-    undolog_cursor.setrowtrace(None)
-
-    util.BLOCK_LEDGER = []
-    database.BLOCK_MESSAGES = []
-
-    assert block_index == util.CURRENT_BLOCK_INDEX
-
+def update_undolog(undolog_cursor, block_index):
     # Remove undolog records for any block older than we should be tracking
     undolog_oldest_block_index = block_index - config.UNDOLOG_MAX_PAST_BLOCKS
     first_undo_index = list(undolog_cursor.execute('''SELECT first_undo_index FROM undolog_block WHERE block_index == ?''',
@@ -183,42 +184,233 @@ def parse_block(db, block_index, block_time,
     else:
         undolog_cursor.execute('''INSERT OR REPLACE INTO undolog_block(block_index, first_undo_index)
             VALUES(?,?)''', (block_index, 1,))
+
+def parse_block(db, block_index, block_time,
+                previous_ledger_hash=None, ledger_hash=None,
+                previous_txlist_hash=None, txlist_hash=None,
+                previous_messages_hash=None):
+    """Parse the block, return hash of new ledger, txlist and messages.
+
+    The unused arguments `ledger_hash` and `txlist_hash` are for the test suite.
+    """
+    undolog_cursor = db.cursor()
+    #remove the row tracer and exec tracer on this cursor, so we don't utilize them with undolog operations...
+    undolog_cursor.setexectrace(None)
+    undolog_cursor.setrowtrace(None)
+
+    assert block_index == util.CURRENT_BLOCK_INDEX
+
+    # The consensus hashes are fed with the entries of the block as they are
+    # produced.
+    txlist = check.consensus_hasher(db, 'txlist_hash', previous_txlist_hash)
+    util.BLOCK_LEDGER = check.consensus_hasher(db, 'ledger_hash', previous_ledger_hash)
+    database.BLOCK_MESSAGES = check.consensus_hasher(db, 'messages_hash', previous_messages_hash)
+    log.reset_message_index()
+
+    # The balances are written back to the database at the end of the block
+    # (see `util.credit()`), or forgotten if parsing fails.
+    util.flush_balances()
+    util.reset_balances()
+
+    if UNDOLOG_ENABLED:
+        update_undolog(undolog_cursor, block_index)
     undolog_cursor.close()
 
-    # Expire orders, bets and rps.
-    order.expire(db, block_index)
-    bet.expire(db, block_index, block_time)
-    rps.expire(db, block_index)
+    try:
+        # Expire orders, bets and rps.
+        order.expire(db, block_index)
+        bet.expire(db, block_index, block_time)
+        rps.expire(db, block_index)
+
+        # Parse transactions, sorting them by type.
+        cursor = database.row_cursor(db)
+        cursor.execute('''SELECT * FROM transactions \
+                          WHERE block_index=? ORDER BY tx_index''',
+                       (block_index,))
+        for tx in list(cursor):
+            try:
+                parse_tx(db, tx)
+                txlist.append('{}{}{}{}{}{}'.format(tx['tx_hash'], tx['source'], tx['destination'],
+                                                    tx['btc_amount'], tx['fee'],
+                                                    binascii.hexlify(tx['data']).decode('UTF-8')))
+            except exceptions.ParseTransactionError as e:
+                logger.warn('ParseTransactionError for tx %s: %s' % (tx['tx_hash'], e))
+                raise e
+                #pass
 
-    # Parse transactions, sorting them by type.
+        cursor.close()
+        util.flush_balances()
+    except:
+        util.reset_balances()
+        raise
+    util.reset_balances()
+
+    # Calculate consensus hashes.
     cursor = db.cursor()
-    cursor.execute('''SELECT * FROM transactions \
-                      WHERE block_index=? ORDER BY tx_index''',
-                   (block_index,))
-    txlist = []
-    for tx in list(cursor):
-        try:
-            parse_tx(db, tx)
-            txlist.append('{}{}{}{}{}{}'.format(tx['tx_hash'], tx['source'], tx['destination'],
-                                                tx['btc_amount'], tx['fee'],
-                                                binascii.hexlify(tx['data']).decode('UTF-8')))
-        except exceptions.ParseTransactionError as e:
-            logger.warn('ParseTransactionError for tx %s: %s' % (tx['tx_hash'], e))
-            raise e
-            #pass
+    block = list(cursor.execute('''SELECT * FROM blocks WHERE block_index = ?''', (block_index,)))[0]
+    cursor.close()
+    new_txlist_hash, found_txlist_hash = check.consensus_hash(db, 'txlist_hash', previous_txlist_hash, txlist, block)
+    new_ledger_hash, found_ledger_hash = check.consensus_hash(db, 'ledger_hash', previous_ledger_hash, util.BLOCK_LEDGER, block)
+    new_messages_hash, found_messages_hash = check.consensus_hash(db, 'messages_hash', previous_messages_hash, database.BLOCK_MESSAGES, block)
+    util.BLOCK_LEDGER = []
+    database.BLOCK_MESSAGES = []
+
+    return new_ledger_hash, new_txlist_hash, new_messages_hash, found_messages_hash
+
 
+def create_undolog_triggers(cursor):
+    # The old values are stored one per column (`v1`, `v2`, ...), not packed
+    # with `json_array()`: JSON cannot hold the BLOB memos of sends and sweeps,
+    # and renders REAL values (`target_value`, `value`, `call_price`) with 15
+    # significant digits, so they would not always be restored exactly. The
+    # columns keep the values as they were, with their types, and restoring
+    # them decodes nothing.
+    undolog_columns = [column['name'] for column in cursor.execute('''PRAGMA table_info(undolog)''')]
+    for table in UNDOLOG_TABLES:
+        columns = [column['name'] for column in cursor.execute('''PRAGMA table_info({})'''.format(table))]
+        values = ['v{}'.format(i + 1) for i in range(len(columns))]
+        for value in values:
+            if value not in undolog_columns:
+                cursor.execute('''ALTER TABLE undolog ADD COLUMN {}'''.format(value))
+                undolog_columns.append(value)
+
+        cursor.execute('''CREATE TRIGGER IF NOT EXISTS _{}_insert AFTER INSERT ON {} BEGIN
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('{}', {}, new.rowid);
+                            END;
+                       '''.format(table, table, table, UNDOLOG_INSERT))
+
+        for op, trigger_type, when in ((UNDOLOG_UPDATE, 'update', 'AFTER'), (UNDOLOG_DELETE, 'delete', 'BEFORE')):
+            cursor.execute('''CREATE TRIGGER IF NOT EXISTS _{}_{} {} {} ON {} BEGIN
+                                INSERT INTO undolog(table_name, op, row_id, {}) VALUES('{}', {}, old.rowid, {});
+                                END;
+                           '''.format(table, trigger_type, when, trigger_type.upper(), table,
+                                      ','.join(values), table, op, ','.join('old.{}'.format(c) for c in columns)))
+
+def migrate_undolog(db):
+    """Convert the undolog from the former format, where each record was the
+    SQL statement undoing a change."""
+    cursor = db.cursor()
+    cursor.setexectrace(None)
+    columns = [column['name'] for column in cursor.execute('''PRAGMA table_info(undolog)''')]
+    if 'sql' not in columns:
+        cursor.close()
+        return
+    logger.info('Converting the undolog.')
+    records = list(cursor.execute('''SELECT undo_index, sql FROM undolog ORDER BY undo_index'''))
+    sequence = list(cursor.execute('''SELECT seq FROM sqlite_sequence WHERE name = 'undolog' '''))
+
+    drop_undolog_triggers(cursor)
+    cursor.execute('''DROP TABLE undolog''')
+    create_undolog_table(cursor)
+    create_undolog_triggers(cursor)
+
+    for record in records:
+        undo_index, sql = record['undo_index'], record['sql']
+        if sql.startswith('DELETE FROM '):
+            table, row_id = sql[len('DELETE FROM '):].split(' WHERE rowid=')
+            cursor.execute('''INSERT INTO undolog(undo_index, table_name, op, row_id) VALUES(?, ?, ?, ?)''',
+                           (undo_index, table, UNDOLOG_INSERT, int(row_id)))
+            continue
+
+        # Have SQLite evaluate the values, on a copy of the table.
+        if sql.startswith('UPDATE '):
+            op, table = UNDOLOG_UPDATE, sql.split(' ')[1]
+            row_id = int(sql.rsplit(' WHERE rowid=', 1)[1])
+        else:
+            op, table = UNDOLOG_DELETE, sql[len('INSERT INTO '):].split('(')[0]
+            row_id = None
+        cursor.execute('''CREATE TEMP TABLE undolog_stage AS SELECT * FROM main.{} WHERE 0'''.format(table))
+        if op == UNDOLOG_UPDATE:
+            cursor.execute('''INSERT INTO temp.undolog_stage(rowid) VALUES(?)''', (row_id,))
+            cursor.execute('''UPDATE temp.undolog_stage ''' + sql[len('UPDATE {} '.format(table)):])
+        else:
+            cursor.execute('''INSERT INTO temp.undolog_stage''' + sql[len('INSERT INTO {}'.format(table)):])
+        values = list(list(cursor.execute('''SELECT rowid, * FROM temp.undolog_stage'''))[0].values())
+        cursor.execute('''DROP TABLE temp.undolog_stage''')
+        row_id, values = values[0], values[1:]
+        cursor.execute('''INSERT INTO undolog(undo_index, table_name, op, row_id, {}) VALUES(?, ?, ?, ?, {})'''.format(
+                           ','.join('v{}'.format(i + 1) for i in range(len(values))), ','.join('?' * len(values))),
+                       [undo_index, table, op, row_id] + values)
+
+    # Keep allocating the same undo indexes.
+    if sequence:
+        cursor.execute('''UPDATE sqlite_sequence SET seq = ? WHERE name = 'undolog' ''', (sequence[0]['seq'],))
     cursor.close()
 
-    # Calculate consensus hashes.
-    new_txlist_hash, found_txlist_hash = check.consensus_hash(db, 'txlist_hash', previous_txlist_hash, txlist)
-    new_ledger_hash, found_ledger_hash = check.consensus_hash(db, 'ledger_hash', previous_ledger_hash, util.BLOCK_LEDGER)
-    new_messages_hash, found_messages_hash = check.consensus_hash(db, 'messages_hash', previous_messages_hash, database.BLOCK_MESSAGES)
+def create_undolog_table(cursor):
+    cursor.execute('''CREATE TABLE IF NOT EXISTS undolog(
+                        undo_index INTEGER PRIMARY KEY AUTOINCREMENT,
+                        table_name TEXT,
+                        op INTEGER,
+                        row_id INTEGER)
+                   ''')
 
-    return new_ledger_hash, new_txlist_hash, new_messages_hash, found_messages_hash
+def rollback_undolog(cursor, first_undo_index):
+    """Undo the changes recorded from `first_undo_index` on, table by table:
+    each row changed is put back as it was before its first change."""
+    last_undo_index = list(cursor.execute('''SELECT MAX(undo_index) FROM undolog'''))[0][0]
+    if last_undo_index is None:
+        return
+    # Rows are deleted and inserted again in no particular order.
+    cursor.execute('''PRAGMA defer_foreign_keys = ON''')
+
+    tables = [row[0] for row in cursor.execute('''SELECT DISTINCT table_name FROM undolog
+                                                  WHERE undo_index BETWEEN ? AND ?''', (first_undo_index, last_undo_index))]
+    for table in tables:
+        columns = [column[1] for column in cursor.execute('''PRAGMA table_info({})'''.format(table))]
+        values = ['v{}'.format(i + 1) for i in range(len(columns))]
+        first_changes = list(cursor.execute('''SELECT op, row_id, {} FROM undolog WHERE undo_index IN
+                                                (SELECT MIN(undo_index) FROM undolog
+                                                 WHERE table_name = ? AND undo_index BETWEEN ? AND ?
+                                                 GROUP BY row_id)'''.format(','.join(values)),
+                                            (table, first_undo_index, last_undo_index)))
+
+        inserted = [(change[1],) for change in first_changes if change[0] == UNDOLOG_INSERT]
+        updated = [change[2:] + (change[1],) for change in first_changes if change[0] == UNDOLOG_UPDATE]
+        deleted = [change[1:] for change in first_changes if change[0] == UNDOLOG_DELETE]
+        # A row deleted may have been inserted again since.
+        cursor.executemany('''DELETE FROM {} WHERE rowid = ?'''.format(table), inserted + [change[:1] for change in deleted])
+        cursor.executemany('''UPDATE {} SET {} WHERE rowid = ?'''.format(
+                               table, ','.join('{} = ?'.format(column) for column in columns)), updated)
+        cursor.executemany('''INSERT INTO {}(rowid, {}) VALUES(?, {})'''.format(
+                               table, ','.join(columns), ','.join('?' * len(columns))), deleted)
+        logger.debug('Undolog: {}: {} rows deleted, {} updated, {} inserted.'.format(
+                     table, len(inserted), len(updated), len(deleted)))
+
+def drop_undolog_triggers(cursor):
+    for table in UNDOLOG_TABLES:
+        for trigger_type in ('insert', 'update', 'delete'):
+            cursor.execute('''DROP TRIGGER IF EXISTS _{}_{}'''.format(table, trigger_type))
+
+def disable_undolog(db):
+    """Stop logging undo records, for as long as the last blocks parsed can’t
+    be rolled back anyway.
+
+    The undolog is emptied along with the triggers, so that it never covers
+    the blocks parsed without it: rolling back past the first block logged
+    afterwards (including after a crash) requires a full reparse."""
+    global UNDOLOG_ENABLED
+    cursor = db.cursor()
+    cursor.setexectrace(None)
+    with db:
+        drop_undolog_triggers(cursor)
+        cursor.execute('''DELETE FROM undolog''')
+        cursor.execute('''DELETE FROM undolog_block''')
+    cursor.close()
+    UNDOLOG_ENABLED = False
 
+def enable_undolog(db):
+    global UNDOLOG_ENABLED
+    cursor = db.cursor()
+    cursor.setexectrace(None)
+    with db:
+        create_undolog_triggers(cursor)
+    cursor.close()
+    UNDOLOG_ENABLED = True
 
 def initialise(db):
     """Initialise data, create and populate the database."""
+    global UNDOLOG_ENABLED
     cursor = db.cursor()
 
     # Blocks
@@ -334,15 +526,20 @@ def initialise(db):
                       asset TEXT,
                       quantity INTEGER)
                    ''')
-    cursor.execute('''CREATE INDEX IF NOT EXISTS
+    # One row per (address, asset). The table keeps its rowids: the undolog
+    # refers to them, and they order the balances of an asset.
+    # Databases from before the index was unique are migrated.
+    for index in list(cursor.execute('''PRAGMA index_list(balances)''')):
+        if index['name'] == 'address_asset_idx' and not index['unique']:
+            duplicates = list(cursor.execute('''SELECT address, asset FROM balances
+                                                GROUP BY address, asset HAVING COUNT(*) > 1 LIMIT 1'''))
+            if duplicates:
+                raise exceptions.DatabaseError('Duplicate balance for {} {}: reparse the database.'.format(
+                    duplicates[0]['address'], duplicates[0]['asset']))
+            cursor.execute('''DROP INDEX address_asset_idx''')
+    cursor.execute('''CREATE UNIQUE INDEX IF NOT EXISTS
                       address_asset_idx ON balances (address, asset)
                    ''')
-    cursor.execute('''CREATE INDEX IF NOT EXISTS
-                      address_idx ON balances (address)
-                   ''')
-    cursor.execute('''CREATE INDEX IF NOT EXISTS
-                      asset_idx ON balances (asset)
-                   ''')
 
     # Assets
     # TODO: Store more asset info here?!
@@ -416,33 +613,22 @@ def initialise(db):
                    ''')
 
     # Create undolog tables
-    cursor.execute('''CREATE TABLE IF NOT EXISTS undolog(
-                        undo_index INTEGER PRIMARY KEY AUTOINCREMENT,
-                        sql TEXT)
-                   ''')
+    create_undolog_table(cursor)
+    migrate_undolog(db)
     cursor.execute('''CREATE TABLE IF NOT EXISTS undolog_block(
                         block_index INTEGER PRIMARY KEY,
                         first_undo_index INTEGER)
                    ''')
     # Create undolog triggers for all tables in TABLES list, plus the 'balances' table
-    for table in UNDOLOG_TABLES:
-        columns = [column['name'] for column in cursor.execute('''PRAGMA table_info({})'''.format(table))]
-        cursor.execute('''CREATE TRIGGER IF NOT EXISTS _{}_insert AFTER INSERT ON {} BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM {} WHERE rowid='||new.rowid);
-                            END;
-                       '''.format(table, table, table))
+    create_undolog_triggers(cursor)
+    UNDOLOG_ENABLED = True
 
-        columns_parts = ["{}='||quote(old.{})||'".format(c, c) for c in columns]
-        cursor.execute('''CREATE TRIGGER IF NOT EXISTS _{}_update AFTER UPDATE ON {} BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE {} SET {} WHERE rowid='||old.rowid);
-                            END;
-                       '''.format(table, table, table, ','.join(columns_parts)))
+    # Running totals of the assets
+    supplies.initialise(db)
+
+    # Schedule of the expirations
+    expirations.initialise(db)
 
-        columns_parts = ["'||quote(old.{})||'".format(c) for c in columns]
-        cursor.execute('''CREATE TRIGGER IF NOT EXISTS _{}_delete BEFORE DELETE ON {} BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO {}(rowid,{}) VALUES('||old.rowid||',{})');
-                            END;
-                       '''.format(table, table, table, ','.join(columns), ','.join(columns_parts)))
     # Drop undolog tables on messages table if they exist (fix for adding them in 9.52.0)
     for trigger_type in ('insert', 'update', 'delete'):
         cursor.execute("DROP TRIGGER IF EXISTS _messages_{}".format(trigger_type))
@@ -460,23 +646,241 @@ def initialise(db):
 
     cursor.close()
 
-def get_tx_info(tx_hex, block_parser=None, block_index=None, db=None):
+DECODE_POOL = None
+
+class PrevoutsMissing(DecodeError):
+    pass
+
+class BlockPrevouts(object):
+    """Resolve the outputs spent by the transactions of a block. Outputs created
+    in the block itself are served from it, the others are fetched from the
+    backend in one batch (see `get_block_tx_info()`)."""
+
+    def __init__(self, raw_transactions):
+        self.raw_transactions = dict(raw_transactions)
+        self.transactions = {}
+        self.collect = False
+        self.missing = False
+
+    def fetch(self, tx_hashes):
+        tx_hashes = [tx_hash for tx_hash in set(tx_hashes) if tx_hash not in self.raw_transactions and tx_hash not in backend.PRETX_CACHE]
+        if not tx_hashes:
+            return
+        try:
+            raw_transactions = backend.getrawtransaction_batch(tx_hashes, skip_missing=True)
+        except Exception as e:
+            # Missing prevouts are fetched (and fail) one by one, as before.
+            logger.warning('Failed to batch fetch {} prevouts: {}'.format(len(tx_hashes), e))
+            return
+        for tx_hash, tx_hex in raw_transactions.items():
+            if tx_hex is not None:
+                self.raw_transactions[tx_hash] = tx_hex
+
+    def get_tx(self, tx_hash):
+        if tx_hash not in self.transactions:
+            if tx_hash in self.raw_transactions:
+                tx_hex = self.raw_transactions[tx_hash]
+            elif self.collect:
+                self.missing = True
+                raise PrevoutsMissing(tx_hash)
+            else:
+                tx_hex = backend.getrawtransaction(tx_hash)
+            self.transactions[tx_hash] = backend.deserialize(tx_hex)
+        return self.transactions[tx_hash]
+
+    def get_txout(self, tx_hash, n):
+        if tx_hash not in self.raw_transactions:
+            txout = outpoints.get_txout(tx_hash, n)
+            if txout is not None:
+                return txout
+        return self.get_tx(tx_hash).vout[n]
+
+def get_prevout(vin, block_parser=None, prevouts=None):
+    """Get the output (`scriptPubKey` and `nValue`) spent by an input."""
+    if block_parser:
+        vin_tx = block_parser.read_raw_transaction(ib2h(vin.prevout.hash))
+        vin_ctx = backend.deserialize(vin_tx['__data__'])
+    elif prevouts is not None:
+        return prevouts.get_txout(ib2h(vin.prevout.hash), vin.prevout.n)
+    else:
+        txout = outpoints.get_txout(ib2h(vin.prevout.hash), vin.prevout.n)
+        if txout is not None:
+            return txout
+        vin_tx = backend.getrawtransaction(ib2h(vin.prevout.hash))
+        vin_ctx = backend.deserialize(vin_tx)
+    return vin_ctx.vout[vin.prevout.n]
+
+def decode_tx(job):
+    """Decode a transaction without the database, nor the backend: the
+    transactions it spends from are looked up in `prevout_transactions` (and in
+    the outpoint index). Returns `('tx_info', tx_info)`, `('swap', outputs)` for
+    BTC‐only transactions (their dispensers are checked against the database
+    afterwards), or `('missing', prevout_hashes)`.
+
+    Runs in the decoding processes when `config.TX_DECODE_WORKERS > 1`."""
+    tx_hex, block_index, prevout_transactions = job
+    util.CURRENT_BLOCK_INDEX = block_index
+
+    prevouts = BlockPrevouts(prevout_transactions)
+    prevouts.collect = True
+    try:
+        return 'tx_info', _get_tx_info(tx_hex, prevouts=prevouts)
+    except DecodeError as e:
+        if prevouts.missing:
+            ctx = backend.deserialize(tx_hex)
+            return 'missing', [ib2h(vin.prevout.hash) for vin in ctx.vin]
+    except BTCOnlyError as e:
+        if util.enabled('dispensers'):
+            try:
+                return 'swap', _get_swap_outputs(e.decodedTx)
+            except:
+                pass
+    return 'tx_info', (b'', None, None, None, None, None)
+
+def _initialise_decode_worker(config_values):
+    # Shutdown is handled by the parent process.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    vars(config).update(config_values)
+
+def start_decode_pool():
+    """Start the transaction decoding processes, if configured and not started
+    yet. They are spawned rather than forked, since the server has threads
+    (API, backend notifications, block prefetching) running by then, and get
+    the configuration as it is now."""
+    global DECODE_POOL
+
+    if DECODE_POOL is not None or config.TX_DECODE_WORKERS <= 1:
+        return
+
+    logger.debug('Starting {} transaction decoding processes.'.format(config.TX_DECODE_WORKERS))
+    config_values = dict((key, value) for key, value in vars(config).items() if key.isupper())
+    context = multiprocessing.get_context('spawn')
+    DECODE_POOL = context.Pool(config.TX_DECODE_WORKERS, initializer=_initialise_decode_worker, initargs=(config_values,))
+
+def stop_decode_pool():
+    """Stop the transaction decoding processes, if started."""
+    global DECODE_POOL
+
+    if DECODE_POOL is None:
+        return
+
+    logger.debug('Stopping the transaction decoding processes.')
+    DECODE_POOL.close()
+    DECODE_POOL.join()
+    DECODE_POOL = None
+atexit.register(stop_decode_pool)
+
+def decode_transactions(jobs):
+    """Run `decode_tx()` on every job, in order."""
+    if config.TX_DECODE_WORKERS <= 1:
+        return [decode_tx(job) for job in jobs]
+
+    start_decode_pool()
+    chunksize = max(1, len(jobs) // (config.TX_DECODE_WORKERS * 4))
+    return DECODE_POOL.map(decode_tx, jobs, chunksize=chunksize)
+
+def _get_dispense_outputs(db, outputs):
+    """Filter the outputs of a BTC‐only transaction down to the dispensable ones,
+    `None` if that can’t be decided."""
+    try:
+        return [(destination, btc_amount) for destination, btc_amount in outputs if dispenser.is_dispensable(db, destination, btc_amount)]
+    except:
+        return None
+
+def get_block_tx_info(db, txhash_list, raw_transactions):
+    """Get the transaction info of all the transactions of a block, fetching the
+    outputs they spend with a single backend call. Returns a dict by tx hash."""
+    block_index = util.CURRENT_BLOCK_INDEX
+    prevouts = BlockPrevouts(raw_transactions)
+
+    # Decode what can be decoded without the backend.
+    jobs = [(raw_transactions[tx_hash], block_index, {}) for tx_hash in txhash_list]
+    decoded = dict(zip(txhash_list, decode_transactions(jobs)))
+
+    # Check for dispenses, and collect the inputs of the transactions that
+    # need them.
+    dispenses = {}
+    prevout_hashes = set()
+    for tx_hash in txhash_list:
+        kind, result = decoded[tx_hash]
+        if kind == 'missing':
+            prevout_hashes.update(result)
+        elif kind == 'swap':
+            dispenses[tx_hash] = _get_dispense_outputs(db, result)
+            if dispenses[tx_hash]:
+                ctx = backend.deserialize(raw_transactions[tx_hash])
+                prevout_hashes.update(ib2h(vin.prevout.hash) for vin in ctx.vin)
+    prevouts.fetch(prevout_hashes)
+
+    # Decode the transactions that needed the outputs they spend.
+    missing = [tx_hash for tx_hash in txhash_list if decoded[tx_hash][0] == 'missing']
+    jobs = []
+    for tx_hash in missing:
+        prevout_transactions = dict((prevout_hash, prevouts.raw_transactions[prevout_hash]) for prevout_hash in decoded[tx_hash][1] if prevout_hash in prevouts.raw_transactions)
+        jobs.append((raw_transactions[tx_hash], block_index, prevout_transactions))
+    decoded.update(zip(missing, decode_transactions(jobs)))
+
+    tx_info = {}
+    for tx_hash in txhash_list:
+        kind, result = decoded[tx_hash]
+        if kind == 'tx_info':
+            tx_info[tx_hash] = result
+        elif kind == 'missing':
+            # Not resolved by the batch: look them up one by one.
+            tx_info[tx_hash] = get_tx_info(raw_transactions[tx_hash], db=db, prevouts=prevouts)
+        else:
+            if tx_hash not in dispenses:
+                dispenses[tx_hash] = _get_dispense_outputs(db, result)
+            outputs = dispenses[tx_hash]
+            if outputs is None:
+                tx_info[tx_hash] = (b'', None, None, None, None, None)
+                continue
+            sources = []
+            if outputs:
+                try:
+                    sources = _get_swap_sources(backend.deserialize(raw_transactions[tx_hash]), prevouts=prevouts)
+                except:
+                    tx_info[tx_hash] = (b'', None, None, None, None, None)
+                    continue
+            tx_info[tx_hash] = (b'', None, None, None, None, (sources, outputs))
+
+    return tx_info
+
+def get_tx_info(tx_hex, block_parser=None, block_index=None, db=None, prevouts=None):
     """Get the transaction info. Returns normalized None data for DecodeError and BTCOnlyError."""
     try:
-        return _get_tx_info(tx_hex, block_parser, block_index)
+        return _get_tx_info(tx_hex, block_parser, block_index, prevouts=prevouts)
     except DecodeError as e:
         return b'', None, None, None, None, None
     except BTCOnlyError as e:
         # NOTE: For debugging, logger.debug('Could not decode: ' + str(e))
         if util.enabled('dispensers', block_index):
             try:
-                return b'', None, None, None, None, _get_swap_tx(e.decodedTx, block_parser, block_index, db=db)
+                return b'', None, None, None, None, _get_swap_tx(e.decodedTx, block_parser, block_index, db=db, prevouts=prevouts)
             except: # (DecodeError, backend.indexd.BackendRPCError) as e:
                 return b'', None, None, None, None, None
         else:
             return b'', None, None, None, None, None
 
-def _get_swap_tx(decoded_tx, block_parser=None, block_index=None, db=None):
+def _get_swap_tx(decoded_tx, block_parser=None, block_index=None, db=None, prevouts=None):
+    outputs = []
+    check_sources = db == None # If we didn't get passed a database cursor, assume we have to check for dispenser
+    for destination, btc_amount in _get_swap_outputs(decoded_tx):
+        if db != None and dispenser.is_dispensable(db, destination, btc_amount):
+            check_sources = True
+            outputs.append((destination, btc_amount))
+
+    # Collect all (unique) source addresses.
+    #   if we haven't found them yet
+    sources = []
+    if check_sources:
+        sources = _get_swap_sources(decoded_tx, block_parser=block_parser, prevouts=prevouts)
+
+    return (sources, outputs)
+
+def _get_swap_outputs(decoded_tx):
+    """Get the `(destination, btc_amount)` of every output of a BTC‐only transaction."""
     def get_pubkeyhash(scriptpubkey):
         asm = script.get_asm(scriptpubkey)
         
@@ -515,7 +919,6 @@ def _get_swap_tx(decoded_tx, block_parser=None, block_index=None, db=None):
             return address
 
     outputs = []
-    check_sources = db == None # If we didn't get passed a database cursor, assume we have to check for dispenser
     for vout in decoded_tx.vout:
         address = get_address(vout.scriptPubKey)
         destination = None
@@ -544,64 +947,57 @@ def _get_swap_tx(decoded_tx, block_parser=None, block_index=None, db=None):
             else:
                 logger.error('cannot parse destination address or new_data found: ' + str(asm))
 
-        if db != None and dispenser.is_dispensable(db, destination, btc_amount):
-            check_sources = True
-            outputs.append((destination, btc_amount))
+        outputs.append((destination, btc_amount))
 
-    # Collect all (unique) source addresses.
-    #   if we haven't found them yet
+    return outputs
+
+def _get_swap_sources(decoded_tx, block_parser=None, prevouts=None):
+    """Get the source addresses of a BTC‐only transaction."""
     sources = []
-    if check_sources:
-        for vin in decoded_tx.vin[:]:                   # Loop through inputs.
-            if block_parser:
-                vin_tx = block_parser.read_raw_transaction(ib2h(vin.prevout.hash))
-                vin_ctx = backend.deserialize(vin_tx['__data__'])
-            else:
-                vin_tx = backend.getrawtransaction(ib2h(vin.prevout.hash)) # TODO: Biggest penalty on parsing is here
-                vin_ctx = backend.deserialize(vin_tx)
-            vout = vin_ctx.vout[vin.prevout.n]
+    for vin in decoded_tx.vin[:]:                   # Loop through inputs.
+        vout = get_prevout(vin, block_parser=block_parser, prevouts=prevouts)
 
-            asm = script.get_asm(vout.scriptPubKey)
-            if asm[-1] == 'OP_CHECKSIG':
-                new_source, new_data = decode_checksig(asm, decoded_tx)
-                if new_data or not new_source:
-                    raise DecodeError('data in source')
-            elif asm[-1] == 'OP_CHECKMULTISIG':
-                new_source, new_data = decode_checkmultisig(asm, decoded_tx)
-                if new_data or not new_source:
-                    raise DecodeError('data in source')
-            elif asm[0] == 'OP_HASH160' and asm[-1] == 'OP_EQUAL' and len(asm) == 3:
-                new_source, new_data = decode_scripthash(asm)
-                if new_data or not new_source:
-                    raise DecodeError('data in source')
-            elif util.enabled('segwit_support') and asm[0] == 0:
-                # Segwit output
-                # Get the full transaction data for this input transaction.
-                new_source, new_data = decode_p2w(vout.scriptPubKey)
-            else:
-                raise DecodeError('unrecognised source type')
+        asm = script.get_asm(vout.scriptPubKey)
+        if asm[-1] == 'OP_CHECKSIG':
+            new_source, new_data = decode_checksig(asm, decoded_tx)
+            if new_data or not new_source:
+                raise DecodeError('data in source')
+        elif asm[-1] == 'OP_CHECKMULTISIG':
+            new_source, new_data = decode_checkmultisig(asm, decoded_tx)
+            if new_data or not new_source:
+                raise DecodeError('data in source')
+        elif asm[0] == 'OP_HASH160' and asm[-1] == 'OP_EQUAL' and len(asm) == 3:
+            new_source, new_data = decode_scripthash(asm)
+            if new_data or not new_source:
+                raise DecodeError('data in source')
+        elif util.enabled('segwit_support') and asm[0] == 0:
+            # Segwit output
+            # Get the full transaction data for this input transaction.
+            new_source, new_data = decode_p2w(vout.scriptPubKey)
+        else:
+            raise DecodeError('unrecognised source type')
 
-            # old; append to sources, results in invalid addresses
-            # new; first found source is source, the rest can be anything (to fund the TX for example)
-            if not (util.enabled('first_input_is_source') and len(sources)):
-                # Collect unique sources.
-                if new_source not in sources:
-                    sources.append(new_source)
+        # old; append to sources, results in invalid addresses
+        # new; first found source is source, the rest can be anything (to fund the TX for example)
+        if not (util.enabled('first_input_is_source') and len(sources)):
+            # Collect unique sources.
+            if new_source not in sources:
+                sources.append(new_source)
 
-    return (sources, outputs)
+    return sources
 
-def _get_tx_info(tx_hex, block_parser=None, block_index=None, p2sh_is_segwit=False):
+def _get_tx_info(tx_hex, block_parser=None, block_index=None, p2sh_is_segwit=False, prevouts=None):
     """Get the transaction info. Calls one of two subfunctions depending on signature type."""
     if not block_index:
         block_index = util.CURRENT_BLOCK_INDEX
     if util.enabled('p2sh_addresses', block_index=block_index):   # Protocol change.
-        return  get_tx_info3(tx_hex, block_parser=block_parser, p2sh_is_segwit=p2sh_is_segwit)
+        return  get_tx_info3(tx_hex, block_parser=block_parser, p2sh_is_segwit=p2sh_is_segwit, prevouts=prevouts)
     elif util.enabled('multisig_addresses', block_index=block_index):   # Protocol change.
-        return get_tx_info2(tx_hex, block_parser=block_parser)
+        return get_tx_info2(tx_hex, block_parser=block_parser, prevouts=prevouts)
     else:
-        return get_tx_info1(tx_hex, block_index, block_parser=block_parser)
+        return get_tx_info1(tx_hex, block_index, block_parser=block_parser, prevouts=prevouts)
 
-def get_tx_info1(tx_hex, block_index, block_parser=None):
+def get_tx_info1(tx_hex, block_index, block_parser=None, prevouts=None):
     """Get singlesig transaction info.
     The destination, if it exists, always comes before the data output; the
     change, if it exists, always comes after.
@@ -693,14 +1089,7 @@ def get_tx_info1(tx_hex, block_index, block_parser=None):
     for vin in ctx.vin[:]:                                               # Loop through input transactions.
         if vin.prevout.is_null():
             raise DecodeError('coinbase transaction')
-         # Get the full transaction data for this input transaction.
-        if block_parser:
-            vin_tx = block_parser.read_raw_transaction(ib2h(vin.prevout.hash))
-            vin_ctx = backend.deserialize(vin_tx['__data__'])
-        else:
-            vin_tx = backend.getrawtransaction(ib2h(vin.prevout.hash))
-            vin_ctx = backend.deserialize(vin_tx)
-        vout = vin_ctx.vout[vin.prevout.n]
+        vout = get_prevout(vin, block_parser=block_parser, prevouts=prevouts)
         fee += vout.nValue
 
         address = get_address(vout.scriptPubKey)
@@ -717,8 +1106,8 @@ def get_tx_info1(tx_hex, block_index, block_parser=None):
 
     return source, destination, btc_amount, fee, data, None
 
-def get_tx_info3(tx_hex, block_parser=None, p2sh_is_segwit=False):
-    return get_tx_info2(tx_hex, block_parser=block_parser, p2sh_support=True, p2sh_is_segwit=p2sh_is_segwit)
+def get_tx_info3(tx_hex, block_parser=None, p2sh_is_segwit=False, prevouts=None):
+    return get_tx_info2(tx_hex, block_parser=block_parser, p2sh_support=True, p2sh_is_segwit=p2sh_is_segwit, prevouts=prevouts)
 
 def arc4_decrypt(cyphertext, ctx):
     '''Un‐obfuscate. Initialise key once per attempt.'''
@@ -785,7 +1174,7 @@ def decode_p2w(script_pubkey):
     except TypeError as e:
         raise DecodeError('bech32 decoding error')
 
-def get_tx_info2(tx_hex, block_parser=None, p2sh_support=False, p2sh_is_segwit=False):
+def get_tx_info2(tx_hex, block_parser=None, p2sh_support=False, p2sh_is_segwit=False, prevouts=None):
     """Get multisig transaction info.
     The destinations, if they exists, always comes before the data output; the
     change, if it exists, always comes after.
@@ -855,8 +1244,11 @@ def get_tx_info2(tx_hex, block_parser=None, p2sh_support=False, p2sh_is_segwit=F
         data = b''
         for vin in ctx.vin:
             if util.enabled("prevout_segwit_fix"):
-                vin_tx = backend.getrawtransaction(ib2h(vin.prevout.hash))
-                vin_ctx = backend.deserialize(vin_tx)
+                if prevouts is not None:
+                    vin_ctx = prevouts.get_tx(ib2h(vin.prevout.hash))
+                else:
+                    vin_tx = backend.getrawtransaction(ib2h(vin.prevout.hash))
+                    vin_ctx = backend.deserialize(vin_tx)
                 prevout_is_segwit = vin_ctx.has_witness()
             else:
                 prevout_is_segwit = p2sh_is_segwit
@@ -890,14 +1282,7 @@ def get_tx_info2(tx_hex, block_parser=None, p2sh_support=False, p2sh_is_segwit=F
     # Collect all (unique) source addresses.
     #   if we haven't found them yet
     for vin in ctx.vin[:]:                   # Loop through inputs.
-        # Get the full transaction data for this input transaction.
-        if block_parser:
-            vin_tx = block_parser.read_raw_transaction(ib2h(vin.prevout.hash))
-            vin_ctx = backend.deserialize(vin_tx['__data__'])
-        else:
-            vin_tx = backend.getrawtransaction(ib2h(vin.prevout.hash))
-            vin_ctx = backend.deserialize(vin_tx)
-        vout = vin_ctx.vout[vin.prevout.n]
+        vout = get_prevout(vin, block_parser=block_parser, prevouts=prevouts)
         fee += vout.nValue
 
         asm = script.get_asm(vout.scriptPubKey)
@@ -940,8 +1325,11 @@ def reinitialise(db, block_index=None):
     cursor = db.cursor()
 
     # Delete all of the results of parsing (including the undolog)
-    for table in TABLES + ['balances', 'undolog', 'undolog_block']:
+    for table in TABLES + ['balances', 'undolog', 'undolog_block', 'supplies', 'expirations_due']:
         cursor.execute('''DROP TABLE IF EXISTS {}'''.format(table))
+    log.reset_message_index()
+    util.reset_balances()
+    check.LAST_CONSENSUS_HASHES.clear()
 
     # Create missing tables
     initialise(db)
@@ -977,6 +1365,16 @@ def reinitialise(db, block_index=None):
 
     cursor.close()
 
+def restore_snapshot(db):
+    """Restore the tables dropped by `reinitialise()` from the attached snapshot."""
+    cursor = db.cursor()
+    cursor.setexectrace(None)
+    drop_undolog_triggers(cursor)
+    snapshots.restore(db, TABLES + ['balances', 'undolog', 'undolog_block'])
+    if UNDOLOG_ENABLED:
+        create_undolog_triggers(cursor)
+    cursor.close()
+
 def reparse(db, block_index=None, quiet=False):
     """Reparse all transactions (atomically). If block_index is set, rollback
     to the end of that block.
@@ -991,13 +1389,6 @@ def reparse(db, block_index=None, quiet=False):
         undolog_cursor.setexectrace(None)
         undolog_cursor.setrowtrace(None)
 
-        def get_block_index_for_undo_index(undo_indexes, undo_index):
-            for block_index, first_undo_index in undo_indexes.items(): #in order
-                if undo_index < first_undo_index:
-                    return block_index - 1
-            else:
-                return next(reversed(undo_indexes)) #the last inserted block_index
-
         with db:
             # Check if we can reparse from the undolog
             results = list(undolog_cursor.execute(
@@ -1015,16 +1406,8 @@ def reparse(db, block_index=None, quiet=False):
                 else:
                     return False # Undolog doesn't go that far back, full reparse required...
 
-            # Grab the undolog...
-            undolog = list(undolog_cursor.execute(
-                '''SELECT undo_index, sql FROM undolog WHERE undo_index >= ? ORDER BY undo_index DESC''',
-                (undo_indexes[undo_start_block_index],)))
-
-            # Replay the undolog backwards, from the last entry to first_undo_index...
-            for entry in undolog:
-                logger.info("Undolog: Block {} (undo_index {}): {}".format(
-                    get_block_index_for_undo_index(undo_indexes, entry[0]), entry[0], entry[1]))
-                undolog_cursor.execute(entry[1])
+            # Undo the changes of the blocks after block_index...
+            rollback_undolog(undolog_cursor, undo_indexes[undo_start_block_index])
 
             # Trim back tx and blocks
             undolog_cursor.execute('''DELETE FROM transactions WHERE block_index > ?''', (block_index,))
@@ -1045,48 +1428,63 @@ def reparse(db, block_index=None, quiet=False):
     reparse_start = time.time()
 
     # Reparse from the undolog if possible
+    util.flush_balances()
     reparsed = reparse_from_undolog(db, block_index, quiet)
+    snapshots.discard_after(block_index or 0)
+    log.reset_message_index()
+    util.reset_balances()
 
-    cursor = db.cursor()
+    cursor = database.row_cursor(db)
 
     if not reparsed:
-        if block_index:
+        # Else restore the last snapshot before the block, if any.
+        snapshot_block_index = snapshots.find(db, block_index) if block_index else None
+        if snapshot_block_index is not None:
+            logger.info("Could not roll back from undolog. Restoring the database snapshot of block {}...".format(snapshot_block_index))
+            snapshots.attach(db, snapshot_block_index)
+        elif block_index:
             logger.info("Could not roll back from undolog. Performing full reparse instead...")
 
         if quiet:
             root_logger = logging.getLogger()
             root_level = logger.getEffectiveLevel()
 
-        with db:
-            reinitialise(db, block_index)
-
-            # Reparse all blocks, transactions.
-            if quiet:
-                root_logger.setLevel(logging.WARNING)
-
-            previous_ledger_hash, previous_txlist_hash, previous_messages_hash = None, None, None
-            cursor.execute('''SELECT * FROM blocks ORDER BY block_index''')
-            for block in cursor.fetchall():
-                util.CURRENT_BLOCK_INDEX = block['block_index']
-                previous_ledger_hash, previous_txlist_hash, previous_messages_hash, previous_found_messages_hash = parse_block(
-                                                                         db, block['block_index'], block['block_time'],
-                                                                         previous_ledger_hash=previous_ledger_hash,
-                                                                         previous_txlist_hash=previous_txlist_hash,
-                                                                         previous_messages_hash=previous_messages_hash)
-                if quiet and block['block_index'] % 10 == 0:  # every 10 blocks print status
-                    root_logger.setLevel(logging.INFO)
-                logger.info('Block (re-parse): %s (hashes: L:%s / TX:%s / M:%s%s)' % (
-                    block['block_index'], previous_ledger_hash[-5:], previous_txlist_hash[-5:], previous_messages_hash[-5:],
-                    (' [overwrote %s]' % previous_found_messages_hash) if previous_found_messages_hash and previous_found_messages_hash != previous_messages_hash else ''))
-                if quiet and block['block_index'] % 10 == 0:
+        try:
+            with db:
+                reinitialise(db, block_index)
+                if snapshot_block_index is not None:
+                    restore_snapshot(db)
+
+                # Reparse all blocks, transactions (after the snapshot).
+                if quiet:
                     root_logger.setLevel(logging.WARNING)
 
+                previous_ledger_hash, previous_txlist_hash, previous_messages_hash = None, None, None
+                cursor.execute('''SELECT * FROM blocks WHERE block_index > ? ORDER BY block_index''', (snapshot_block_index or 0,))
+                for block in cursor.fetchall():
+                    util.CURRENT_BLOCK_INDEX = block['block_index']
+                    previous_ledger_hash, previous_txlist_hash, previous_messages_hash, previous_found_messages_hash = parse_block(
+                                                                             db, block['block_index'], block['block_time'],
+                                                                             previous_ledger_hash=previous_ledger_hash,
+                                                                             previous_txlist_hash=previous_txlist_hash,
+                                                                             previous_messages_hash=previous_messages_hash)
+                    if quiet and block['block_index'] % 10 == 0:  # every 10 blocks print status
+                        root_logger.setLevel(logging.INFO)
+                    logger.info('Block (re-parse): %s (hashes: L:%s / TX:%s / M:%s%s)' % (
+                        block['block_index'], previous_ledger_hash[-5:], previous_txlist_hash[-5:], previous_messages_hash[-5:],
+                        (' [overwrote %s]' % previous_found_messages_hash) if previous_found_messages_hash and previous_found_messages_hash != previous_messages_hash else ''))
+                    if quiet and block['block_index'] % 10 == 0:
+                        root_logger.setLevel(logging.WARNING)
+        finally:
+            if snapshot_block_index is not None:
+                snapshots.detach(db)
+
         if quiet:
             root_logger.setLevel(root_level)
 
     with db:
         # Check for conservation of assets.
-        check.asset_conservation(db)
+        check.asset_conservation(db, deep=config.CHECK_ASSET_CONSERVATION_DEEP)
 
         # Update database version number.
         database.update_version(db)
@@ -1099,7 +1497,7 @@ def reparse(db, block_index=None, quiet=False):
     if not block_index:
         database.vacuum(db)
 
-def list_tx(db, block_hash, block_index, block_time, tx_hash, tx_index, tx_hex=None):
+def list_tx(db, block_hash, block_index, block_time, tx_hash, tx_index, tx_hex=None, tx_info=None):
     assert type(tx_hash) == str
     cursor = db.cursor()
 
@@ -1110,10 +1508,12 @@ def list_tx(db, block_hash, block_index, block_time, tx_hash, tx_index, tx_hex=N
         return tx_index
 
     # Get the important details about each transaction.
-    if tx_hex is None:
-        tx_hex = backend.getrawtransaction(tx_hash) # TODO: This is the call that is stalling the process the most
+    if tx_info is None:
+        if tx_hex is None:
+            tx_hex = backend.getrawtransaction(tx_hash) # TODO: This is the call that is stalling the process the most
+        tx_info = get_tx_info(tx_hex, db=db)
 
-    source, destination, btc_amount, fee, data, decoded_tx = get_tx_info(tx_hex, db=db)
+    source, destination, btc_amount, fee, data, decoded_tx = tx_info
 
     if not source and decoded_tx and util.enabled('dispensers', block_index):
         outputs = decoded_tx[1]
@@ -1301,12 +1701,365 @@ def get_next_tx_index(db):
 
 class MempoolError(Exception):
     pass
+
+class MempoolSpeculation(object):
+    """Parse mempool transactions speculatively, on a fake block.
+
+    The whole speculation runs in a single transaction which is rolled back
+    on exit, and each transaction is parsed in a savepoint of its own, rolled
+    back as soon as its messages are captured. Within it, the undolog
+    triggers are dropped, the messages are captured from `log.message()`
+    instead of being written to the `messages` table and the consensus hashes
+    are left alone."""
+
+    def __init__(self, db, curr_time):
+        self.db = db
+        self.curr_time = curr_time
+        self.cursor = db.cursor()
+        self.cursor.setexectrace(None)
+
+    def __enter__(self):
+        util.flush_balances()
+        util.reset_balances()
+        self.cursor.execute('''SAVEPOINT mempool_speculation''')
+        drop_undolog_triggers(self.cursor)
+
+        # List the fake block.
+        self.cursor.execute('''INSERT INTO blocks(
+                                block_index,
+                                block_hash,
+                                block_time) VALUES(?,?,?)''',
+                            (config.MEMPOOL_BLOCK_INDEX,
+                             config.MEMPOOL_BLOCK_HASH,
+                             self.curr_time)
+                           )
+        util.SPECULATIVE_MESSAGES = []
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        util.SPECULATIVE_MESSAGES = None
+        util.reset_balances()
+        self.cursor.execute('''ROLLBACK TO SAVEPOINT mempool_speculation''')
+        self.cursor.execute('''RELEASE SAVEPOINT mempool_speculation''')
+        self.cursor.close()
+
+    def parse(self, tx_hash, tx_hex, block_index, tx_index):
+        """List and parse an unconfirmed transaction and roll it back.
+
+        Return `(supported, messages, next_tx_index)`; `supported` is `False`
+        for transactions which aren’t Counterparty transactions, and
+        `next_tx_index` is the `tx_index` of the next transaction to parse,
+        as returned by `list_tx()`."""
+        supported = True
+        next_tx_index = tx_index
+        del util.SPECULATIVE_MESSAGES[:]
+        self.cursor.execute('''SAVEPOINT mempool_tx''')
+        try:
+            next_tx_index = list_tx(self.db, None, block_index, self.curr_time, tx_hash, tx_index=tx_index, tx_hex=tx_hex)
+
+            # Parse transaction.
+            transactions = list(self.cursor.execute('''SELECT * FROM transactions WHERE tx_hash = ?''', (tx_hash,)))
+            if transactions:
+                assert len(transactions) == 1
+                supported = parse_tx(self.db, transactions[0])
+            else:
+                # If a transaction hasn’t been added to the
+                # table `transactions`, then it’s not a
+                # Counterparty transaction.
+                supported = False
+        except exceptions.ParseTransactionError as e:
+            logger.warn('ParseTransactionError for tx %s: %s' % (tx_hash, e))
+            del util.SPECULATIVE_MESSAGES[:]
+        finally:
+            # Rollback.
+            util.reset_balances()
+            self.cursor.execute('''ROLLBACK TO SAVEPOINT mempool_tx''')
+            self.cursor.execute('''RELEASE SAVEPOINT mempool_tx''')
+
+        return supported, list(util.SPECULATIVE_MESSAGES), next_tx_index
+
+class MempoolEngine(object):
+    """Keep the `mempool` table in step with the mempool of the backend.
+
+    The messages of every parsed transaction are kept in memory, keyed by
+    transaction hash, so that a refresh only parses the transactions which
+    entered the mempool since the previous one and only writes the
+    difference to the table."""
+
+    def __init__(self, db):
+        self.db = db
+        self.messages = {}  # tx_hash → messages, for every parsed transaction still in the mempool
+        self.not_supported = {}   # No false positives. Use a dict to allow for O(1) lookups
+        self.not_supported_sorted = collections.deque()
+        # ^ Entries in form of (block_index, tx_hash), oldest first. Allows for easy removal of past, unncessary entries
+
+    def is_known(self, tx_hash):
+        return tx_hash in self.messages or tx_hash in self.not_supported
+
+    def prune(self, block_index):
+        """Forget the non‐supported transactions older than ten blocks."""
+        while len(self.not_supported_sorted) and self.not_supported_sorted[0][0] <= block_index - 10:
+            tx_h = self.not_supported_sorted.popleft()[1]
+            del self.not_supported[tx_h]
+
+    def parse(self, raw_transactions, block_index, tx_index):
+        """Parse new transactions, given as a dict of tx_hash → tx_hex, and
+        return their messages, keyed by transaction hash.
+
+        The transactions are listed one after the other from `tx_index`."""
+        parsed = {}
+        with MempoolSpeculation(self.db, int(time.time())) as speculation:
+            for tx_hash, tx_hex in raw_transactions.items():
+                if tx_hex is None:
+                    # Not found in the backend (evicted, or not indexed yet): try again next time.
+                    logger.debug('tx_hash %s not found in backend.  Not adding to mempool.', (tx_hash, ))
+                    continue
+                supported, messages, tx_index = speculation.parse(tx_hash, tx_hex, block_index, tx_index)
+                if supported:
+                    parsed[tx_hash] = messages
+                else:
+                    self.not_supported[tx_hash] = ''
+                    self.not_supported_sorted.append((block_index, tx_hash))
+                    if messages:
+                        parsed[tx_hash] = messages
+        return parsed
+
+    def apply(self, removed, added):
+        """Remove the messages of the `removed` transactions and add `added`
+        (tx_hash → messages) to the `mempool` table."""
+        cursor = self.db.cursor()
+        with self.db:
+            for tx_hash in removed:
+                del self.messages[tx_hash]
+                cursor.execute('''DELETE FROM mempool WHERE tx_hash = ?''', (tx_hash,))
+            for tx_hash, messages in added.items():
+                self.messages[tx_hash] = messages
+                for message in messages:
+                    message['tx_hash'] = tx_hash
+                    cursor.execute('''INSERT INTO mempool VALUES(:tx_hash, :command, :category, :bindings, :timestamp)''', message)
+        cursor.close()
+
+    def refresh(self, raw_mempool, block_index, tx_index):
+        """Drop the transactions which left `raw_mempool` and parse at most
+        `config.MEMPOOL_PARSE_CHUNK_SIZE` of the ones which entered it.
+
+        Return the number of new transactions left for the next refreshes."""
+        current = set(raw_mempool)
+        removed = [tx_hash for tx_hash in self.messages if tx_hash not in current]
+        new_txs = [tx_hash for tx_hash in raw_mempool if not self.is_known(tx_hash)]
+        chunk = new_txs[:config.MEMPOOL_PARSE_CHUNK_SIZE]
+
+        # Sometimes the transactions can’t be found: `{'code': -5, 'message': 'No information available about transaction'}`
+        #  - is txindex enabled in Bitcoind?
+        #  - or was there a block found while batch feting the raw txs
+        #  - or was there a double spend for w/e reason accepted into the mempool (replace-by-fee?)
+        added = {}
+        if chunk:
+            try:
+                raw_transactions = backend.getrawtransaction_batch(chunk, skip_missing=True)
+            except Exception as e:
+                logger.warning('Failed to fetch raw for mempool TXs; %s', (e, ))
+            else:
+                added = self.parse(raw_transactions, block_index, tx_index)
+
+        self.apply(removed, added)
+        return len(new_txs) - len(chunk)
+
+    def add(self, raw_transactions, block_index, tx_index):
+        """Parse transactions announced by the backend, given as a list of
+        tx_hex, and add their messages to the `mempool` table."""
+        cursor = self.db.cursor()
+        new_txs = {}
+        for tx_hex in raw_transactions:
+            tx_hash = bitcoinlib.core.b2lx(backend.deserialize(tx_hex).GetTxid())
+            if self.is_known(tx_hash):
+                continue
+            # Transactions announced as they are confirmed.
+            if list(cursor.execute('''SELECT tx_hash FROM transactions WHERE tx_hash = ?''', (tx_hash,))):
+                continue
+            new_txs[tx_hash] = tx_hex
+        cursor.close()
+
+        self.apply([], self.parse(new_txs, block_index, tx_index))
+
+class BlockPrefetcher(threading.Thread):
+    """Fetch, deserialize and list the transactions of upcoming blocks in the
+    background, so that the backend is queried while the previous block is
+    being parsed. Blocks are handed out strictly in order."""
+
+    def __init__(self, first_index, last_index, queue_size):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.next_index = first_index
+        self.last_index = last_index
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.stop_event = threading.Event()
+
+    def run(self):
+        logger.debug('Prefetching blocks {} to {}.'.format(self.next_index, self.last_index))
+        while self.next_index <= self.last_index and not self.stop_event.is_set():
+            block_index = self.next_index
+            try:
+                block_hash = backend.getblockhash(block_index)
+                block = backend.getblock(block_hash)
+                # `follow()` lists the transactions before bumping `util.CURRENT_BLOCK_INDEX`.
+                txhash_list, raw_transactions = backend.get_tx_list(block, block_index=block_index - 1)
+            except Exception as e:
+                logger.warning('Failed to prefetch block {}: {}'.format(block_index, e))
+                break
+
+            prefetched = (block_index, block_hash, block, txhash_list, raw_transactions)
+            while not self.stop_event.is_set():
+                try:
+                    self.queue.put(prefetched, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+            self.next_index += 1
+
+    def get(self, block_index):
+        """Return the prefetched `(block_index, block_hash, block, txhash_list,
+        raw_transactions)` for `block_index`, or `None` if it is not available."""
+        while True:
+            try:
+                prefetched = self.queue.get(timeout=0.1)
+            except queue.Empty:
+                if not self.is_alive() and self.queue.empty():
+                    return None
+                continue
+            if prefetched[0] != block_index:
+                return None
+            return prefetched
+
+    def stop(self):
+        self.stop_event.set()
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.join()
+
+class HeaderCache(object):
+    """Headers of the most recent blocks of the backend’s chain, as
+    height → (block hash, previous block hash), filled from the blocks
+    already downloaded and from block headers, so that orphan checks don’t
+    require full blocks."""
+
+    def __init__(self, size):
+        self.size = size
+        self.headers = {}
+
+    def add(self, block_index, block_hash, header):
+        self.headers[block_index] = (block_hash, bitcoinlib.core.b2lx(header.hashPrevBlock))
+        for old_index in [i for i in self.headers if i <= block_index - self.size]:
+            del self.headers[old_index]
+
+    def get_previous_hash(self, block_index):
+        """Return the hash of the parent of the backend’s block at `block_index`."""
+        block_hash = backend.getblockhash(block_index)
+        cached = self.headers.get(block_index)
+        if cached is None or cached[0] != block_hash:
+            self.add(block_index, block_hash, backend.getblockheader(block_hash))
+        return self.headers[block_index][1]
+
+class BlockBatch(object):
+    """Commit the blocks parsed during catch‐up by batches of up to `size`
+    blocks, or every `interval` seconds, instead of one by one. The blocks of
+    a batch are parsed within a single transaction, so a crash loses the
+    uncommitted batch and parsing resumes from the last committed block.
+
+    The outputs of the blocks are added to the outpoint index once the blocks
+    are committed."""
+
+    def __init__(self, db, size, interval):
+        self.db = db
+        self.size = size
+        self.interval = interval
+        self.cursor = db.cursor()
+        self.cursor.setexectrace(None)
+        self.block_count = 0
+        self.start_time = None
+        self.uncommitted_blocks = []
+
+    def begin(self):
+        """Open a batch, unless one is open already or batching is disabled."""
+        if not self.is_open() and self.size > 1:
+            self.cursor.execute('''SAVEPOINT block_batch''')
+            self.block_count = 0
+            self.start_time = time.time()
+
+    def block_parsed(self, block_index, block, caught_up):
+        """Commit the batch if it’s full or old enough, or if the last block
+        parsed is the last block of the backend."""
+        self.uncommitted_blocks.append((block_index, block))
+        if not self.is_open():
+            self.index_outpoints()
+            return
+        self.block_count += 1
+        if caught_up or self.block_count >= self.size or time.time() - self.start_time >= self.interval:
+            self.commit()
+
+    def is_open(self):
+        return self.start_time is not None
+
+    def commit(self):
+        if self.is_open():
+            self.cursor.execute('''RELEASE SAVEPOINT block_batch''')
+            logger.debug('Committed {} blocks.'.format(self.block_count))
+            self.start_time = None
+            self.index_outpoints()
+
+    def index_outpoints(self):
+        for block_index, block in self.uncommitted_blocks:
+            outpoints.index_block(block, block_index)
+        self.uncommitted_blocks = []
+
+class BackendNotifier(object):
+    """Subscribe to the `hashblock` and `rawtx` ZeroMQ notifications of the
+    backend (`-zmqpubhashblock` and `-zmqpubrawtx` in Bitcoin Core)."""
+
+    MAX_MESSAGES = 1000 # per call to `wait()`, so that new blocks aren’t held up by a burst of transactions
+
+    def __init__(self, endpoints):
+        self.context = zmq.Context()
+        self.socket = self.context.socket(zmq.SUB)
+        self.socket.setsockopt(zmq.RCVHWM, 0)
+        self.socket.setsockopt(zmq.SUBSCRIBE, b'hashblock')
+        self.socket.setsockopt(zmq.SUBSCRIBE, b'rawtx')
+        for endpoint in endpoints:
+            logger.debug('Subscribing to backend notifications at `{}`.'.format(endpoint))
+            self.socket.connect(endpoint)
+        self.poller = zmq.Poller()
+        self.poller.register(self.socket, zmq.POLLIN)
+
+    def wait(self, timeout):
+        """Wait up to `timeout` seconds for notifications and return
+        `(new_block, raw_transactions)`: whether a block was announced, and
+        the hex of the announced transactions."""
+        new_block, raw_transactions = False, []
+        poll_timeout = timeout * 1000
+        for i in range(self.MAX_MESSAGES):
+            if not self.poller.poll(poll_timeout):
+                break
+            topic, body = self.socket.recv_multipart()[:2]
+            if topic == b'hashblock':
+                new_block = True
+            elif topic == b'rawtx':
+                raw_transactions.append(binascii.hexlify(body).decode('ascii'))
+            # Drain whatever else is already queued.
+            poll_timeout = 0
+        return new_block, raw_transactions
+
+    def close(self):
+        self.socket.close(linger=0)
+        self.context.term()
+
+
 def follow(db):
     # Check software version.
     check.software_version()
 
     # Initialise.
     initialise(db)
+    start_decode_pool()
 
     # Get index of last block.
     if util.CURRENT_BLOCK_INDEX == 0:
@@ -1331,16 +2084,31 @@ def follow(db):
     # Get index of last transaction.
     tx_index = get_next_tx_index(db)
 
-    not_supported = {}   # No false positives. Use a dict to allow for O(1) lookups
-    not_supported_sorted = collections.deque()
-    # ^ Entries in form of (block_index, tx_hash), oldest first. Allows for easy removal of past, unncessary entries
+    mempool = MempoolEngine(db)
     cursor = db.cursor()
+    prefetcher = None
+    headers = HeaderCache(config.UNDOLOG_MAX_PAST_BLOCKS)
+    batch = BlockBatch(db, config.BLOCK_COMMIT_BATCH_SIZE, config.BLOCK_COMMIT_INTERVAL)
+    snapshot_manager = snapshots.SnapshotManager(config.SNAPSHOT_INTERVAL, config.SNAPSHOT_COUNT)
+
+    # Await new blocks and transactions on the backend’s ZeroMQ notifications,
+    # if configured, rather than polling it.
+    notifier = None
+    if config.BACKEND_ZMQ_CONNECT:
+        if zmq is None:
+            logger.warning('`pyzmq` is not installed, polling the backend instead of subscribing to `{}`.'.format(config.BACKEND_ZMQ_CONNECT))
+        else:
+            notifier = BackendNotifier(config.BACKEND_ZMQ_CONNECT.split(','))
+    refresh_mempool = True
 
     # a reorg can happen without the block count increasing, or even for that
     # matter, with the block count decreasing. This should only delay
     # processing of the new blocks a bit.
     while True:
         start_time = time.time()
+        # Stop on a database found corrupted by the checks deferred at startup.
+        database.check_integrity_status()
+
         # Get block count.
         # If the backend is unreachable and `config.FORCE` is set, just sleep
         # and try again repeatedly.
@@ -1366,9 +2134,7 @@ def follow(db):
 
                     logger.debug('Checking that block {} is not an orphan.'.format(current_index))
                     # Backend parent hash.
-                    current_hash = backend.getblockhash(current_index)
-                    current_cblock = backend.getblock(current_hash)
-                    backend_parent = bitcoinlib.core.b2lx(current_cblock.hashPrevBlock)
+                    backend_parent = headers.get_previous_hash(current_index)
 
                     # DB parent hash.
                     blocks = list(cursor.execute('''SELECT * FROM blocks
@@ -1388,12 +2154,18 @@ def follow(db):
 
                 # Rollback for reorganisation.
                 if requires_rollback:
+                    batch.commit()
+                    if prefetcher:
+                        prefetcher.stop()
+                        prefetcher = None
+
                     # Record reorganisation.
                     logger.warning('Blockchain reorganisation at block {}.'.format(current_index))
                     log.message(db, block_index, 'reorg', None, {'block_index': current_index})
 
                     # Rollback the DB.
                     reparse(db, block_index=current_index-1, quiet=True)
+                    outpoints.rollback(current_index-1)
                     block_index = current_index
                     tx_index = get_next_tx_index(db)
                     continue
@@ -1402,13 +2174,48 @@ def follow(db):
             # running an out‐of‐date client!)
             check.software_version()
 
-
-            # Get and parse transactions in this block (atomically).
-            block_hash = backend.getblockhash(current_index)
-            block = backend.getblock(block_hash)
+            # Prefetch upcoming blocks while far behind the backend.
+            if prefetcher is None and config.BLOCK_PREFETCH_QUEUE_SIZE and \
+               block_count - block_index > config.BLOCK_PREFETCH_QUEUE_SIZE:
+                prefetcher = BlockPrefetcher(block_index, block_count, config.BLOCK_PREFETCH_QUEUE_SIZE)
+                prefetcher.start()
+
+            prefetched = None
+            if prefetcher:
+                prefetched = prefetcher.get(block_index)
+                if prefetched:
+                    # The prefetched chain must link to the DB tip.
+                    db_tip = list(cursor.execute('''SELECT block_hash FROM blocks WHERE block_index = ?''', (block_index - 1,)))
+                    if db_tip and db_tip[0]['block_hash'] != bitcoinlib.core.b2lx(prefetched[2].hashPrevBlock):
+                        logger.warning('Prefetched block {} does not link to the database tip, flushing prefetch queue.'.format(block_index))
+                        prefetched = None
+                if prefetched is None:
+                    prefetcher.stop()
+                    prefetcher = None
+
+            # No block this far from the tip can be rolled back from the
+            # undolog: stop logging until within range.
+            if config.FAST_SYNC:
+                fast_sync = block_count - block_index > config.UNDOLOG_MAX_PAST_BLOCKS
+                if fast_sync and UNDOLOG_ENABLED:
+                    logger.info('Fast sync: undolog disabled until within {} blocks of the backend.'.format(config.UNDOLOG_MAX_PAST_BLOCKS))
+                    disable_undolog(db)
+                elif not fast_sync and not UNDOLOG_ENABLED:
+                    logger.info('Fast sync: undolog enabled.')
+                    enable_undolog(db)
+
+            # Get and parse transactions in this block (atomically), committing
+            # blocks by batches while behind the backend.
+            if block_index < block_count:
+                batch.begin()
+            if prefetched:
+                _, block_hash, block, txhash_list, raw_transactions = prefetched
+            else:
+                block_hash = backend.getblockhash(current_index)
+                block = backend.getblock(block_hash)
+                txhash_list, raw_transactions = backend.get_tx_list(block)
             previous_block_hash = bitcoinlib.core.b2lx(block.hashPrevBlock)
             block_time = block.nTime
-            txhash_list, raw_transactions = backend.get_tx_list(block)
 
             with db:
                 util.CURRENT_BLOCK_INDEX = block_index
@@ -1428,22 +2235,29 @@ def follow(db):
                               )
 
                 # List the transactions in the block.
+                tx_info = get_block_tx_info(db, txhash_list, raw_transactions)
                 for tx_hash in txhash_list:
                     tx_hex = raw_transactions[tx_hash]
-                    tx_index = list_tx(db, block_hash, block_index, block_time, tx_hash, tx_index, tx_hex)
+                    tx_index = list_tx(db, block_hash, block_index, block_time, tx_hash, tx_index, tx_hex, tx_info=tx_info[tx_hash])
 
                 # Parse the transactions in the block.
                 new_ledger_hash, new_txlist_hash, new_messages_hash, found_messages_hash = parse_block(db, block_index, block_time)
 
+            # Keep the header cache and, once committed, the outpoint index in
+            # step with the parsed blocks.
+            headers.add(block_index, block_hash, block)
+
+            batch.block_parsed(block_index, block, block_index >= block_count)
+            if not batch.is_open():
+                snapshot_manager.block_committed(block_index)
+
             # When newly caught up, check for conservation of assets.
             if block_index == block_count:
                 if config.CHECK_ASSET_CONSERVATION:
-                    check.asset_conservation(db)
+                    check.asset_conservation(db, deep=config.CHECK_ASSET_CONSERVATION_DEEP)
 
             # Remove any non‐supported transactions older than ten blocks.
-            while len(not_supported_sorted) and not_supported_sorted[0][0] <= block_index - 10:
-                tx_h = not_supported_sorted.popleft()[1]
-                del not_supported[tx_h]
+            mempool.prune(block_index)
 
             logger.info('Block: %s (%ss, hashes: L:%s / TX:%s / M:%s%s)' % (
                 str(block_index), "{:.2f}".format(time.time() - start_time, 3),
@@ -1454,129 +2268,53 @@ def follow(db):
             block_count = backend.getblockcount()
             block_index += 1
 
-        else:
-            # TODO: add zeromq support here to await TXs and Blocks instead of constantly polling
-            # Get old mempool.
-            old_mempool = list(cursor.execute('''SELECT * FROM mempool'''))
-            old_mempool_hashes = [message['tx_hash'] for message in old_mempool]
+        elif batch.is_open():
+            # The backend has lost blocks since the batch was opened.
+            batch.commit()
+
+        elif notifier and not refresh_mempool:
+            # Wait for the backend to announce a new block or transactions.
+            # If the socket goes quiet, fall back to polling the backend.
+            new_block, raw_txs = notifier.wait(config.BACKEND_ZMQ_QUIET_INTERVAL)
+            if new_block or not raw_txs:
+                # Transactions announced along with a block are confirmed by it;
+                # the mempool is refreshed as a whole once it’s parsed.
+                refresh_mempool = True
+                continue
+
+            # Parse each new transaction on its own and add its messages to the mempool.
+            mempool.add(raw_txs, block_index, tx_index)
 
+            logger.getChild('mempool').debug('Parsed %s announced transactions (took %ss)' % (
+                len(raw_txs), "{:.2f}".format(time.time() - start_time, 3)))
+
+        else:
             if backend.MEMPOOL_CACHE_INITIALIZED is False:
                 backend.init_mempool_cache()
                 logger.info("Ready for queries.")
 
-            # Fake values for fake block.
-            curr_time = int(time.time())
-            mempool_tx_index = tx_index
-
-            xcp_mempool = []
-            raw_mempool = backend.getrawmempool()
-
-            # this is a quick fix to make counterparty usable on high mempool situations
-            # however, this makes the mempool unreliable on counterparty, a better, larger
-            # fix must be done by changing this whole function into a zmq driven loop
-            if len(raw_mempool) > config.MEMPOOL_TXCOUNT_UPDATE_LIMIT:
-                continue
-
-            # For each transaction in Bitcoin Core mempool, if it’s new, create
-            # a fake block, a fake transaction, capture the generated messages,
-            # and then save those messages.
+            # For each transaction which entered the Bitcoin Core mempool,
+            # create a fake block, a fake transaction, capture the generated
+            # messages, and then save those messages. Large mempools are
+            # parsed over several refreshes.
             # Every transaction in mempool is parsed independently. (DB is rolled back after each one.)
-            # We first filter out which transactions we've already parsed before so we can batch fetch their raw data
-            parse_txs = []
-            for tx_hash in raw_mempool:
-                # If already in mempool, copy to new one.
-                if tx_hash in old_mempool_hashes:
-                    for message in old_mempool:
-                        if message['tx_hash'] == tx_hash:
-                            xcp_mempool.append((tx_hash, message))
-
-                # If not a supported XCP transaction, skip.
-                elif tx_hash in not_supported:
-                    pass
-
-                # Else: list, parse and save it.
-                else:
-                    parse_txs.append(tx_hash)
-
-            # fetch raw for all transactions that need to be parsed
-            # Sometimes the transactions can’t be found: `{'code': -5, 'message': 'No information available about transaction'}`
-            #  - is txindex enabled in Bitcoind?
-            #  - or was there a block found while batch feting the raw txs
-            #  - or was there a double spend for w/e reason accepted into the mempool (replace-by-fee?)
-            try:
-                raw_transactions = backend.getrawtransaction_batch(parse_txs)
-            except Exception as e:
-                logger.warning('Failed to fetch raw for mempool TXs, restarting loop; %s', (e, ))
-                continue  # restart the follow loop
-
-            for tx_hash in parse_txs:
-                try:
-                    with db:
-                        # List the fake block.
-                        cursor.execute('''INSERT INTO blocks(
-                                            block_index,
-                                            block_hash,
-                                            block_time) VALUES(?,?,?)''',
-                                       (config.MEMPOOL_BLOCK_INDEX,
-                                        config.MEMPOOL_BLOCK_HASH,
-                                        curr_time)
-                                      )
-
-                        tx_hex = raw_transactions[tx_hash]
-                        if tx_hex is None:
-                          logger.debug('tx_hash %s not found in backend.  Not adding to mempool.', (tx_hash, ))
-                          raise MempoolError
-                        mempool_tx_index = list_tx(db, None, block_index, curr_time, tx_hash, tx_index=mempool_tx_index, tx_hex=tx_hex)
-
-                        # Parse transaction.
-                        cursor.execute('''SELECT * FROM transactions WHERE tx_hash = ?''', (tx_hash,))
-                        transactions = list(cursor)
-                        if transactions:
-                            assert len(transactions) == 1
-                            transaction = transactions[0]
-                            supported = parse_tx(db, transaction)
-                            if not supported:
-                                not_supported[tx_hash] = ''
-                                not_supported_sorted.append((block_index, tx_hash))
-                        else:
-                            # If a transaction hasn’t been added to the
-                            # table `transactions`, then it’s not a
-                            # Counterparty transaction.
-                            not_supported[tx_hash] = ''
-                            not_supported_sorted.append((block_index, tx_hash))
-                            raise MempoolError
-
-                        # Save transaction and side‐effects in memory.
-                        cursor.execute('''SELECT * FROM messages WHERE block_index = ?''', (config.MEMPOOL_BLOCK_INDEX,))
-                        for message in list(cursor):
-                            xcp_mempool.append((tx_hash, message))
-
-                        # Rollback.
-                        raise MempoolError
-                except exceptions.ParseTransactionError as e:
-                    logger.warn('ParseTransactionError for tx %s: %s' % (tx_hash, e))
-                except MempoolError:
-                    pass
-
-            # Re‐write mempool messages to database.
-            with db:
-                cursor.execute('''DELETE FROM mempool''')
-                for message in xcp_mempool:
-                    tx_hash, new_message = message
-                    new_message['tx_hash'] = tx_hash
-                    cursor.execute('''INSERT INTO mempool VALUES(:tx_hash, :command, :category, :bindings, :timestamp)''', new_message)
+            raw_mempool = backend.getrawmempool()
+            pending = mempool.refresh(raw_mempool, block_index, tx_index)
 
             elapsed_time = time.time() - start_time
             sleep_time = config.BACKEND_POLL_INTERVAL - elapsed_time if elapsed_time <= config.BACKEND_POLL_INTERVAL else 0
 
-            logger.getChild('mempool').debug('Refresh mempool: %s XCP txs seen, out of %s total entries (took %ss, next refresh in %ss)' % (
-                len(xcp_mempool), len(raw_mempool),
+            logger.getChild('mempool').debug('Refresh mempool: %s XCP txs seen, out of %s total entries, %s left to parse (took %ss, next refresh in %ss)' % (
+                len(mempool.messages), len(raw_mempool), pending,
                 "{:.2f}".format(elapsed_time, 3),
                 "{:.2f}".format(sleep_time, 3)))
 
             # Wait
             db.wal_checkpoint(mode=apsw.SQLITE_CHECKPOINT_PASSIVE)
-            time.sleep(sleep_time)
+            if notifier:
+                refresh_mempool = pending > 0
+            else:
+                time.sleep(sleep_time)
 
     cursor.close()
 
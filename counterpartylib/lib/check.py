@@ -5,12 +5,16 @@ logger = logging.getLogger(__name__)
 import warnings
 import time
 import sys
+import os
+import threading
+import hashlib
 
 from counterpartylib.lib import config
 from counterpartylib.lib import util
 from counterpartylib.lib import exceptions
 from counterpartylib.lib import backend
 from counterpartylib.lib import database
+from counterpartylib.lib import supplies
 
 CONSENSUS_HASH_SEED = 'We can only see a short distance ahead, but we can see plenty there that needs to be done.'
 
@@ -93,7 +97,26 @@ CHECKPOINTS_REGTEST = {
 class ConsensusError(Exception):
     pass
 
-def consensus_hash(db, field, previous_consensus_hash, content):
+# The consensus hashes last calculated, by field, with the connection and the
+# block they are of, so that the next block need not read them back.
+LAST_CONSENSUS_HASHES = {}
+
+class ConsensusHasher(object):
+    """Consensus hash of a block, fed with its entries as they are produced.
+
+    Equal to `util.dhash_string(previous_consensus_hash + version + ''.join(entries))`.
+    """
+    def __init__(self, previous_consensus_hash, consensus_hash_version):
+        self.sha256 = hashlib.sha256('{}{}'.format(previous_consensus_hash, consensus_hash_version).encode('utf-8'))
+
+    def append(self, entry):
+        self.sha256.update(entry.encode('utf-8'))
+
+    def hexdigest(self):
+        return hashlib.sha256(self.sha256.digest()).hexdigest()
+
+def consensus_hasher(db, field, previous_consensus_hash=None):
+    """Return a `ConsensusHasher` for `field` of the current block."""
     cursor = db.cursor()
     block_index = util.CURRENT_BLOCK_INDEX
 
@@ -103,6 +126,10 @@ def consensus_hash(db, field, previous_consensus_hash, content):
         previous_consensus_hash = util.dhash_string(CONSENSUS_HASH_SEED)
 
     # Get previous hash.
+    if not previous_consensus_hash and field in LAST_CONSENSUS_HASHES:
+        last_db, last_block_index, last_consensus_hash = LAST_CONSENSUS_HASHES[field]
+        if last_db is db and last_block_index == block_index - 1:
+            previous_consensus_hash = last_consensus_hash
     if not previous_consensus_hash:
         try:
             previous_consensus_hash = list(cursor.execute('''SELECT * FROM blocks WHERE block_index = ?''', (block_index - 1,)))[0][field]
@@ -110,8 +137,8 @@ def consensus_hash(db, field, previous_consensus_hash, content):
             previous_consensus_hash = None
         if not previous_consensus_hash:
             raise ConsensusError('Empty previous {} for block {}. Please launch a `reparse`.'.format(field, block_index))
+    cursor.close()
 
-    # Calculate current hash.
     if config.TESTNET:
         consensus_hash_version = CONSENSUS_HASH_VERSION_TESTNET
     elif config.REGTEST:
@@ -119,11 +146,31 @@ def consensus_hash(db, field, previous_consensus_hash, content):
     else:
         consensus_hash_version = CONSENSUS_HASH_VERSION_MAINNET
 
-    calculated_hash = util.dhash_string(previous_consensus_hash + '{}{}'.format(consensus_hash_version, ''.join(content)))
+    return ConsensusHasher(previous_consensus_hash, consensus_hash_version)
+
+def consensus_hash(db, field, previous_consensus_hash, content, block=None):
+    """Calculate, check and save `field` of the current block.
+
+    `content` is the list of the entries of the block, or a `ConsensusHasher`
+    already fed with them. `block` is the row of the current block, if already
+    read.
+    """
+    cursor = db.cursor()
+    block_index = util.CURRENT_BLOCK_INDEX
+
+    # Calculate current hash.
+    if isinstance(content, ConsensusHasher):
+        hasher = content
+    else:
+        hasher = consensus_hasher(db, field, previous_consensus_hash)
+        hasher.append(''.join(content))
+    calculated_hash = hasher.hexdigest()
 
     # Verify hash (if already in database) or save hash (if not).
     # NOTE: do not enforce this for messages_hashes, those are more informational (for now at least)
-    found_hash = list(cursor.execute('''SELECT * FROM blocks WHERE block_index = ?''', (block_index,)))[0][field] or None
+    if block is None:
+        block = list(cursor.execute('''SELECT * FROM blocks WHERE block_index = ?''', (block_index,)))[0]
+    found_hash = block[field] or None
     if found_hash and field != 'messages_hash':
         # Check against existing value.
         if calculated_hash != found_hash:
@@ -144,18 +191,34 @@ def consensus_hash(db, field, previous_consensus_hash, content):
     if field != 'messages_hash' and block_index in checkpoints and checkpoints[block_index][field] != calculated_hash:
         raise ConsensusError('Incorrect {} hash for block {}.  Calculated {} but expected {}'.format(field, block_index, calculated_hash, checkpoints[block_index][field],))
 
+    cursor.close()
+    LAST_CONSENSUS_HASHES[field] = (db, block_index, calculated_hash)
     return calculated_hash, found_hash
 
 class SanityError(Exception):
     pass
 
-def asset_conservation(db):
+def asset_conservation(db, deep=False):
+    """Check the conservation of assets with their running totals, and if
+    `deep`, check these totals against the whole ledger."""
     logger.debug('Checking for conservation of assets.')
-    supplies = util.supplies(db)
-    held = util.held(db)
-    for asset in supplies.keys():
-        asset_issued = supplies[asset]
-        asset_held = held[asset] if asset in held and held[asset] != None else 0
+    totals = supplies.totals(db)
+    if deep:
+        supplies_scanned = util.supplies(db)
+        held_scanned = util.held(db)
+        for asset in set(totals) | set(supplies_scanned) | set(held_scanned):
+            total = totals.get(asset, dict.fromkeys(supplies.COLUMNS, 0))
+            if asset in supplies_scanned and supplies_scanned[asset] != total['issued'] - total['destroyed']:
+                raise SanityError('{} issued: {} in the ledger ≠ {} in the running totals'.format(
+                                  asset, supplies_scanned[asset], total['issued'] - total['destroyed']))
+            if (held_scanned.get(asset) or 0) != supplies.held(total):
+                raise SanityError('{} held: {} in the ledger ≠ {} in the running totals'.format(
+                                  asset, held_scanned.get(asset) or 0, supplies.held(total)))
+    for asset, total in totals.items():
+        if asset != config.XCP and not total['issuances']:
+            continue
+        asset_issued = total['issued'] - total['destroyed']
+        asset_held = supplies.held(total)
         if asset_issued != asset_held:
             raise SanityError('{} {} issued ≠ {} {} held'.format(util.value_out(db, asset_issued, asset), asset, util.value_out(db, asset_held, asset), asset))
         logger.debug('{} has been conserved ({} {} both issued and held)'.format(asset, util.value_out(db, asset_issued, asset), asset))
@@ -187,17 +250,64 @@ def check_change(protocol_change, change_name):
         else:
             warnings.warn(explanation)
 
+PROTOCOL_CHANGES_URL = 'https://counterpartyxcp.github.io/counterparty-lib/counterpartylib/protocol_changes.json'
+PROTOCOL_CHANGES = None  # last protocol changes fetched, or read from the cache
+PROTOCOL_CHANGES_TIME = 0  # when they were last fetched, or an attempt was made
+PROTOCOL_CHANGES_THREAD = None
+
+def fetch_protocol_changes():
+    """Fetch the protocol changes and save them to the cache file."""
+    global PROTOCOL_CHANGES, PROTOCOL_CHANGES_TIME
+
+    try:
+        response = requests.get(PROTOCOL_CHANGES_URL, headers={'cache-control': 'no-cache'}, timeout=config.REQUESTS_TIMEOUT)
+        versions = json.loads(response.text)
+    except (requests.exceptions.RequestException, ConnectionRefusedError, ValueError) as e:
+        logger.warning('Unable to check version! ' + str(sys.exc_info()[1]))
+        PROTOCOL_CHANGES_TIME = time.time()
+        return
+
+    PROTOCOL_CHANGES, PROTOCOL_CHANGES_TIME = versions, time.time()
+    if config.PROTOCOL_CHANGES_CACHE:
+        try:
+            with open(config.PROTOCOL_CHANGES_CACHE + '.tmp', 'w') as f:
+                json.dump(versions, f)
+            os.replace(config.PROTOCOL_CHANGES_CACHE + '.tmp', config.PROTOCOL_CHANGES_CACHE)
+        except OSError as e:
+            logger.warning('Unable to cache protocol changes: {}'.format(e))
+
+def load_protocol_changes():
+    """Read the protocol changes from the cache file, if there is one."""
+    global PROTOCOL_CHANGES, PROTOCOL_CHANGES_TIME
+
+    try:
+        with open(config.PROTOCOL_CHANGES_CACHE, 'r') as f:
+            PROTOCOL_CHANGES = json.load(f)
+        PROTOCOL_CHANGES_TIME = os.path.getmtime(config.PROTOCOL_CHANGES_CACHE)
+    except (TypeError, OSError, ValueError):
+        pass
+
 def software_version():
+    """Check the version against the protocol changes, which are fetched in
+    the background at most every `config.VERSION_CHECK_INTERVAL` seconds."""
+    global PROTOCOL_CHANGES_THREAD
+
     if config.FORCE:
         return
     logger.debug('Checking version.')
 
-    try:
-        host = 'https://counterpartyxcp.github.io/counterparty-lib/counterpartylib/protocol_changes.json'
-        response = requests.get(host, headers={'cache-control': 'no-cache'})
-        versions = json.loads(response.text)
-    except (requests.exceptions.ConnectionError, ConnectionRefusedError, ValueError) as e:
-        logger.warning('Unable to check version! ' + str(sys.exc_info()[1]))
+    if not PROTOCOL_CHANGES_TIME:
+        load_protocol_changes()
+    if not PROTOCOL_CHANGES_TIME:
+        # First check, without cache: don’t start parsing before it’s done.
+        fetch_protocol_changes()
+    elif time.time() - PROTOCOL_CHANGES_TIME >= config.VERSION_CHECK_INTERVAL:
+        if PROTOCOL_CHANGES_THREAD is None or not PROTOCOL_CHANGES_THREAD.is_alive():
+            PROTOCOL_CHANGES_THREAD = threading.Thread(target=fetch_protocol_changes, daemon=True)
+            PROTOCOL_CHANGES_THREAD.start()
+
+    versions = PROTOCOL_CHANGES
+    if versions is None:
         return
 
     for change_name in versions:
@@ -120,10 +120,24 @@ EXITCODE_UPDATE_REQUIRED = 5
 
 
 DEFAULT_CHECK_ASSET_CONSERVATION = True
+DEFAULT_CHECK_ASSET_CONSERVATION_DEEP = False # also check the running totals of the assets against the whole ledger
 
 BACKEND_RAW_TRANSACTIONS_CACHE_SIZE = 20000
 BACKEND_RPC_BATCH_NUM_WORKERS = 6
 
+DEFAULT_BLOCK_PREFETCH_QUEUE_SIZE = 10 # number of blocks fetched ahead of the parser during catch-up, 0 to disable
+DEFAULT_TX_DECODE_WORKERS = 0 # number of processes decoding the transactions of a block, 0 or 1 to decode in-process
+DEFAULT_BLOCK_COMMIT_BATCH_SIZE = 1 # number of blocks committed at once during catch-up, 1 to commit every block
+DEFAULT_BLOCK_COMMIT_INTERVAL = 10 # seconds after which a batch of blocks is committed anyway
+DEFAULT_VERSION_CHECK_INTERVAL = 3600 # seconds between two downloads of the protocol changes
+DEFAULT_FAST_SYNC = False # don't write the undolog while more than UNDOLOG_MAX_PAST_BLOCKS behind the backend
+DEFAULT_BACKEND_ZMQ_QUIET_INTERVAL = 10 # seconds without backend ZeroMQ notifications before polling the backend
+DEFAULT_API_DB_POOL_SIZE = 10 # read-only database connections of the API server, 0 to share a single one
+DEFAULT_SNAPSHOT_INTERVAL = 0 # blocks between two snapshots of the database, for rollbacks beyond the undolog, 0 to disable
+DEFAULT_SNAPSHOT_COUNT = 3 # number of database snapshots kept
+DEFAULT_CHECKDB_DEFERRED = False # with `checkdb`, only quick-check the database at startup, and fully in the background
+DEFAULT_CHECKDB_PER_TABLE = False # run the background checks of the database one table at a time
+
 UNDOLOG_MAX_PAST_BLOCKS = 100 #the number of past blocks that we store undolog history
 
 DEFAULT_UTXO_LOCKS_MAX_ADDRESSES = 1000
@@ -134,7 +148,7 @@ ADDRESS_OPTION_MAX_VALUE = ADDRESS_OPTION_REQUIRE_MEMO # Or list of all the addr
 OLD_STYLE_API = True
 
 API_LIMIT_ROWS = 1000
-MEMPOOL_TXCOUNT_UPDATE_LIMIT=60000
+MEMPOOL_PARSE_CHUNK_SIZE=1000 # new mempool transactions parsed per refresh
 
 MPMA_LIMIT = 1000
 
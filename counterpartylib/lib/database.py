@@ -1,17 +1,89 @@
 import apsw
 import logging
 logger = logging.getLogger(__name__)
+import os
 import time
+import queue
+import threading
 import collections
-import copy
 
 from counterpartylib.lib import config
 from counterpartylib.lib import util
 from counterpartylib.lib import exceptions
 from counterpartylib.lib import log
 
+# Fed to the messages hash of the block being parsed (a `check.ConsensusHasher`).
 BLOCK_MESSAGES = []
 
+class Row(tuple):
+    """A read-only row, as a tuple with mapping access by column name."""
+    __slots__ = ()
+    _fields = ()
+    _index = {}
+
+    def __getitem__(self, key):
+        if key.__class__ is str:
+            return tuple.__getitem__(self, self._index[key])
+        return tuple.__getitem__(self, key)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __eq__(self, other):
+        if isinstance(other, Row):
+            return self._fields == other._fields and tuple.__eq__(self, other)
+        if isinstance(other, dict):
+            return self._asdict() == other
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = tuple.__hash__
+
+    def __repr__(self):
+        return 'Row({})'.format(self._asdict())
+
+    def get(self, key, default=None):
+        index = self._index.get(key)
+        return default if index is None else tuple.__getitem__(self, index)
+
+    def keys(self):
+        return self._fields
+
+    def values(self):
+        return tuple(tuple.__iter__(self))
+
+    def items(self):
+        return zip(self._fields, tuple.__iter__(self))
+
+    def _asdict(self):
+        """Return the row as a dict, to modify it or serialize it."""
+        return dict(zip(self._fields, tuple.__iter__(self)))
+
+# One `Row` type per statement description, i.e. per list of columns.
+ROW_TYPES = {}
+
+def get_row_type(cursor):
+    """Return the `Row` type of the statement being run by `cursor`."""
+    description = cursor.getdescription()
+    try:
+        return ROW_TYPES[description]
+    except KeyError:
+        pass
+    if len(ROW_TYPES) > 10000:
+        # Arbitrary queries of the API.
+        ROW_TYPES.clear()
+    fields = tuple(name for name, type_ in description)
+    row_type = type('Row', (Row,), {'__slots__': (), '_fields': fields,
+                                    '_index': {name: index for index, name in enumerate(fields)}})
+    ROW_TYPES[description] = row_type
+    return row_type
+
 def rowtracer(cursor, sql):
     """Converts fetched SQL data into dict-style"""
     dictionary = {}
@@ -19,14 +91,85 @@ def rowtracer(cursor, sql):
         dictionary[name] = sql[index]
     return dictionary
 
-def exectracer(cursor, sql, bindings):
+def row_cursor(db, exectrace=True):
+    """Return a cursor fetching read-only `Row` objects rather than dicts.
+
+    The `Row` type is looked up once per statement, from the exec tracer of the
+    cursor (which mustn't be replaced), which then calls the exec tracer of the
+    connection, unless `exectrace` is `False`.
+    """
+    cursor = db.cursor()
+    connection_exectracer = db.getexectrace() if exectrace else None
+    row_types = [None]
+
+    def row_cursor_exectracer(cursor, sql, bindings):
+        row_types[0] = None
+        if connection_exectracer is None:
+            return True
+        return connection_exectracer(cursor, sql, bindings)
+
+    def row_cursor_rowtracer(cursor, sql):
+        row_type = row_types[0]
+        if row_type is None:
+            row_type = row_types[0] = get_row_type(cursor)
+        return row_type(sql)
+
+    cursor.setexectrace(row_cursor_exectracer)
+    cursor.setrowtrace(row_cursor_rowtracer)
+    return cursor
+
+def tuple_cursor(db):
+    """Return a cursor fetching plain tuples rather than dicts."""
+    cursor = db.cursor()
+    cursor.setrowtrace(None)
+    return cursor
+
+def dict_rows(db, statement, bindings=()):
+    """Run `statement` and yield its rows as dicts, built from the tuples of a
+    `tuple_cursor()` with the column names looked up once per statement,
+    rather than for each row by the row tracer of the connection."""
+    cursor = tuple_cursor(db)
+    connection_exectracer = db.getexectrace()
+    names = []
+
+    def dict_rows_exectracer(cursor, sql, bindings):
+        del names[:]
+        if connection_exectracer is None:
+            return True
+        return connection_exectracer(cursor, sql, bindings)
+
+    cursor.setexectrace(dict_rows_exectracer)
+    try:
+        for row in cursor.execute(statement, bindings):
+            if not names:
+                names.extend(name for name, type_ in cursor.getdescription())
+            yield dict(zip(names, row))
+    finally:
+        cursor.close()
+
+# Changes to these tables aren't recorded in the messages or in the messages hash.
+SKIP_TABLES = [
+    'blocks', 'transactions',
+    'balances', 'messages', 'mempool', 'assets',
+    'new_sends', 'new_issuances' # interim table for CIP10 activation
+]
+# Updates of these tables are listed in the messages manually.
+SKIP_TABLES_UPDATE = ['orders', 'bets', 'rps', 'order_matches', 'bet_matches', 'rps_matches']
+
+# Whether each SQL statement text run uses the balances, and its classification
+# (see `classify_statement()`).
+STATEMENT_CLASSES = {}
+
+def classify_statement(sql):
+    """Return the command and the category of a statement, and whether to record
+    it in the messages and in the messages hash; `None` to record nothing."""
     # This means that all changes to database must use a very simple syntax.
     # TODO: Need sanity checks here.
     sql = sql.lower()
 
     if sql.startswith('create trigger') or sql.startswith('drop trigger'):
         #CREATE TRIGGER stmts may include an "insert" or "update" as part of them
-        return True
+        return None
 
     # Parse SQL.
     array = sql.split('(')[0].split(' ')
@@ -37,26 +180,37 @@ def exectracer(cursor, sql, bindings):
         category = array[1]
     else:
         #CREATE TABLE, etc
-        return True
-
-    db = cursor.getconnection()
-    dictionary = {'command': command, 'category': category, 'bindings': bindings}
+        return None
 
-    skip_tables = [
-        'blocks', 'transactions',
-        'balances', 'messages', 'mempool', 'assets',
-        'new_sends', 'new_issuances' # interim table for CIP10 activation
-    ]
-    skip_tables_block_messages = copy.copy(skip_tables)
+    skip_tables = SKIP_TABLES
     if command == 'update':
         # List message manually.
-        skip_tables += ['orders', 'bets', 'rps', 'order_matches', 'bet_matches', 'rps_matches']
+        skip_tables = SKIP_TABLES + SKIP_TABLES_UPDATE
+
+    return command, category, category not in skip_tables, category not in SKIP_TABLES
+
+def exectracer(cursor, sql, bindings):
+    try:
+        uses_balances, statement_class = STATEMENT_CLASSES[sql]
+    except KeyError:
+        if len(STATEMENT_CLASSES) > 10000:
+            # Arbitrary queries of the API.
+            STATEMENT_CLASSES.clear()
+        uses_balances, statement_class = STATEMENT_CLASSES[sql] = ('balances' in sql.lower(), classify_statement(sql))
+
+    # Statements on the balances see the writes cached by `util.credit()` and `util.debit()`.
+    if uses_balances and util.PENDING_BALANCES and cursor.getconnection() is util.BALANCES_DB:
+        util.flush_balances()
+
+    if statement_class is None:
+        return True
+    command, category, record_message, record_block_message = statement_class
 
     # Record alteration in database.
-    if category not in skip_tables:
-        log.message(db, bindings['block_index'], command, category, bindings)
+    if record_message:
+        log.message(cursor.getconnection(), bindings['block_index'], command, category, bindings)
     # Record alteration in computation of message feed hash for the block
-    if category not in skip_tables_block_messages:
+    if record_block_message and util.SPECULATIVE_MESSAGES is None:
         # don't include asset_longname as part of the messages hash
         #   until subassets are enabled
         if category == 'issuances' and not util.enabled('subassets'):
@@ -74,8 +228,12 @@ def exectracer(cursor, sql, bindings):
 
 class DatabaseIntegrityError(exceptions.DatabaseError):
     pass
-def get_connection(read_only=True, foreign_keys=True, integrity_check=True):
-    """Connects to the SQLite database, returning a db `Connection` object"""
+def get_connection(read_only=True, foreign_keys=True, integrity_check=True, quick_check=False):
+    """Connects to the SQLite database, returning a db `Connection` object
+
+    With `quick_check`, the foreign key check is skipped and the integrity
+    check is a `PRAGMA quick_check`: the full checks are left to an
+    `IntegrityCheck` in the background."""
     logger.debug('Creating connection to `{}`.'.format(config.DATABASE))
 
     if read_only:
@@ -89,15 +247,17 @@ def get_connection(read_only=True, foreign_keys=True, integrity_check=True):
         logger.info('Checking database foreign keys...')
         cursor.execute('''PRAGMA foreign_keys = ON''')
         cursor.execute('''PRAGMA defer_foreign_keys = ON''')
-        rows = list(cursor.execute('''PRAGMA foreign_key_check'''))
-        if rows:
-            for row in rows:
-                logger.debug('Foreign Key Error: {}'.format(row))
-            raise exceptions.DatabaseError('Foreign key check failed.')
+        if not quick_check:
+            rows = list(cursor.execute('''PRAGMA foreign_key_check'''))
+            if rows:
+                for row in rows:
+                    logger.debug('Foreign Key Error: {}'.format(row))
+                raise exceptions.DatabaseError('Foreign key check failed.')
 
         # So that writers don’t block readers.
         cursor.execute('''PRAGMA journal_mode = WAL''')
-        logger.info('Foreign key check completed.')
+        if not quick_check:
+            logger.info('Foreign key check completed.')
 
     # Make case sensitive the `LIKE` operator.
     # For insensitive queries use 'UPPER(fieldname) LIKE value.upper()''
@@ -108,7 +268,7 @@ def get_connection(read_only=True, foreign_keys=True, integrity_check=True):
         integral = False
         for i in range(10): # DUPE
             try:
-                cursor.execute('''PRAGMA integrity_check''')
+                cursor.execute('''PRAGMA quick_check''' if quick_check else '''PRAGMA integrity_check''')
                 rows = cursor.fetchall()
                 if not (len(rows) == 1 and rows[0][0] == 'ok'):
                     raise exceptions.DatabaseError('Integrity check failed.')
@@ -127,6 +287,141 @@ def get_connection(read_only=True, foreign_keys=True, integrity_check=True):
     cursor.close()
     return db
 
+# Progress and result of the last `IntegrityCheck`, for the API.
+INTEGRITY_CHECK = {'status': None, 'checks': 0, 'checks_done': 0, 'errors': []}
+
+def check_integrity_status():
+    """Raise an error if an `IntegrityCheck` found the database corrupted."""
+    if INTEGRITY_CHECK['status'] == 'failed':
+        raise DatabaseIntegrityError('Integrity check failed: {}'.format('; '.join(INTEGRITY_CHECK['errors'][:10])))
+
+class IntegrityCheck(threading.Thread):
+    """Run the full foreign key and integrity checks of the database, on a
+    read-only connection of its own, reporting them in `INTEGRITY_CHECK`.
+
+    With `per_table`, the tables are checked one at a time, each in a read
+    transaction of its own, so that the parser can checkpoint the WAL
+    in between. SQLite checks the integrity of a single table only from
+    3.33.0: before that, the integrity of the whole database is checked last."""
+
+    def __init__(self, per_table=False):
+        self.per_table = per_table
+        threading.Thread.__init__(self, name='integrity_check', daemon=True)
+
+    def check(self, cursor, pragma):
+        rows = list(cursor.execute(pragma))
+        if pragma.startswith('PRAGMA foreign_key_check'):
+            return ['Foreign key error: {}'.format(tuple(row)) for row in rows]
+        return [row[0] for row in rows if row[0] != 'ok']
+
+    def run(self):
+        start_time = time.time()
+        logger.info('Checking database foreign keys and integrity in the background...')
+        db = get_connection(read_only=True, foreign_keys=False, integrity_check=False)
+        cursor = db.cursor()
+        cursor.setrowtrace(None)
+        if self.per_table:
+            tables = [row[0] for row in cursor.execute('''SELECT name FROM sqlite_master WHERE type = 'table' ''')]
+            pragmas = ['PRAGMA foreign_key_check({})'.format(table) for table in tables]
+            if tuple(int(n) for n in apsw.sqlitelibversion().split('.')[:3]) >= (3, 33, 0):
+                pragmas += ['PRAGMA integrity_check({})'.format(table) for table in tables]
+            else:
+                pragmas.append('PRAGMA integrity_check')
+        else:
+            pragmas = ['PRAGMA foreign_key_check', 'PRAGMA integrity_check']
+        INTEGRITY_CHECK.update(status='running', checks=len(pragmas), checks_done=0, errors=[])
+
+        try:
+            for pragma in pragmas:
+                INTEGRITY_CHECK['errors'].extend(self.check(cursor, pragma))
+                INTEGRITY_CHECK['checks_done'] += 1
+        except apsw.Error as e:
+            INTEGRITY_CHECK['errors'].append(str(e))
+        finally:
+            db.close()
+
+        if INTEGRITY_CHECK['errors']:
+            INTEGRITY_CHECK['status'] = 'failed'
+            for error in INTEGRITY_CHECK['errors']:
+                logger.debug(error)
+            logger.error('Database integrity check failed, with {} errors.'.format(len(INTEGRITY_CHECK['errors'])))
+        else:
+            INTEGRITY_CHECK['status'] = 'ok'
+            logger.info('Database foreign key and integrity checks completed in {:.1f}s.'.format(time.time() - start_time))
+
+def database_file_id():
+    """Identify the database file, to notice when it is replaced."""
+    try:
+        stat = os.stat(config.DATABASE)
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+class ConnectionPool(object):
+    """A bounded pool of read-only connections. A thread checks out one
+    connection with `get()` and uses it until it calls `release()`.
+
+    Connections opened before `recycle()` was called, or before the database
+    file was replaced, are closed rather than reused. So are those released
+    after an error."""
+
+    def __init__(self, size, timeout=None):
+        self.timeout = timeout
+        self.slots = threading.BoundedSemaphore(size)
+        self.idle = queue.LifoQueue() # reuse the connections with a warm cache first
+        self.local = threading.local()
+        self.generation = 0
+
+    def is_stale(self, connection):
+        db, generation, file_id = connection
+        return generation != self.generation or file_id != database_file_id()
+
+    def get(self):
+        """Return the connection checked out by the current thread."""
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            if not self.slots.acquire(timeout=self.timeout):
+                raise exceptions.DatabaseError('No database connection available.')
+            try:
+                while True:
+                    try:
+                        connection = self.idle.get_nowait()
+                    except queue.Empty:
+                        connection = (get_connection(read_only=True, integrity_check=False),
+                                      self.generation, database_file_id())
+                        break
+                    if not self.is_stale(connection):
+                        break
+                    connection[0].close()
+            except:
+                self.slots.release()
+                raise
+            self.local.connection = connection
+        return connection[0]
+
+    def release(self, discard=False):
+        """Return the connection of the current thread to the pool, if any."""
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            return
+        del self.local.connection
+        if discard or self.is_stale(connection):
+            connection[0].close()
+        else:
+            self.idle.put(connection)
+        self.slots.release()
+
+    def recycle(self):
+        """Have the connections reopened, e.g. after a `VACUUM`."""
+        self.generation += 1
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait()[0].close()
+            except queue.Empty:
+                break
+
 def version(db):
     cursor = db.cursor()
     user_version = cursor.execute('PRAGMA user_version').fetchall()[0]['user_version']
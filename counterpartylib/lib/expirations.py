@@ -0,0 +1,79 @@
+"""
+Schedule of the expirations of open orders, bets and rps and of pending
+matches, in the table `expirations_due`, so that each block reads only the
+items due to expire in it, instead of searching the whole tables.
+
+Each item is scheduled by its expiration (the block index, or the deadline for
+bet matches) and its rowid. The schedule is kept by triggers on the tables of
+the items, in the same transaction as each change of these tables, including
+the changes undone from the undolog: it needs no undolog records of its own.
+"""
+
+import logging
+logger = logging.getLogger(__name__)
+
+# For each table, the items which may expire, as an SQL condition on the row
+# `{0}`, their expiration, and the order in which they are expired: the order
+# of the rows of the searches of the tables this schedule replaces.
+SCHEDULE = {
+    'orders': ("{0}.status = 'open'", 'expire_index', 'expirations_due.due, expirations_due.item'),
+    'order_matches': ("{0}.status = 'pending'", 'match_expire_index', 'expirations_due.due, expirations_due.item'),
+    'bets': ("{0}.status = 'open'", 'expire_index', 'expirations_due.item'),
+    'bet_matches': ("{0}.status = 'pending'", 'deadline', 'expirations_due.item'),
+    'rps': ("{0}.status = 'open'", 'expire_index', 'expirations_due.item'),
+    'rps_matches': ("{0}.status IN ('pending', 'pending and resolved', 'resolved and pending')", 'match_expire_index',
+                    'rps_matches.status, expirations_due.due, expirations_due.item'),
+}
+
+def initialise(db):
+    """Create the table and its triggers, and schedule the items of a
+    database that had no schedule."""
+    cursor = db.cursor()
+    cursor.setexectrace(None)
+    created = not list(cursor.execute('''SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'expirations_due' '''))
+    cursor.execute('''CREATE TABLE IF NOT EXISTS expirations_due(
+                      kind TEXT,
+                      due INTEGER,
+                      item INTEGER,
+                      PRIMARY KEY (kind, due, item))
+                      WITHOUT ROWID
+                   ''')
+    create_triggers(cursor)
+    if created:
+        rebuild(cursor)
+    cursor.close()
+
+def create_triggers(cursor):
+    for table, (condition, due, order) in SCHEDULE.items():
+        schedule = '''INSERT INTO expirations_due SELECT '{0}', new.{1}, new.rowid
+                      WHERE {2} AND new.{1} IS NOT NULL'''.format(table, due, condition.format('new'))
+        unschedule = '''DELETE FROM expirations_due
+                        WHERE kind = '{0}' AND due = old.{1} AND item = old.rowid'''.format(table, due)
+        for trigger_type, event, statements in (('insert', 'INSERT', [schedule]),
+                                                ('update', 'UPDATE OF status, {}'.format(due), [unschedule, schedule]),
+                                                ('delete', 'DELETE', [unschedule])):
+            cursor.execute('''CREATE TRIGGER IF NOT EXISTS _{0}_expirations_{1} AFTER {2} ON {0} BEGIN
+                                {3};
+                                END;
+                           '''.format(table, trigger_type, event, ';\n'.join(statements)))
+
+def rebuild(cursor):
+    """Schedule the items from the tables they are the rows of."""
+    cursor.execute('''DELETE FROM expirations_due''')
+    for table, (condition, due, order) in SCHEDULE.items():
+        cursor.execute('''INSERT INTO expirations_due SELECT '{0}', {1}, rowid FROM {0}
+                          WHERE {2} AND {1} IS NOT NULL'''.format(table, due, condition.format(table)))
+    count = list(cursor.execute('''SELECT COUNT(*) AS count FROM expirations_due'''))[0]['count']
+    logger.debug('Scheduled the expiration of {} items.'.format(count))
+
+def due(db, table, expiration):
+    """Return the rows of `table` which expire before `expiration`."""
+    condition, due, order = SCHEDULE[table]
+    cursor = db.cursor()
+    rows = list(cursor.execute('''SELECT {0}.* FROM expirations_due CROSS JOIN {0} ON {0}.rowid = expirations_due.item
+                                  WHERE expirations_due.kind = ? AND expirations_due.due < ?
+                                  ORDER BY {1}'''.format(table, order), (table, expiration)))
+    cursor.close()
+    return rows
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -14,6 +14,7 @@ from colorlog import ColoredFormatter
 from counterpartylib.lib import config
 from counterpartylib.lib import exceptions
 from counterpartylib.lib import util
+from counterpartylib.lib import database
 
 class ModuleLoggingFilter(logging.Filter):
     """
@@ -149,18 +150,36 @@ def isodt (epoch_time):
     except OSError:
         return '<datetime>'
 
-def message(db, block_index, command, category, bindings, tx_hash=None):
-    cursor = db.cursor()
-
-    # Get last message index.
-    messages = list(cursor.execute('''SELECT * FROM messages
-                                      WHERE message_index = (SELECT MAX(message_index) from messages)'''))
-    if messages:
-        assert len(messages) == 1
-        message_index = messages[0]['message_index'] + 1
-    else:
-        message_index = 0
+# Next `message_index` on the connection `MESSAGE_INDEX_DB`, kept in memory by
+# `message()` and reset by `reset_message_index()` for each block and rollback.
+MESSAGE_INDEX_DB = None
+NEXT_MESSAGE_INDEX = None
+
+def reset_message_index():
+    """Forget the next message index: it is read from the database again by
+    the next `message()`."""
+    global MESSAGE_INDEX_DB, NEXT_MESSAGE_INDEX
+    MESSAGE_INDEX_DB, NEXT_MESSAGE_INDEX = None, None
+
+def get_next_message_index(db):
+    global MESSAGE_INDEX_DB, NEXT_MESSAGE_INDEX
+    if MESSAGE_INDEX_DB is not db:
+        cursor = database.tuple_cursor(db)
+        last_message_index = list(cursor.execute('''SELECT MAX(message_index) FROM messages'''))[0][0]
+        cursor.close()
+        MESSAGE_INDEX_DB = db
+        NEXT_MESSAGE_INDEX = 0 if last_message_index is None else last_message_index + 1
+    return NEXT_MESSAGE_INDEX
+
+def hexlify_bytes(value):
+    """Encode binary data of the bindings of messages (see `json.JSONEncoder.default()`)."""
+    if type(value) == bytes:
+        return binascii.hexlify(value).decode('ascii')
+    raise TypeError('{} is not JSON serializable'.format(repr(value)))
+BINDINGS_ENCODER = json.JSONEncoder(default=hexlify_bytes)
 
+def message(db, block_index, command, category, bindings, tx_hash=None):
+    global NEXT_MESSAGE_INDEX
     # Not to be misleading…
     if block_index == config.MEMPOOL_BLOCK_INDEX:
         try:
@@ -171,16 +190,20 @@ def message(db, block_index, command, category, bindings, tx_hash=None):
             pass
 
     # Handle binary data.
-    items = []
-    for item in sorted(bindings.items()):
-        if type(item[1]) == bytes:
-            items.append((item[0], binascii.hexlify(item[1]).decode('ascii')))
-        else:
-            items.append(item)
+    bindings_string = BINDINGS_ENCODER.encode(collections.OrderedDict(sorted(bindings.items())))
+
+    # Capture the messages of speculatively parsed transactions.
+    if util.SPECULATIVE_MESSAGES is not None:
+        util.SPECULATIVE_MESSAGES.append({'block_index': block_index, 'command': command, 'category': category,
+                                          'bindings': bindings_string, 'timestamp': curr_time()})
+        return
+
+    cursor = db.cursor()
 
-    bindings_string = json.dumps(collections.OrderedDict(items))
+    message_index = get_next_message_index(db)
     cursor.execute('insert into messages values(:message_index, :block_index, :command, :category, :bindings, :timestamp)',
                    (message_index, block_index, command, category, bindings_string, curr_time()))
+    NEXT_MESSAGE_INDEX = message_index + 1
 
     # Log only real transactions.
     if block_index != config.MEMPOOL_BLOCK_INDEX:
@@ -25,6 +25,7 @@ from counterpartylib.lib import exceptions
 from counterpartylib.lib import util
 from counterpartylib.lib import log
 from counterpartylib.lib import message_type
+from counterpartylib.lib import expirations
 
 FORMAT = '>HIQQdII'
 LENGTH = 2 + 4 + 8 + 8 + 8 + 4 + 4
@@ -559,9 +560,7 @@ def expire (db, block_index, block_time):
     cursor = db.cursor()
 
     # Expire bets and give refunds for the quantity wager_remaining.
-    cursor.execute('''SELECT * FROM bets \
-                      WHERE (status = ? AND expire_index < ?)''', ('open', block_index))
-    for bet in cursor.fetchall():
+    for bet in expirations.due(db, 'bets', block_index):
         cancel_bet(db, bet, 'expired', block_index)
 
         # Record bet expiration.
@@ -575,9 +574,7 @@ def expire (db, block_index, block_time):
         cursor.execute(sql, bindings)
 
     # Expire bet matches whose deadline is more than two weeks before the current block time.
-    cursor.execute('''SELECT * FROM bet_matches \
-                      WHERE (status = ? AND deadline < ?)''', ('pending', block_time - config.TWO_WEEKS))
-    for bet_match in cursor.fetchall():
+    for bet_match in expirations.due(db, 'bet_matches', block_time - config.TWO_WEEKS):
         cancel_bet_match(db, bet_match, 'expired', block_index)
 
         # Record bet match expiration.
@@ -196,9 +196,9 @@ def parse (db, tx, message):
             util.debit(db, tx['source'], config.XCP, fee, action='dividend fee', event=tx['tx_hash'])
 
         # Credit.
-        for output in outputs:
-            if not util.enabled('dont_credit_zero_dividend') or output['dividend_quantity'] > 0:
-                util.credit(db, output['address'], dividend_asset, output['dividend_quantity'], action='dividend', event=tx['tx_hash'])
+        util.credit_many(db, [(output['address'], dividend_asset, output['dividend_quantity'], 'dividend', tx['tx_hash'])
+                              for output in outputs
+                              if not util.enabled('dont_credit_zero_dividend') or output['dividend_quantity'] > 0])
 
     # Add parsed transaction to message-type–specific table.
     bindings = {
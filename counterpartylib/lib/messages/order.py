@@ -4,8 +4,11 @@
 # which cannot have expired order matches) may be filled.
 import json
 import struct
+import bisect
 import decimal
 D = decimal.Decimal
+import fractions
+import itertools
 import logging
 logger = logging.getLogger(__name__)
 
@@ -14,7 +17,9 @@ from counterpartylib.lib import exceptions
 from counterpartylib.lib import util
 from counterpartylib.lib import backend
 from counterpartylib.lib import log
+from counterpartylib.lib import database
 from counterpartylib.lib import message_type
+from counterpartylib.lib import expirations
 
 FORMAT = '>QQQQHQ'
 LENGTH = 8 + 8 + 8 + 8 + 2 + 8
@@ -148,6 +153,105 @@ def initialise(db):
                       tx1_address_idx ON order_match_expirations (tx1_address)
                    ''')
 
+class OrderBook(object):
+    """The open orders of the pairs of assets matched so far, in memory,
+    sorted as `match()` considers them: by price, then by `tx_index`.
+
+    The book is kept in step with the `orders` table by temporary triggers,
+    whatever the change, including the changes undone from the undolog. Each
+    change also sets the token of its pair in the temporary table
+    `order_book_tokens`: a change rolled back takes the token with it, and
+    the pair is loaded again from the database the next time it is matched.
+    """
+    TOKENS = itertools.count(1) # never reused, whatever the connection
+    TRIGGERS = ('_orders_book_insert', '_orders_book_update', '_orders_book_delete')
+
+    def __init__(self, db):
+        self.db = db
+        self.pairs = {}
+        db.createscalarfunction('order_book_add', self.add)
+        db.createscalarfunction('order_book_remove', self.remove)
+
+    def create_triggers(self):
+        cursor = self.db.cursor()
+        cursor.setexectrace(None)
+        cursor.execute('''CREATE TEMP TABLE IF NOT EXISTS order_book_tokens(
+                          give_asset TEXT,
+                          get_asset TEXT,
+                          token INTEGER,
+                          PRIMARY KEY (give_asset, get_asset))
+                       ''')
+        self.columns = [column['name'] for column in cursor.execute('''PRAGMA main.table_info(orders)''')]
+        add = '''INSERT OR REPLACE INTO order_book_tokens VALUES(new.give_asset, new.get_asset, order_book_add({}))'''.format(
+              ', '.join('new.{}'.format(column) for column in self.columns))
+        remove = '''INSERT OR REPLACE INTO order_book_tokens VALUES(old.give_asset, old.get_asset,
+                    order_book_remove(old.give_asset, old.get_asset, old.tx_index))'''
+        for trigger, event, statements in zip(self.TRIGGERS, ('INSERT', 'UPDATE', 'DELETE'), ([add], [remove, add], [remove])):
+            cursor.execute('''CREATE TEMP TRIGGER IF NOT EXISTS {} AFTER {} ON main.orders BEGIN
+                                {};
+                                END;
+                           '''.format(trigger, event, ';\n'.join(statements)))
+        cursor.close()
+
+    def add(self, *values):
+        order = dict(zip(self.columns, values))
+        token = next(self.TOKENS)
+        pair = self.pairs.get((order['give_asset'], order['get_asset']))
+        if pair is not None:
+            if order['status'] == 'open':
+                bisect.insort(pair['keys'], self.key(order))
+                pair['orders'][order['tx_index']] = order
+            pair['token'] = token
+        return token
+
+    def remove(self, give_asset, get_asset, tx_index):
+        token = next(self.TOKENS)
+        pair = self.pairs.get((give_asset, get_asset))
+        if pair is not None:
+            order = pair['orders'].pop(tx_index, None)
+            if order is not None:
+                del pair['keys'][bisect.bisect_left(pair['keys'], self.key(order))]
+            pair['token'] = token
+        return token
+
+    def key(self, order):
+        return (fractions.Fraction(order['get_quantity'], order['give_quantity']), order['tx_index'])
+
+    def open_orders(self, give_asset, get_asset):
+        """Return the open orders giving `give_asset` for `get_asset`, by
+        price (as fractions, see `util.price()`), then by `tx_index`."""
+        cursor = database.row_cursor(self.db, exectrace=False)
+        objects = list(cursor.execute('''SELECT COUNT(*) AS count FROM sqlite_temp_master
+                                         WHERE name IN (?, ?, ?, ?)''', ('order_book_tokens',) + self.TRIGGERS))[0]
+        if objects['count'] != len(self.TRIGGERS) + 1:
+            # Not created yet, or gone: the table `orders` was dropped with
+            # its triggers, or their creation was rolled back.
+            self.pairs.clear()
+            self.create_triggers()
+        token = list(cursor.execute('''SELECT token FROM order_book_tokens WHERE give_asset = ? AND get_asset = ?''',
+                                    (give_asset, get_asset)))
+        token = token[0]['token'] if token else None
+
+        pair = self.pairs.get((give_asset, get_asset))
+        if pair is None or pair['token'] != token:
+            orders = list(cursor.execute('''SELECT * FROM orders WHERE (give_asset = ? AND get_asset = ? AND status = ?)''',
+                                         (give_asset, get_asset, 'open')))
+            pair = self.pairs[(give_asset, get_asset)] = {
+                'keys': sorted(self.key(order) for order in orders),
+                'orders': dict((order['tx_index'], order) for order in orders),
+                'token': token
+            }
+        cursor.close()
+        return [pair['orders'][tx_index] for price, tx_index in pair['keys']]
+
+ORDER_BOOK = None
+
+def get_order_book(db):
+    global ORDER_BOOK
+    if ORDER_BOOK is None or ORDER_BOOK.db is not db:
+        ORDER_BOOK = OrderBook(db)
+    return ORDER_BOOK
+
 def exact_penalty (db, address, block_index, order_match_id):
     # Penalize addresses that don’t make BTC payments. If an address lets an
     # order match expire, expire sell BTC orders from that address.
@@ -491,7 +595,7 @@ def parse (db, tx, message):
 
 def match (db, tx, block_index=None):
 
-    cursor = db.cursor()
+    cursor = database.row_cursor(db)
 
     # Get order in question.
     orders = list(cursor.execute('''SELECT * FROM orders\
@@ -503,17 +607,26 @@ def match (db, tx, block_index=None):
         assert len(orders) == 1
     tx1 = orders[0]
 
-    cursor.execute('''SELECT * FROM orders \
-                      WHERE (give_asset=? AND get_asset=? AND status=? AND tx_hash != ?)''',
-                   (tx1['get_asset'], tx1['give_asset'], 'open', tx1['tx_hash']))
-
     tx1_give_remaining = tx1['give_remaining']
     tx1_get_remaining = tx1['get_remaining']
 
-    order_matches = cursor.fetchall()
-    if tx['block_index'] > 284500 or config.TESTNET or config.REGTEST:  # Protocol change.
-        order_matches = sorted(order_matches, key=lambda x: x['tx_index'])                              # Sort by tx index second.
-        order_matches = sorted(order_matches, key=lambda x: util.price(x['get_quantity'], x['give_quantity']))   # Sort by price first.
+    sorted_by_price = tx['block_index'] > 284500 or config.TESTNET or config.REGTEST    # Protocol change.
+    if sorted_by_price and (util.CURRENT_BLOCK_INDEX >= 294500 or config.TESTNET or config.REGTEST):    # Prices as fractions (see `util.price()`).
+        order_matches = [order for order in get_order_book(db).open_orders(tx1['get_asset'], tx1['give_asset'])
+                         if order['tx_hash'] != tx1['tx_hash']]
+    else:
+        cursor.execute('''SELECT * FROM orders \
+                          WHERE (give_asset=? AND get_asset=? AND status=? AND tx_hash != ?)''',
+                       (tx1['get_asset'], tx1['give_asset'], 'open', tx1['tx_hash']))
+        order_matches = cursor.fetchall()
+        if sorted_by_price:
+            order_matches = sorted(order_matches, key=lambda x: x['tx_index'])                              # Sort by tx index second.
+            order_matches = sorted(order_matches, key=lambda x: util.price(x['get_quantity'], x['give_quantity']))   # Sort by price first.
+
+    tx1_price = util.price(tx1['get_quantity'], tx1['give_quantity'])
+    tx1_inverse_price = util.price(tx1['give_quantity'], tx1['get_quantity'])
+    # Protocol change.
+    if tx['block_index'] < 286000: tx1_inverse_price = util.price(1, tx1_price)
 
     # Get fee remaining.
     tx1_fee_required_remaining = tx1['fee_required_remaining']
@@ -530,14 +643,15 @@ def match (db, tx, block_index=None):
         tx0_give_remaining = tx0['give_remaining']
         tx0_get_remaining = tx0['get_remaining']
 
+        # The next orders are at prices at least as high: none of them can
+        # match either, and every order skipped has no effect.
+        if sorted_by_price and util.price(tx0['get_quantity'], tx0['give_quantity']) > tx1_inverse_price:
+            logger.debug('Skipping: price mismatch, for this order and the next ones.')
+            break
+
         # Ignore previous matches. (Both directions, just to be sure.)
-        cursor.execute('''SELECT * FROM order_matches
-                          WHERE id = ? ''', (util.make_id(tx0['tx_hash'], tx1['tx_hash']), ))
-        if list(cursor):
-            logger.debug('Skipping: previous match')
-            continue
-        cursor.execute('''SELECT * FROM order_matches
-                          WHERE id = ? ''', (util.make_id(tx1['tx_hash'], tx0['tx_hash']), ))
+        cursor.execute('''SELECT id FROM order_matches
+                          WHERE id IN (?, ?)''', (util.make_id(tx0['tx_hash'], tx1['tx_hash']), util.make_id(tx1['tx_hash'], tx0['tx_hash'])))
         if list(cursor):
             logger.debug('Skipping: previous match')
             continue
@@ -573,11 +687,6 @@ def match (db, tx, block_index=None):
         # If the prices agree, make the trade. The found order sets the price,
         # and they trade as much as they can.
         tx0_price = util.price(tx0['get_quantity'], tx0['give_quantity'])
-        tx1_price = util.price(tx1['get_quantity'], tx1['give_quantity'])
-        tx1_inverse_price = util.price(tx1['give_quantity'], tx1['get_quantity'])
-
-        # Protocol change.
-        if tx['block_index'] < 286000: tx1_inverse_price = util.price(1, tx1_price)
 
         logger.debug('Tx0 Price: {}; Tx1 Inverse Price: {}'.format(float(tx0_price), float(tx1_inverse_price)))
         if tx0_price > tx1_inverse_price:
@@ -744,16 +853,12 @@ def expire (db, block_index):
     cursor = db.cursor()
 
     # Expire orders and give refunds for the quantity give_remaining (if non-zero; if not BTC).
-    cursor.execute('''SELECT * FROM orders \
-                      WHERE (status = ? AND expire_index < ?)''', ('open', block_index))
-    orders = list(cursor)
+    orders = expirations.due(db, 'orders', block_index)
     for order in orders:
         cancel_order(db, order, 'expired', block_index)
 
     # Expire order_matches for BTC with no BTC.
-    cursor.execute('''SELECT * FROM order_matches \
-                      WHERE (status = ? and match_expire_index < ?)''', ('pending', block_index))
-    order_matches = list(cursor)
+    order_matches = expirations.due(db, 'order_matches', block_index)
     for order_match in order_matches:
         cancel_order_match(db, order_match, 'expired', block_index)
 
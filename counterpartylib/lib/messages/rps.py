@@ -31,6 +31,7 @@ from counterpartylib.lib import exceptions
 from counterpartylib.lib import util
 from counterpartylib.lib import log
 from counterpartylib.lib import message_type
+from counterpartylib.lib import expirations
 
 # possible_moves wager move_random_hash expiration
 FORMAT = '>HQ32sI'
@@ -357,8 +358,7 @@ def expire (db, block_index):
     cursor = db.cursor()
 
     # Expire rps and give refunds for the quantity wager.
-    cursor.execute('''SELECT * FROM rps WHERE (status = ? AND expire_index < ?)''', ('open', block_index))
-    for rps in cursor.fetchall():
+    for rps in expirations.due(db, 'rps', block_index):
         cancel_rps(db, rps, 'expired', block_index)
 
         # Record rps expiration.
@@ -372,9 +372,7 @@ def expire (db, block_index):
         cursor.execute(sql, bindings)
 
     # Expire rps matches
-    expire_bindings = ('pending', 'pending and resolved', 'resolved and pending', block_index)
-    cursor.execute('''SELECT * FROM rps_matches WHERE (status IN (?, ?, ?) AND match_expire_index < ?)''', expire_bindings)
-    for rps_match in cursor.fetchall():
+    for rps_match in expirations.due(db, 'rps_matches', block_index):
 
         new_rps_match_status = 'expired'
         # pending loses against resolved
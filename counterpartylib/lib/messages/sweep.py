@@ -163,9 +163,11 @@ def parse (db, tx, message):
         cursor.execute('''SELECT * FROM balances WHERE address = ?''', (tx['source'],))
         balances = cursor.fetchall()
         if flags & FLAG_BALANCES:
+            entries = []
             for balance in balances:
-                util.debit(db, tx['source'], balance['asset'], balance['quantity'], action='sweep', event=tx['tx_hash'])
-                util.credit(db, destination, balance['asset'], balance['quantity'], action='sweep', event=tx['tx_hash'])
+                entries.append(('debit', tx['source'], balance['asset'], balance['quantity'], 'sweep', tx['tx_hash']))
+                entries.append(('credit', destination, balance['asset'], balance['quantity'], 'sweep', tx['tx_hash']))
+            util.apply_ledger(db, entries)
 
         if flags & FLAG_OWNERSHIP:
             sweep_pos = 0
@@ -168,11 +168,8 @@ def parse (db, tx, message):
         if problems: status = 'invalid:' + '; '.join(problems)
 
     if status == 'valid':
-        for op in all_credits:
-            util.credit(db, op['destination'], op['asset'], op['quantity'], action='mpma send', event=tx['tx_hash'])
-
-        for op in all_debits:
-            util.debit(db, tx['source'], op['asset'], op['quantity'], action='mpma send', event=tx['tx_hash'])
+        util.credit_many(db, [(op['destination'], op['asset'], op['quantity'], 'mpma send', tx['tx_hash']) for op in all_credits])
+        util.debit_many(db, [(tx['source'], op['asset'], op['quantity'], 'mpma send', tx['tx_hash']) for op in all_debits])
 
         # Enumeration of the plain sends needs to be deterministic, so we sort them by asset and then by address
         plain_sends = sorted(plain_sends, key=lambda x: ''.join([x[0], x[1]]))
@@ -0,0 +1,124 @@
+"""
+Optional on-disk index of the outputs created by the parsed blocks, so that
+the outputs spent by a transaction can be resolved without querying the
+backend. Spent outputs are kept as long as the block spending them can be
+rolled back from the undolog (`UNDOLOG_MAX_PAST_BLOCKS`), so that they are
+still found after a reorg, and removed after that.
+
+The index lives in its own SQLite file, next to the main database. It is only
+a cache: every entry is committed to by its transaction hash, and a missing
+entry means a lookup in the backend.
+"""
+
+import logging
+logger = logging.getLogger(__name__)
+import threading
+import apsw
+
+import bitcoin as bitcoinlib
+from bitcoin.core.script import CScript
+
+from counterpartylib.lib import config
+
+OUTPOINTS_DB = None
+OUTPOINTS_LOCK = threading.Lock()
+
+OP_RETURN = 0x6a
+
+def get_connection():
+    """Return the connection to the index, or `None` if the index is disabled."""
+    global OUTPOINTS_DB
+
+    if not getattr(config, 'OUTPOINT_INDEX', False):
+        return None
+
+    if OUTPOINTS_DB is None:
+        logger.debug('Creating connection to `{}`.'.format(config.OUTPOINTS_DATABASE))
+        db = apsw.Connection(config.OUTPOINTS_DATABASE)
+        cursor = db.cursor()
+        cursor.execute('''PRAGMA journal_mode = WAL''')
+        cursor.execute('''PRAGMA synchronous = NORMAL''')
+        # Indexes without the spending blocks are dropped: they are only a cache.
+        columns = [column[1] for column in cursor.execute('''PRAGMA table_info(outpoints)''')]
+        if columns and 'spent_index' not in columns:
+            logger.info('Rebuilding the outpoint index.')
+            cursor.execute('''DROP TABLE outpoints''')
+        cursor.execute('''CREATE TABLE IF NOT EXISTS outpoints(
+                          tx_hash BLOB,
+                          vout INTEGER,
+                          script_pubkey BLOB,
+                          value INTEGER,
+                          spent_index INTEGER,
+                          PRIMARY KEY (tx_hash, vout)) WITHOUT ROWID
+                       ''')
+        cursor.execute('''CREATE INDEX IF NOT EXISTS
+                          spent_index_idx ON outpoints (spent_index) WHERE spent_index IS NOT NULL
+                       ''')
+        cursor.close()
+        OUTPOINTS_DB = db
+
+    return OUTPOINTS_DB
+
+def close():
+    global OUTPOINTS_DB
+    with OUTPOINTS_LOCK:
+        if OUTPOINTS_DB is not None:
+            OUTPOINTS_DB.close()
+            OUTPOINTS_DB = None
+
+def index_block(block, block_index):
+    """Add the outputs created by a block to the index, mark the ones it
+    spends as spent in it, and remove the ones spent too long ago to be rolled
+    back."""
+    with OUTPOINTS_LOCK:
+        db = get_connection()
+        if db is None:
+            return
+
+        created, spent = [], []
+        for ctx in block.vtx:
+            tx_hash = ctx.GetTxid()
+            for n, vout in enumerate(ctx.vout):
+                # Provably unspendable outputs would never be pruned.
+                if vout.scriptPubKey[:1] != bytes([OP_RETURN]):
+                    created.append((tx_hash, n, bytes(vout.scriptPubKey), vout.nValue))
+            if not ctx.is_coinbase():
+                spent.extend((block_index, vin.prevout.hash, vin.prevout.n) for vin in ctx.vin)
+
+        cursor = db.cursor()
+        with db:
+            cursor.executemany('''INSERT OR REPLACE INTO outpoints VALUES(?,?,?,?,NULL)''', created)
+            cursor.executemany('''UPDATE outpoints SET spent_index = ? WHERE tx_hash = ? AND vout = ?''', spent)
+            cursor.execute('''DELETE FROM outpoints WHERE spent_index < ?''', (block_index - config.UNDOLOG_MAX_PAST_BLOCKS,))
+        cursor.close()
+
+def rollback(block_index):
+    """Mark the outputs spent after `block_index` as unspent again."""
+    with OUTPOINTS_LOCK:
+        db = get_connection()
+        if db is None:
+            return
+
+        cursor = db.cursor()
+        with db:
+            cursor.execute('''UPDATE outpoints SET spent_index = NULL WHERE spent_index > ?''', (block_index,))
+        cursor.close()
+
+def get_txout(tx_hash, n):
+    """Return the indexed output `n` of `tx_hash` as a `CTxOut`, or `None`."""
+    with OUTPOINTS_LOCK:
+        db = get_connection()
+        if db is None:
+            return None
+
+        cursor = db.cursor()
+        rows = list(cursor.execute('''SELECT script_pubkey, value FROM outpoints
+                                      WHERE tx_hash = ? AND vout = ?''', (bitcoinlib.core.lx(tx_hash), n)))
+        cursor.close()
+
+    if not rows:
+        return None
+    script_pubkey, value = rows[0]
+    return bitcoinlib.core.CTxOut(value, CScript(script_pubkey))
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
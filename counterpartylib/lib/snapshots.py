@@ -0,0 +1,159 @@
+"""
+Optional snapshots of the database, taken every `config.SNAPSHOT_INTERVAL`
+blocks with the online backup API of SQLite, so that a rollback beyond the
+reach of the undolog restores the last snapshot before the target block and
+parses only the blocks after it, instead of reparsing the whole chain.
+
+Each snapshot is a copy of the database as of the end of a block, named after
+that block, in `config.SNAPSHOT_DIR`. The last `config.SNAPSHOT_COUNT` are kept.
+A snapshot is only restored if it was taken by this version of the software
+and its block is still in the database.
+"""
+
+import os
+import re
+import logging
+logger = logging.getLogger(__name__)
+import threading
+import apsw
+
+from counterpartylib.lib import config
+
+SNAPSHOT_FILE = re.compile(r'^(\d+)\.db$')
+
+def snapshot_path(block_index):
+    return os.path.join(config.SNAPSHOT_DIR, '{}.db'.format(block_index))
+
+def list_snapshots():
+    """Return the block indexes of the snapshots, in ascending order."""
+    if not os.path.isdir(getattr(config, 'SNAPSHOT_DIR', '')):
+        return []
+    matches = (SNAPSHOT_FILE.match(filename) for filename in os.listdir(config.SNAPSHOT_DIR))
+    return sorted(int(match.group(1)) for match in matches if match)
+
+def take():
+    """Copy the database, as last committed, and return the index of the last
+    block of the copy.
+
+    The copy is read through a connection of its own, within a single read
+    transaction, so it is consistent even while blocks are being parsed."""
+    if not os.path.isdir(config.SNAPSHOT_DIR):
+        os.makedirs(config.SNAPSHOT_DIR, mode=0o755)
+    temporary_path = os.path.join(config.SNAPSHOT_DIR, 'snapshot.tmp')
+
+    source = apsw.Connection(config.DATABASE, flags=apsw.SQLITE_OPEN_READONLY)
+    destination = apsw.Connection(temporary_path)
+    try:
+        with destination.backup('main', source, 'main') as backup:
+            backup.step() # all pages at once
+        block_index = list(destination.cursor().execute('''SELECT MAX(block_index) FROM blocks'''))[0][0]
+    finally:
+        destination.close()
+        source.close()
+
+    if block_index is None:
+        os.remove(temporary_path)
+        return None
+    os.replace(temporary_path, snapshot_path(block_index))
+    logger.info('Database snapshot taken at block {}.'.format(block_index))
+    return block_index
+
+def prune(count):
+    """Delete all snapshots but the last `count`."""
+    for block_index in list_snapshots()[:-count or None]:
+        os.remove(snapshot_path(block_index))
+        logger.debug('Deleted the database snapshot of block {}.'.format(block_index))
+
+def discard_after(block_index):
+    """Delete the snapshots of the blocks after `block_index`, which are being
+    rolled back."""
+    for snapshot_block_index in list_snapshots():
+        if snapshot_block_index > block_index:
+            os.remove(snapshot_path(snapshot_block_index))
+            logger.debug('Deleted the database snapshot of block {}.'.format(snapshot_block_index))
+
+def find(db, block_index):
+    """Return the index of the last usable snapshot at or before `block_index`,
+    or `None`."""
+    cursor = db.cursor()
+    for snapshot_block_index in reversed(list_snapshots()):
+        if snapshot_block_index > block_index:
+            continue
+        snapshot = apsw.Connection(snapshot_path(snapshot_block_index), flags=apsw.SQLITE_OPEN_READONLY)
+        try:
+            snapshot_cursor = snapshot.cursor()
+            user_version = list(snapshot_cursor.execute('''PRAGMA user_version'''))[0][0]
+            snapshot_block = list(snapshot_cursor.execute('''SELECT block_hash FROM blocks WHERE block_index = ?''', (snapshot_block_index,)))
+        finally:
+            snapshot.close()
+        if user_version != config.VERSION_MAJOR * 1000 + config.VERSION_MINOR:
+            logger.debug('Database snapshot of block {} is of another version.'.format(snapshot_block_index))
+            continue
+        block = list(cursor.execute('''SELECT block_hash FROM blocks WHERE block_index = ?''', (snapshot_block_index,)))
+        if not block or not snapshot_block or block[0]['block_hash'] != snapshot_block[0][0]:
+            logger.debug('Database snapshot of block {} is of another chain.'.format(snapshot_block_index))
+            continue
+        cursor.close()
+        return snapshot_block_index
+    cursor.close()
+    return None
+
+def attach(db, block_index):
+    """Attach the snapshot of `block_index` as `snapshot`, outside of any transaction."""
+    cursor = db.cursor()
+    cursor.setexectrace(None)
+    cursor.execute('''ATTACH ? AS snapshot''', (snapshot_path(block_index),))
+    cursor.close()
+
+def detach(db):
+    cursor = db.cursor()
+    cursor.setexectrace(None)
+    cursor.execute('''DETACH snapshot''')
+    cursor.close()
+
+def restore(db, tables):
+    """Replace the rows of `tables` with the ones of the attached snapshot,
+    with their rowids."""
+    cursor = db.cursor()
+    cursor.setexectrace(None)
+    cursor.setrowtrace(None)
+    cursor.execute('''PRAGMA defer_foreign_keys = ON''')
+    for table in tables:
+        snapshot_columns = [column[1] for column in cursor.execute('''PRAGMA snapshot.table_info({})'''.format(table))]
+        columns = [column[1] for column in cursor.execute('''PRAGMA main.table_info({})'''.format(table))
+                   if column[1] in snapshot_columns]
+        cursor.execute('''DELETE FROM main.{}'''.format(table))
+        cursor.execute('''INSERT INTO main.{0}(rowid, {1}) SELECT rowid, {1} FROM snapshot.{0} ORDER BY rowid'''.format(
+                       table, ','.join(columns)))
+    cursor.close()
+
+class SnapshotManager(object):
+    """Take a snapshot in the background once `interval` blocks have been
+    committed since the last one, and keep the last `count`."""
+
+    def __init__(self, interval, count):
+        self.interval = interval
+        self.count = count
+        self.thread = None
+
+    def block_committed(self, block_index):
+        if not self.interval or (self.thread and self.thread.is_alive()):
+            return
+        snapshots = list_snapshots()
+        if snapshots and block_index - snapshots[-1] < self.interval:
+            return
+        self.thread = threading.Thread(target=self.run, name='snapshot', daemon=True)
+        self.thread.start()
+
+    def run(self):
+        try:
+            take()
+            prune(self.count)
+        except (apsw.Error, OSError) as e:
+            logger.error('Could not take a database snapshot: {}'.format(e))
+
+    def join(self):
+        if self.thread:
+            self.thread.join()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
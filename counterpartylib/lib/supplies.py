@@ -0,0 +1,111 @@
+"""
+Running totals of each asset: issued, destroyed, held in balances and held in
+escrow by each kind of escrow, in the table `supplies`, so that the
+conservation of assets is checked without scanning the whole ledger.
+
+The totals are kept by triggers on the tables they are the totals of, in the
+same transaction as each change of these tables, including the changes undone
+by a rollback: they need no undolog records of their own.
+"""
+
+import re
+import logging
+logger = logging.getLogger(__name__)
+
+ESCROWS = ['orders', 'order_matches', 'bets', 'bet_matches', 'rps', 'rps_matches', 'dispensers']
+COLUMNS = ['issued', 'destroyed', 'issuances', 'balances'] + ESCROWS
+
+# For each table, the contributions of a row to the totals: the column of
+# `supplies`, the asset and the quantity, as SQL expressions of the row `{0}`,
+# as counted by `util.supplies()` and `util.held()`.
+def valid(quantity):
+    return "CASE WHEN {{0}}.status = 'valid' THEN {{0}}.{} END".format(quantity)
+
+CONTRIBUTIONS = {
+    'burns': [('issued', "'XCP'", valid('earned'))],
+    'issuances': [('issued', '{0}.asset', valid('quantity')),
+                  ('issuances', '{0}.asset', "{0}.status = 'valid'"),
+                  ('destroyed', "'XCP'", valid('fee_paid'))],
+    'destructions': [('destroyed', '{0}.asset', valid('quantity'))],
+    'dividends': [('destroyed', "'XCP'", valid('fee_paid'))],
+    'sweeps': [('destroyed', "'XCP'", valid('fee_paid'))],
+    'balances': [('balances', '{0}.asset', '{0}.quantity')],
+    'orders': [('orders', '{0}.give_asset', "CASE WHEN {0}.status = 'open' OR ({0}.status = 'filled' AND "
+                                            "{0}.give_asset = 'XCP' AND {0}.get_asset = 'BTC') THEN {0}.give_remaining END")],
+    'order_matches': [('order_matches', '{0}.forward_asset', "CASE WHEN {0}.status = 'pending' THEN {0}.forward_quantity END"),
+                      ('order_matches', '{0}.backward_asset', "CASE WHEN {0}.status = 'pending' THEN {0}.backward_quantity END")],
+    'bets': [('bets', "'XCP'", "CASE WHEN {0}.status = 'open' THEN {0}.wager_remaining END")],
+    'bet_matches': [('bet_matches', "'XCP'", "CASE WHEN {0}.status = 'pending' THEN {0}.forward_quantity END"),
+                    ('bet_matches', "'XCP'", "CASE WHEN {0}.status = 'pending' THEN {0}.backward_quantity END")],
+    'rps': [('rps', "'XCP'", "CASE WHEN {0}.status = 'open' THEN {0}.wager END")],
+    'rps_matches': [('rps_matches', "'XCP'", "CASE WHEN {0}.status IN ('pending', 'pending and resolved', "
+                                             "'resolved and pending') THEN {0}.wager * 2 END")],
+    'dispensers': [('dispensers', '{0}.asset', "CASE WHEN {0}.status = 0 OR {0}.status = 1 THEN {0}.give_remaining END")],
+}
+
+def initialise(db):
+    """Create the table and its triggers, and compute the totals of a database
+    that had none."""
+    cursor = db.cursor()
+    cursor.setexectrace(None)
+    created = not list(cursor.execute('''SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'supplies' '''))
+    cursor.execute('''CREATE TABLE IF NOT EXISTS supplies(
+                      asset TEXT PRIMARY KEY,
+                      {})
+                   '''.format(',\n'.join('{} INTEGER NOT NULL DEFAULT 0'.format(column) for column in COLUMNS)))
+    create_triggers(cursor)
+    if created:
+        rebuild(cursor)
+    cursor.close()
+
+def create_triggers(cursor):
+    for table, contributions in CONTRIBUTIONS.items():
+        insert, update, delete = [], [], []
+        # The columns the contributions depend on.
+        columns = sorted(set(re.findall(r'\{0\}\.(\w+)', ' '.join(asset + ' ' + quantity for column, asset, quantity in contributions))))
+        for column, asset, quantity in contributions:
+            new_asset, new_quantity = asset.format('new'), 'IFNULL({}, 0)'.format(quantity.format('new'))
+            old_asset, old_quantity = asset.format('old'), 'IFNULL({}, 0)'.format(quantity.format('old'))
+            insert += ['''INSERT OR IGNORE INTO supplies(asset) VALUES({})'''.format(new_asset),
+                       '''UPDATE supplies SET {0} = {0} + {1} WHERE asset = {2}'''.format(column, new_quantity, new_asset)]
+            update += ['''INSERT OR IGNORE INTO supplies(asset) SELECT {0} WHERE {0} IS NOT {1}'''.format(new_asset, old_asset),
+                       '''UPDATE supplies SET {0} = {0} + (CASE WHEN asset = {1} THEN {2} ELSE 0 END)
+                                                      - (CASE WHEN asset = {3} THEN {4} ELSE 0 END)
+                          WHERE asset IN ({1}, {3})'''.format(column, new_asset, new_quantity, old_asset, old_quantity)]
+            delete += ['''UPDATE supplies SET {0} = {0} - {1} WHERE asset = {2}'''.format(column, old_quantity, old_asset)]
+        for trigger_type, event, statements in (('insert', 'INSERT', insert),
+                                                ('update', 'UPDATE OF {}'.format(','.join(columns)), update),
+                                                ('delete', 'DELETE', delete)):
+            cursor.execute('''CREATE TRIGGER IF NOT EXISTS _{0}_supplies_{1} AFTER {2} ON {0} BEGIN
+                                {3};
+                                END;
+                           '''.format(table, trigger_type, event, ';\n'.join(statements)))
+
+def rebuild(cursor):
+    """Compute the totals from the tables they are the totals of."""
+    totals = {'XCP': dict.fromkeys(COLUMNS, 0)}
+    for table, contributions in CONTRIBUTIONS.items():
+        for column, asset, quantity in contributions:
+            sql = '''SELECT {} AS asset, SUM({}) AS total FROM {} GROUP BY 1'''.format(
+                  asset.format(table), quantity.format(table), table)
+            for row in cursor.execute(sql):
+                total = totals.setdefault(row['asset'], dict.fromkeys(COLUMNS, 0))
+                total[column] += row['total'] or 0
+    cursor.execute('''DELETE FROM supplies''')
+    cursor.executemany('''INSERT INTO supplies(asset, {}) VALUES(?, {})'''.format(
+                       ','.join(COLUMNS), ','.join('?' for column in COLUMNS)),
+                       [[asset] + [total[column] for column in COLUMNS] for asset, total in totals.items()])
+    logger.debug('Computed the running totals of {} assets.'.format(len(totals)))
+
+def totals(db):
+    """Return the running totals, by asset."""
+    cursor = db.cursor()
+    result = dict((row['asset'], row) for row in cursor.execute('''SELECT * FROM supplies'''))
+    cursor.close()
+    return result
+
+def held(total):
+    """Return the quantity held in balances and in escrow, of running totals."""
+    return total['balances'] + sum(total[escrow] for escrow in ESCROWS)
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -26,6 +26,7 @@ import itertools
 from counterpartylib.lib import exceptions
 from counterpartylib.lib.exceptions import DecodeError
 from counterpartylib.lib import config
+from counterpartylib.lib import database
 
 D = decimal.Decimal
 B26_DIGITS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
@@ -47,6 +48,27 @@ json_print = lambda x: print(json_dump(x))
 
 BLOCK_LEDGER = []
 
+# While mempool transactions are parsed speculatively, the list their
+# messages are captured in; they leave no trace in the consensus hashes.
+SPECULATIVE_MESSAGES = None
+
+# Write-back cache of the balances of the connection `BALANCES_DB`, read and
+# written by `credit()` and `debit()`: (address, asset) → quantity, or `None`
+# without a row. `PENDING_BALANCES` lists the balances written since the last
+# `flush_balances()`, in order, and whether their row is new. They are flushed
+# at the end of each block and before any other statement on the `balances`
+# table (see `database.exectracer`).
+BALANCES_DB = None
+BALANCES = {}
+PENDING_BALANCES = collections.OrderedDict()
+# UPSERT is in SQLite since 3.24, the version of setup.py. With an older
+# library (e.g. APSW built against the system SQLite), the new balances are
+# inserted and the others updated, separately.
+SQLITE_UPSERT = tuple(int(n) for n in apsw.sqlitelibversion().split('.')[:3]) >= (3, 24, 0)
+# Balances read at once by `load_cached_balances()`: two bindings each, within
+# the default limit of 999 bindings per statement.
+BALANCES_LOAD_SIZE = 400
+
 CURRENT_BLOCK_INDEX = None
 
 CURR_DIR = os.path.dirname(os.path.realpath(__file__))
@@ -362,134 +384,201 @@ def active_options(config, options):
     """Checks if options active in some given config."""
     return config & options == options
 
-class DebitError (Exception): pass
-def debit (db, address, asset, quantity, action=None, event=None):
-    """Debit given address by quantity of asset."""
-    block_index = CURRENT_BLOCK_INDEX
-
-    if type(quantity) != int:
-        raise DebitError('Quantity must be an integer.')
-    if quantity < 0:
-        raise DebitError('Negative quantity.')
-    if quantity > config.MAX_INT:
-        raise DebitError('Quantity can\'t be higher than MAX_INT.')
-    if asset == config.BTC:
-        raise DebitError('Cannot debit bitcoins.')
-
-    debit_cursor = db.cursor()
-
-    # Contracts can only hold XCP balances.
-    if enabled('contracts_only_xcp_balances'): # Protocol change.
-        if len(address) == 40:
-            assert asset == config.XCP
-
-    if asset == config.BTC:
-        raise exceptions.BalanceError('Cannot debit bitcoins from a {} address!'.format(config.XCP_NAME))
+def use_balances_of(db):
+    """Cache the balances of `db`, after those of any other connection are
+    written back."""
+    global BALANCES_DB
+    if db is not BALANCES_DB:
+        flush_balances()
+        BALANCES.clear()
+        BALANCES_DB = db
+
+def get_cached_balance(db, address, asset):
+    """Return the quantity of `asset` held by `address`, or `None` if there
+    is no row for it (there is at most one, see `blocks.initialise()`)."""
+    use_balances_of(db)
+
+    key = (address, asset)
+    try:
+        return BALANCES[key]
+    except KeyError:
+        pass
+
+    # A pending balance is always cached: no need to flush before reading.
+    cursor = database.tuple_cursor(db)
+    cursor.setexectrace(None)
+    balances = list(cursor.execute('''SELECT quantity FROM balances \
+                                      WHERE (address = ? AND asset = ?)''', key))
+    cursor.close()
+    quantity = balances[0][0] if balances else None
+    BALANCES[key] = quantity
+    return quantity
+
+def load_cached_balances(db, keys):
+    """Cache the balances of the (address, asset) `keys` not cached yet, with
+    one query per `BALANCES_LOAD_SIZE` keys."""
+    use_balances_of(db)
+
+    keys = list(collections.OrderedDict.fromkeys(key for key in keys if key not in BALANCES))
+    cursor = database.tuple_cursor(db)
+    cursor.setexectrace(None)
+    for i in range(0, len(keys), BALANCES_LOAD_SIZE):
+        chunk = keys[i:i + BALANCES_LOAD_SIZE]
+        for key in chunk:
+            BALANCES[key] = None
+        bindings = [value for key in chunk for value in key]
+        for address, asset, quantity in cursor.execute('''WITH keys(address, asset) AS (VALUES {})
+                                                          SELECT balances.address, balances.asset, balances.quantity
+                                                          FROM keys JOIN balances
+                                                          ON balances.address = keys.address AND balances.asset = keys.asset
+                                                       '''.format(', '.join(['(?, ?)'] * len(chunk))), bindings):
+            BALANCES[(address, asset)] = quantity
+    cursor.close()
 
-    debit_cursor.execute('''SELECT * FROM balances \
-                            WHERE (address = ? AND asset = ?)''', (address, asset))
-    balances = debit_cursor.fetchall()
-    if not len(balances) == 1:
-        old_balance = 0
+def set_cached_balance(address, asset, quantity):
+    key = (address, asset)
+    if key not in PENDING_BALANCES:
+        PENDING_BALANCES[key] = BALANCES[key] is None
+    BALANCES[key] = quantity
+
+def flush_balances():
+    """Write the pending balances to the database, new rows in the order they
+    were created."""
+    if not PENDING_BALANCES:
+        return
+    cursor = BALANCES_DB.cursor()
+    cursor.setexectrace(None)
+    if SQLITE_UPSERT:
+        balances = [(address, asset, BALANCES[(address, asset)]) for address, asset in PENDING_BALANCES]
+        cursor.executemany('''INSERT INTO balances VALUES(?, ?, ?)
+                              ON CONFLICT(address, asset) DO UPDATE SET quantity = excluded.quantity''', balances)
     else:
-        old_balance = balances[0]['quantity']
-
-    if old_balance < quantity:
-        raise DebitError('Insufficient funds.')
-
-    balance = round(old_balance - quantity)
-    balance = min(balance, config.MAX_INT)
-    assert balance >= 0
-
-    bindings = {
-        'quantity': balance,
-        'address': address,
-        'asset': asset
-    }
-    sql='update balances set quantity = :quantity where (address = :address and asset = :asset)'
-    debit_cursor.execute(sql, bindings)
-
-    # Record debit.
-    bindings = {
-        'block_index': block_index,
-        'address': address,
-        'asset': asset,
-        'quantity': quantity,
-        'action': action,
-        'event': event
-    }
-    sql='insert into debits values(:block_index, :address, :asset, :quantity, :action, :event)'
-    debit_cursor.execute(sql, bindings)
-    debit_cursor.close()
+        inserts, updates = [], []
+        for (address, asset), new in PENDING_BALANCES.items():
+            if new:
+                inserts.append((address, asset, BALANCES[(address, asset)]))
+            else:
+                updates.append((BALANCES[(address, asset)], address, asset))
+        if inserts:
+            cursor.executemany('''INSERT INTO balances VALUES(?, ?, ?)''', inserts)
+        if updates:
+            cursor.executemany('''UPDATE balances SET quantity = ? WHERE (address = ? AND asset = ?)''', updates)
+    PENDING_BALANCES.clear()
+    cursor.close()
 
-    BLOCK_LEDGER.append('{}{}{}{}'.format(block_index, address, asset, quantity))
+def reset_balances():
+    """Forget the cached balances, and the pending ones: for after the
+    database is rolled back or reinitialised."""
+    global BALANCES_DB
+    BALANCES.clear()
+    PENDING_BALANCES.clear()
+    BALANCES_DB = None
 
+class DebitError (Exception): pass
 class CreditError (Exception): pass
-def credit (db, address, asset, quantity, action=None, event=None):
-    """Credit given address by quantity of asset."""
-    block_index = CURRENT_BLOCK_INDEX
 
+def check_ledger_entry(error, address, asset, quantity):
     if type(quantity) != int:
-        raise CreditError('Quantity must be an integer.')
+        raise error('Quantity must be an integer.')
     if quantity < 0:
-        raise CreditError('Negative quantity.')
+        raise error('Negative quantity.')
     if quantity > config.MAX_INT:
-        raise CreditError('Quantity can\'t be higher than MAX_INT.')
+        raise error('Quantity can\'t be higher than MAX_INT.')
     if asset == config.BTC:
-        raise CreditError('Cannot debit bitcoins.')
-
-    credit_cursor = db.cursor()
+        raise error('Cannot debit bitcoins.')
 
     # Contracts can only hold XCP balances.
     if enabled('contracts_only_xcp_balances'): # Protocol change.
         if len(address) == 40:
             assert asset == config.XCP
 
-    credit_cursor.execute('''SELECT * FROM balances \
-                             WHERE (address = ? AND asset = ?)''', (address, asset))
-    balances = credit_cursor.fetchall()
-    if len(balances) == 0:
-        assert balances == []
-
-        #update balances table with new balance
-        bindings = {
-            'address': address,
-            'asset': asset,
-            'quantity': quantity,
-        }
-        sql='insert into balances values(:address, :asset, :quantity)'
-        credit_cursor.execute(sql, bindings)
-    elif len(balances) > 1:
-        assert False
-    else:
-        old_balance = balances[0]['quantity']
-        assert type(old_balance) == int
-        balance = round(old_balance + quantity)
-        balance = min(balance, config.MAX_INT)
-
-        bindings = {
-            'quantity': balance,
-            'address': address,
-            'asset': asset
-        }
-        sql='update balances set quantity = :quantity where (address = :address and asset = :asset)'
-        credit_cursor.execute(sql, bindings)
-
-    # Record credit.
-    bindings = {
-        'block_index': block_index,
-        'address': address,
-        'asset': asset,
-        'quantity': quantity,
-        'action': action,
-        'event': event
-    }
-    sql='insert into credits values(:block_index, :address, :asset, :quantity, :action, :event)'
+def apply_ledger(db, entries):
+    """Debit and credit addresses, in order: `entries` is a list of
+    `('debit' | 'credit', address, asset, quantity, action, event)`.
+
+    The debits and credits are recorded with one `executemany()` per run of
+    entries of the same kind, so the messages and the ledger of the block are
+    the same as with one call of `debit()` or `credit()` per entry. The
+    balances of the entries are read at once, then updated entry by entry in
+    the cache, since a debit fails on the balance left by the entries before
+    it; they are written back with the other balances of the block (see
+    `flush_balances()`)."""
+    block_index = CURRENT_BLOCK_INDEX
+    load_cached_balances(db, [(address, asset) for kind, address, asset, quantity, action, event in entries])
+    cursor = db.cursor()
+    runs = [] # [(table, [bindings, ...]), ...]
+    try:
+        for kind, address, asset, quantity, action, event in entries:
+            if kind == 'debit':
+                check_ledger_entry(DebitError, address, asset, quantity)
+
+                old_balance = get_cached_balance(db, address, asset)
+                has_balance = old_balance is not None
+                if not has_balance:
+                    old_balance = 0
+
+                if old_balance < quantity:
+                    raise DebitError('Insufficient funds.')
+
+                balance = round(old_balance - quantity)
+                balance = min(balance, config.MAX_INT)
+                assert balance >= 0
+
+                if has_balance:
+                    set_cached_balance(address, asset, balance)
+                table = 'debits'
+            elif kind == 'credit':
+                check_ledger_entry(CreditError, address, asset, quantity)
+
+                old_balance = get_cached_balance(db, address, asset)
+                if old_balance is None:
+                    set_cached_balance(address, asset, quantity)
+                else:
+                    assert type(old_balance) == int
+                    balance = round(old_balance + quantity)
+                    balance = min(balance, config.MAX_INT)
+                    set_cached_balance(address, asset, balance)
+                table = 'credits'
+            else:
+                raise ValueError('Unknown ledger entry: {}'.format(kind))
+
+            bindings = {
+                'block_index': block_index,
+                'address': address,
+                'asset': asset,
+                'quantity': quantity,
+                'action': action,
+                'event': event
+            }
+            if runs and runs[-1][0] == table:
+                runs[-1][1].append(bindings)
+            else:
+                runs.append((table, [bindings]))
+
+            if SPECULATIVE_MESSAGES is None:
+                BLOCK_LEDGER.append('{}{}{}{}'.format(block_index, address, asset, quantity))
+    finally:
+        # Record the debits and credits, up to a failed one.
+        for table, bindings_list in runs:
+            sql = 'insert into {} values(:block_index, :address, :asset, :quantity, :action, :event)'.format(table)
+            cursor.executemany(sql, bindings_list)
+        cursor.close()
+
+def debit_many(db, entries):
+    """Debit each of `entries`, a list of `(address, asset, quantity, action, event)`."""
+    apply_ledger(db, [('debit',) + tuple(entry) for entry in entries])
+
+def credit_many(db, entries):
+    """Credit each of `entries`, a list of `(address, asset, quantity, action, event)`."""
+    apply_ledger(db, [('credit',) + tuple(entry) for entry in entries])
 
-    credit_cursor.execute(sql, bindings)
-    credit_cursor.close()
+def debit (db, address, asset, quantity, action=None, event=None):
+    """Debit given address by quantity of asset."""
+    apply_ledger(db, [('debit', address, asset, quantity, action, event)])
 
-    BLOCK_LEDGER.append('{}{}{}{}'.format(block_index, address, asset, quantity))
+def credit (db, address, asset, quantity, action=None, event=None):
+    """Credit given address by quantity of asset."""
+    apply_ledger(db, [('credit', address, asset, quantity, action, event)])
 
 class QuantityError(Exception): pass
 
@@ -776,11 +865,13 @@ def dhash_string(text):
 
 def get_balance (db, address, asset):
     """Get balance of contract or address."""
-    cursor = db.cursor()
-    balances = list(cursor.execute('''SELECT * FROM balances WHERE (address = ? AND asset = ?)''', (address, asset)))
+    if db is BALANCES_DB:
+        return get_cached_balance(db, address, asset) or 0
+    cursor = database.tuple_cursor(db)
+    balances = list(cursor.execute('''SELECT quantity FROM balances WHERE (address = ? AND asset = ?)''', (address, asset)))
     cursor.close()
     if not balances: return 0
-    else: return balances[0]['quantity']
+    else: return balances[0][0]
 
 # Why on Earth does `binascii.hexlify()` return bytes?!
 def hexlify(x):
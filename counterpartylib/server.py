@@ -91,6 +91,7 @@ def initialise_config(database_file=None, log_file=None, api_log_file=None,
                 indexd_connect=None, indexd_port=None,
                 backend_ssl=False, backend_ssl_no_verify=False,
                 backend_poll_interval=None,
+                backend_zmq_connect=None, backend_zmq_quiet_interval=config.DEFAULT_BACKEND_ZMQ_QUIET_INTERVAL,
                 rpc_host=None, rpc_port=None,
                 rpc_user=None, rpc_password=None,
                 rpc_no_allow_cors=False,
@@ -98,11 +99,23 @@ def initialise_config(database_file=None, log_file=None, api_log_file=None,
                 requests_timeout=config.DEFAULT_REQUESTS_TIMEOUT,
                 rpc_batch_size=config.DEFAULT_RPC_BATCH_SIZE,
                 check_asset_conservation=config.DEFAULT_CHECK_ASSET_CONSERVATION,
+                check_asset_conservation_deep=config.DEFAULT_CHECK_ASSET_CONSERVATION_DEEP,
+                block_prefetch_queue_size=config.DEFAULT_BLOCK_PREFETCH_QUEUE_SIZE,
+                tx_decode_workers=config.DEFAULT_TX_DECODE_WORKERS,
+                fast_sync=config.DEFAULT_FAST_SYNC,
+                version_check_interval=config.DEFAULT_VERSION_CHECK_INTERVAL,
+                block_commit_batch_size=config.DEFAULT_BLOCK_COMMIT_BATCH_SIZE,
+                block_commit_interval=config.DEFAULT_BLOCK_COMMIT_INTERVAL,
+                api_db_pool_size=config.DEFAULT_API_DB_POOL_SIZE,
+                snapshot_interval=config.DEFAULT_SNAPSHOT_INTERVAL,
+                snapshot_count=config.DEFAULT_SNAPSHOT_COUNT,
                 backend_ssl_verify=None, rpc_allow_cors=None, p2sh_dust_return_pubkey=None,
                 utxo_locks_max_addresses=config.DEFAULT_UTXO_LOCKS_MAX_ADDRESSES,
                 utxo_locks_max_age=config.DEFAULT_UTXO_LOCKS_MAX_AGE,
                 estimate_fee_per_kb=None,
-                customnet=None, checkdb=False):
+                customnet=None, checkdb=False, outpoint_index=False,
+                checkdb_deferred=config.DEFAULT_CHECKDB_DEFERRED,
+                checkdb_per_table=config.DEFAULT_CHECKDB_PER_TABLE):
 
     # Data directory
     data_dir = appdirs.user_data_dir(appauthor=config.XCP_NAME, appname=config.APP_NAME, roaming=True)
@@ -159,6 +172,18 @@ def initialise_config(database_file=None, log_file=None, api_log_file=None,
         config.CHECKDB = True
     else:
         config.CHECKDB = False
+    config.CHECKDB_DEFERRED = checkdb_deferred
+    config.CHECKDB_PER_TABLE = checkdb_per_table
+
+    # Outpoint index, next to the database
+    config.OUTPOINT_INDEX = outpoint_index
+    config.OUTPOINTS_DATABASE = '{}.outpoints.db'.format(os.path.splitext(config.DATABASE)[0])
+
+    # Database snapshots, next to the database
+    config.SNAPSHOT_DIR = '{}.snapshots'.format(os.path.splitext(config.DATABASE)[0])
+
+    # Last protocol changes fetched, for the version checks
+    config.PROTOCOL_CHANGES_CACHE = '{}.protocol_changes.json'.format(os.path.splitext(config.DATABASE)[0])
 
     # Log directory
     log_dir = appdirs.user_log_dir(appauthor=config.XCP_NAME, appname=config.APP_NAME)
@@ -260,6 +285,10 @@ def initialise_config(database_file=None, log_file=None, api_log_file=None,
     else:
         config.BACKEND_POLL_INTERVAL = 0.5
 
+    # Backend ZeroMQ notifications (comma‐separated endpoints of `-zmqpubhashblock` and `-zmqpubrawtx`)
+    config.BACKEND_ZMQ_CONNECT = backend_zmq_connect
+    config.BACKEND_ZMQ_QUIET_INTERVAL = backend_zmq_quiet_interval
+
     # Construct backend URL.
     config.BACKEND_URL = config.BACKEND_USER + ':' + config.BACKEND_PASSWORD + '@' + config.BACKEND_CONNECT + ':' + str(config.BACKEND_PORT)
     if config.BACKEND_SSL:
@@ -441,6 +470,18 @@ def initialise_config(database_file=None, log_file=None, api_log_file=None,
     # Misc
     config.REQUESTS_TIMEOUT = requests_timeout
     config.CHECK_ASSET_CONSERVATION = check_asset_conservation
+    config.CHECK_ASSET_CONSERVATION_DEEP = check_asset_conservation_deep
+    config.BLOCK_PREFETCH_QUEUE_SIZE = block_prefetch_queue_size
+    config.TX_DECODE_WORKERS = tx_decode_workers
+    config.FAST_SYNC = fast_sync
+    config.VERSION_CHECK_INTERVAL = version_check_interval
+    config.BLOCK_COMMIT_BATCH_SIZE = block_commit_batch_size
+    config.BLOCK_COMMIT_INTERVAL = block_commit_interval
+    config.API_DB_POOL_SIZE = api_db_pool_size
+    config.SNAPSHOT_INTERVAL = snapshot_interval
+    if snapshot_count < 1:
+        raise ConfigurationError('Please specify a number of database snapshots to keep of at least 1')
+    config.SNAPSHOT_COUNT = snapshot_count
     config.UTXO_LOCKS_MAX_ADDRESSES = utxo_locks_max_addresses
     config.UTXO_LOCKS_MAX_AGE = utxo_locks_max_age
     transaction.initialise()  # initialise UTXO_LOCKS
@@ -462,7 +503,12 @@ def initialise_db():
 
     # Database
     logger.info('Connecting to database (SQLite %s).' % apsw.apswversion())
-    db = database.get_connection(read_only=False,foreign_keys=config.CHECKDB,integrity_check=config.CHECKDB)
+    if config.CHECKDB and config.CHECKDB_DEFERRED:
+        # Start right away, and check the database thoroughly in the background.
+        db = database.get_connection(read_only=False, quick_check=True)
+        database.IntegrityCheck(per_table=config.CHECKDB_PER_TABLE).start()
+    else:
+        db = database.get_connection(read_only=False,foreign_keys=config.CHECKDB,integrity_check=config.CHECKDB)
 
     util.CURRENT_BLOCK_INDEX = blocks.last_db_index(db)
 
@@ -0,0 +1,93 @@
+#! /usr/bin/python3
+import tempfile
+import pytest
+
+from counterpartylib.test import conftest  # this is require near the top to do setup of the test suite
+from counterpartylib.test.util_test import CURR_DIR
+from counterpartylib.test.fixtures.params import ADDR
+
+from counterpartylib.lib import (config, util, log)
+
+
+FIXTURE_SQL_FILE = CURR_DIR + '/fixtures/scenarios/unittest_fixture.sql'
+FIXTURE_DB = tempfile.gettempdir() + '/fixtures.unittest_fixture.db'
+
+
+@pytest.mark.parametrize('upsert', [False, pytest.param(True, marks=pytest.mark.skipif(not util.SQLITE_UPSERT, reason='SQLite < 3.24'))])
+def test_balances_cache(server_db, monkeypatch, upsert):
+    monkeypatch.setattr(util, 'SQLITE_UPSERT', upsert)
+    cursor = server_db.cursor()
+    def balances(address):
+        return [(row['asset'], row['quantity']) for row in cursor.execute('''SELECT asset, quantity FROM balances WHERE address = ? ORDER BY rowid''', (address,))]
+
+    xcp_balance = util.get_balance(server_db, ADDR[0], config.XCP)
+    util.debit(server_db, ADDR[0], config.XCP, 10, action='test', event='test')
+    util.credit(server_db, 'new_address', 'NEWASSET', 5, action='test', event='test')
+    util.credit(server_db, 'new_address', config.XCP, 10, action='test', event='test')
+    util.credit(server_db, 'new_address', 'NEWASSET', 5, action='test', event='test')
+    util.debit(server_db, 'new_address', 'NOASSET', 0, action='test', event='test')
+
+    # served from the cache, not yet written
+    assert list(util.PENDING_BALANCES) == [(ADDR[0], config.XCP), ('new_address', 'NEWASSET'), ('new_address', config.XCP)]
+    assert util.get_balance(server_db, ADDR[0], config.XCP) == xcp_balance - 10
+    assert util.get_balance(server_db, 'new_address', 'NEWASSET') == 10
+
+    # written before any statement on the balances, new rows in order
+    assert balances('new_address') == [('NEWASSET', 10), (config.XCP, 10)]
+    assert not util.PENDING_BALANCES
+    assert balances(ADDR[0])[0] == (config.XCP, xcp_balance - 10)
+
+    # the credits and debits are recorded right away
+    assert len(list(cursor.execute('''SELECT * FROM credits WHERE address = ?''', ('new_address',)))) == 3
+
+    # pending balances are forgotten with the transaction they were written in
+    util.credit(server_db, 'new_address', config.XCP, 10, action='test', event='test')
+    util.reset_balances()
+    assert balances('new_address') == [('NEWASSET', 10), (config.XCP, 10)]
+
+
+def test_apply_ledger(server_db, monkeypatch):
+    cursor = server_db.cursor()
+    entries = [
+        ('debit', ADDR[0], config.XCP, 10, 'test', 'test'),
+        ('credit', 'new_address', config.XCP, 4, 'test', 'test'),
+        ('credit', 'new_address', 'NEWASSET', 6, 'test', 'test'),
+        ('debit', 'new_address', config.XCP, 1, 'test', 'test'),
+    ]
+    def run(apply):
+        cursor.execute('''SAVEPOINT apply_ledger''')
+        first_message_index = util.last_message(server_db)['message_index'] + 1
+        util.BLOCK_LEDGER = []
+        apply()
+        messages = [(row['command'], row['category'], row['bindings']) for row in cursor.execute('''SELECT * FROM messages WHERE message_index >= ? ORDER BY message_index''', (first_message_index,))]
+        balances = list(cursor.execute('''SELECT rowid, * FROM balances ORDER BY rowid'''))
+        ledger = util.BLOCK_LEDGER
+        util.reset_balances()
+        log.reset_message_index()
+        cursor.execute('''ROLLBACK TO SAVEPOINT apply_ledger''')
+        cursor.execute('''RELEASE SAVEPOINT apply_ledger''')
+        return messages, balances, ledger
+
+    def one_by_one():
+        for kind, address, asset, quantity, action, event in entries:
+            getattr(util, kind)(server_db, address, asset, quantity, action=action, event=event)
+    expected = run(one_by_one)
+    assert [message[:2] for message in expected[0]] == [('insert', 'debits'), ('insert', 'credits'), ('insert', 'credits'), ('insert', 'debits')]
+    assert run(lambda: util.apply_ledger(server_db, entries)) == expected
+
+    # The balances are read at once, by chunks.
+    monkeypatch.setattr(util, 'BALANCES_LOAD_SIZE', 2)
+    keys = [(ADDR[0], config.XCP), ('new_address', config.XCP), (ADDR[1], config.XCP), (ADDR[0], config.XCP), (ADDR[0], 'DIVISIBLE')]
+    util.load_cached_balances(server_db, keys)
+    for address, asset in keys:
+        rows = list(cursor.execute('''SELECT quantity FROM balances WHERE address = ? AND asset = ?''', (address, asset)))
+        assert util.BALANCES[(address, asset)] == (rows[0]['quantity'] if rows else None)
+    assert util.BALANCES[('new_address', config.XCP)] is None
+
+    # The entries before a failed one are recorded.
+    with pytest.raises(util.DebitError):
+        util.apply_ledger(server_db, entries[:2] + [('debit', 'new_address', config.XCP, 5, 'test', 'test')])
+    assert util.get_balance(server_db, 'new_address', config.XCP) == 4
+    assert len(list(cursor.execute('''SELECT * FROM credits WHERE address = ?''', ('new_address',)))) == 1
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,423 @@
+#! /usr/bin/python3
+import pytest
+import collections
+import tempfile
+import time
+import apsw
+
+import bitcoin as bitcoinlib
+
+from counterpartylib.test import conftest  # this is require near the top to do setup of the test suite
+from counterpartylib.test.fixtures.vectors import UNITTEST_VECTOR
+from counterpartylib.test.util_test import CURR_DIR
+from counterpartylib.test import util_test
+
+from counterpartylib.lib import (blocks, backend, config, util, database, exceptions)
+
+
+FIXTURE_SQL_FILE = CURR_DIR + '/fixtures/scenarios/unittest_fixture.sql'
+FIXTURE_DB = tempfile.gettempdir() + '/fixtures.unittest_fixture.db'
+
+FakeBlock = collections.namedtuple('FakeBlock', ['hash', 'hashPrevBlock'])
+
+
+def mock_backend(monkeypatch, fail_at=None):
+    def getblockhash(block_index):
+        if block_index == fail_at:
+            raise Exception('backend unreachable')
+        return 'hash{}'.format(block_index)
+
+    def getblock(block_hash):
+        return FakeBlock(block_hash, 'prev' + block_hash)
+
+    def get_tx_list(block, block_index=None):
+        return [block.hash], {block.hash: block_index}
+
+    monkeypatch.setattr('counterpartylib.lib.backend.getblockhash', getblockhash)
+    monkeypatch.setattr('counterpartylib.lib.backend.getblock', getblock)
+    monkeypatch.setattr('counterpartylib.lib.backend.get_tx_list', get_tx_list)
+
+
+def test_block_prefetcher_order(monkeypatch):
+    mock_backend(monkeypatch)
+
+    prefetcher = blocks.BlockPrefetcher(100, 120, 3)
+    prefetcher.start()
+    for block_index in range(100, 121):
+        _, block_hash, block, txhash_list, raw_transactions = prefetcher.get(block_index)
+        assert block_hash == 'hash{}'.format(block_index)
+        assert block.hash == block_hash
+        assert txhash_list == [block_hash]
+        # transactions are listed as of the previous block, like `follow()` does
+        assert raw_transactions[block_hash] == block_index - 1
+
+    assert prefetcher.get(121) is None
+    prefetcher.stop()
+
+
+def test_block_prefetcher_flush(monkeypatch):
+    mock_backend(monkeypatch)
+
+    prefetcher = blocks.BlockPrefetcher(100, 200, 3)
+    prefetcher.start()
+    assert prefetcher.get(100)[0] == 100
+    # out-of-order request (e.g. after a rollback)
+    assert prefetcher.get(50) is None
+    prefetcher.stop()
+    assert not prefetcher.is_alive()
+
+
+def test_block_prefetcher_backend_error(monkeypatch):
+    mock_backend(monkeypatch, fail_at=102)
+
+    prefetcher = blocks.BlockPrefetcher(100, 110, 3)
+    prefetcher.start()
+    assert prefetcher.get(100)[0] == 100
+    assert prefetcher.get(101)[0] == 101
+    assert prefetcher.get(102) is None
+    prefetcher.stop()
+
+
+def test_fast_sync_undolog(server_db):
+    cursor = server_db.cursor()
+    def count(table):
+        return list(cursor.execute('''SELECT COUNT(*) AS c FROM {}'''.format(table)))[0]['c']
+    def undolog_triggers():
+        names = ['_{}_{}'.format(table, trigger_type) for table in blocks.UNDOLOG_TABLES
+                 for trigger_type in ('insert', 'update', 'delete')]
+        return [row['name'] for row in cursor.execute('''SELECT name FROM sqlite_master WHERE type = ?''', ('trigger',))
+                if row['name'] in names]
+    assert len(undolog_triggers()) == 3 * len(blocks.UNDOLOG_TABLES)
+
+    try:
+        blocks.disable_undolog(server_db)
+        assert not blocks.UNDOLOG_ENABLED
+        assert undolog_triggers() == []
+        assert count('undolog') == 0 and count('undolog_block') == 0
+
+        util_test.create_next_block(server_db)
+        assert count('undolog') == 0 and count('undolog_block') == 0
+    finally:
+        blocks.enable_undolog(server_db)
+
+    assert blocks.UNDOLOG_ENABLED
+    assert len(undolog_triggers()) == 3 * len(blocks.UNDOLOG_TABLES)
+    block_index, _, _ = util_test.create_next_block(server_db)
+    assert [row['block_index'] for row in cursor.execute('''SELECT block_index FROM undolog_block''')] == [block_index]
+
+
+def test_rollback_undolog(server_db):
+    cursor = server_db.cursor()
+    def tables():
+        return dict((table, list(cursor.execute('''SELECT rowid, * FROM {} ORDER BY rowid'''.format(table))))
+                    for table in blocks.UNDOLOG_TABLES)
+    # Restored exactly, with their types.
+    raw_cursor = server_db.cursor()
+    raw_cursor.setexectrace(None) # not messages
+    raw_cursor.execute('''UPDATE broadcasts SET value = ? WHERE rowid = 1''', (0.1 + 0.2,))
+    raw_cursor.execute('''UPDATE sends SET memo = ? WHERE rowid = 1''', (b'\x00\xff',))
+    before = tables()
+    first_undo_index = list(cursor.execute('''SELECT seq + 1 AS i FROM sqlite_sequence WHERE name = 'undolog' '''))[0]['i']
+
+    cursor.execute('''UPDATE balances SET quantity = quantity + 1 WHERE rowid = 1''')
+    cursor.execute('''UPDATE balances SET quantity = quantity + 1 WHERE rowid = 1''')
+    cursor.execute('''DELETE FROM balances WHERE rowid = 2''')
+    cursor.execute('''INSERT INTO balances VALUES('address', 'XCP', 1)''')
+    cursor.execute('''DELETE FROM order_matches''')
+    raw_cursor.execute('''UPDATE broadcasts SET value = 1''')
+    raw_cursor.execute('''DELETE FROM sends WHERE rowid = 1''')
+    cursor.execute('''UPDATE orders SET status = ?''', ('cancelled',))
+    debit = list(cursor.execute('''SELECT rowid, * FROM debits ORDER BY rowid LIMIT 1'''))[0]
+    cursor.execute('''DELETE FROM debits WHERE rowid = :rowid''', debit)
+    cursor.execute('''INSERT INTO debits(rowid, block_index, address, asset, quantity, action, event)
+                      VALUES(:rowid, :block_index, :address, :asset, 1, :action, :event)''', debit)
+    assert tables() != before
+
+    undolog_cursor = server_db.cursor()
+    undolog_cursor.setexectrace(None)
+    undolog_cursor.setrowtrace(None)
+    blocks.rollback_undolog(undolog_cursor, first_undo_index)
+    assert tables() == before
+
+
+def test_migrate_undolog(server_db):
+    cursor = server_db.cursor()
+    cursor.setexectrace(None)
+    balance = list(cursor.execute('''SELECT rowid, * FROM balances WHERE rowid = 1'''))[0]
+    blocks.drop_undolog_triggers(cursor)
+    cursor.execute('''DROP TABLE undolog''')
+    cursor.execute('''CREATE TABLE undolog(undo_index INTEGER PRIMARY KEY AUTOINCREMENT, sql TEXT)''')
+    cursor.execute('''INSERT INTO undolog VALUES(10, 'DELETE FROM debits WHERE rowid=26')''')
+    cursor.execute('''INSERT INTO undolog VALUES(11, 'UPDATE balances SET address=''{}'',asset=''XCP'',quantity=5 WHERE rowid=1')'''.format(balance['address']))
+    cursor.execute('''INSERT INTO undolog VALUES(12, 'INSERT INTO addresses(rowid,address,options,block_index) VALUES(7,''address'',0,310000)')''')
+
+    blocks.migrate_undolog(server_db)
+    records = list(cursor.execute('''SELECT undo_index, table_name, op, row_id, v1, v2, v3, v4 FROM undolog'''))
+    assert [tuple(record.values()) for record in records] == [
+        (10, 'debits', blocks.UNDOLOG_INSERT, 26, None, None, None, None),
+        (11, 'balances', blocks.UNDOLOG_UPDATE, 1, balance['address'], 'XCP', 5, None),
+        (12, 'addresses', blocks.UNDOLOG_DELETE, 7, 'address', 0, 310000, None)]
+    assert list(cursor.execute('''SELECT seq FROM sqlite_sequence WHERE name = 'undolog' '''))[0]['seq'] == 12
+
+    # The triggers log changes in the new format.
+    cursor.execute('''UPDATE balances SET quantity = 6 WHERE rowid = 1''')
+    assert list(cursor.execute('''SELECT undo_index, op, v3 FROM undolog WHERE undo_index > 12''')) == [
+        {'undo_index': 13, 'op': blocks.UNDOLOG_UPDATE, 'v3': balance['quantity']}]
+
+
+def test_balances_unique_index(server_db, monkeypatch):
+    cursor = server_db.cursor()
+    monkeypatch.setattr(config, 'BLOCK_FIRST', list(cursor.execute('''SELECT MIN(block_index) AS b FROM blocks'''))[0]['b'])
+    def address_asset_idx():
+        return [index for index in cursor.execute('''PRAGMA index_list(balances)''') if index['name'] == 'address_asset_idx']
+    assert address_asset_idx()[0]['unique']
+    balance = list(cursor.execute('''SELECT * FROM balances ORDER BY rowid LIMIT 1'''))[0]
+    with pytest.raises(apsw.ConstraintError):
+        cursor.execute('''INSERT INTO balances VALUES(:address, :asset, :quantity)''', balance)
+
+    # Migration of the former index.
+    cursor.execute('''DROP INDEX address_asset_idx''')
+    cursor.execute('''CREATE INDEX address_asset_idx ON balances (address, asset)''')
+    blocks.initialise(server_db)
+    assert address_asset_idx()[0]['unique']
+
+    cursor.execute('''DROP INDEX address_asset_idx''')
+    cursor.execute('''CREATE INDEX address_asset_idx ON balances (address, asset)''')
+    cursor.execute('''INSERT INTO balances VALUES(:address, :asset, :quantity)''', balance)
+    with pytest.raises(exceptions.DatabaseError):
+        blocks.initialise(server_db)
+
+
+def test_block_batch(server_db, monkeypatch):
+    indexed = []
+    monkeypatch.setattr('counterpartylib.lib.outpoints.index_block', lambda block, block_index: indexed.append(block_index))
+    def parse_next_block(batch, caught_up=False):
+        batch.begin()
+        block_index = util_test.create_next_block(server_db)[0]
+        batch.block_parsed(block_index, None, caught_up)
+        return block_index
+
+    batch = blocks.BlockBatch(server_db, 3, 3600)
+    block_indexes = [parse_next_block(batch) for i in range(2)]
+    assert batch.is_open()
+    # the outpoint index only gets the committed blocks
+    assert indexed == []
+    block_indexes.append(parse_next_block(batch))
+    assert not batch.is_open()
+    assert indexed == block_indexes
+
+    # committed once caught up
+    block_indexes.append(parse_next_block(batch, caught_up=True))
+    assert not batch.is_open()
+    assert indexed == block_indexes
+
+    # or after `interval` seconds
+    batch = blocks.BlockBatch(server_db, 3, 0)
+    block_indexes.append(parse_next_block(batch))
+    assert not batch.is_open()
+    assert indexed == block_indexes
+
+    # disabled
+    batch = blocks.BlockBatch(server_db, 1, 3600)
+    batch.begin()
+    assert not batch.is_open()
+    block_indexes.append(parse_next_block(batch))
+    assert indexed == block_indexes
+
+
+def test_header_cache(monkeypatch):
+    FakeHeader = collections.namedtuple('FakeHeader', ['hashPrevBlock'])
+    chain = dict((i, bitcoinlib.core.lx('{:064x}'.format(i))) for i in range(100, 110))
+    calls = []
+    def getblockhash(block_index):
+        calls.append('getblockhash')
+        return bitcoinlib.core.b2lx(chain[block_index])
+    def getblockheader(block_hash):
+        calls.append('getblockheader')
+        block_index = [i for i in chain if bitcoinlib.core.b2lx(chain[i]) == block_hash][0]
+        return FakeHeader(chain[block_index - 1])
+    monkeypatch.setattr('counterpartylib.lib.backend.getblockhash', getblockhash)
+    monkeypatch.setattr('counterpartylib.lib.backend.getblockheader', getblockheader)
+
+    headers = blocks.HeaderCache(5)
+    for block_index in range(101, 110):
+        headers.add(block_index, bitcoinlib.core.b2lx(chain[block_index]), FakeHeader(chain[block_index - 1]))
+    assert sorted(headers.headers) == list(range(105, 110))
+
+    # downloaded blocks are served from the cache
+    assert headers.get_previous_hash(109) == bitcoinlib.core.b2lx(chain[108])
+    assert calls == ['getblockhash']
+
+    # orphaned blocks are not
+    del calls[:]
+    chain[108], chain[109] = bitcoinlib.core.lx('ff' * 32), bitcoinlib.core.lx('ee' * 32)
+    assert headers.get_previous_hash(109) == bitcoinlib.core.b2lx(chain[108])
+    assert headers.get_previous_hash(108) == bitcoinlib.core.b2lx(chain[107])
+    assert headers.get_previous_hash(107) == bitcoinlib.core.b2lx(chain[106])
+    assert calls == ['getblockhash', 'getblockheader', 'getblockhash', 'getblockheader', 'getblockhash']
+
+
+@pytest.mark.parametrize('tx_decode_workers', [0, 2])
+def test_get_block_tx_info(tx_decode_workers, server_db, monkeypatch):
+    raw_transactions = {}
+    for i, vector in enumerate(UNITTEST_VECTOR['blocks']['get_tx_info']):
+        raw_transactions['tx{}'.format(i)] = vector['in'][0]
+    txhash_list = sorted(raw_transactions.keys())
+    with util_test.ConfigContext(DISABLE_ARC4_MOCKING=True):
+        expected = dict((tx_hash, blocks.get_tx_info(raw_transactions[tx_hash], db=server_db)) for tx_hash in txhash_list)
+    assert all(tx_info[0] for tx_info in expected.values())
+
+    calls = []
+    getrawtransaction = backend.getrawtransaction
+    getrawtransaction_batch = backend.getrawtransaction_batch
+    def mocked_getrawtransaction(tx_hash, *args, **kwargs):
+        calls.append(('getrawtransaction', [tx_hash]))
+        return getrawtransaction(tx_hash, *args, **kwargs)
+    def mocked_getrawtransaction_batch(txhash_list, *args, **kwargs):
+        calls.append(('getrawtransaction_batch', sorted(txhash_list)))
+        return getrawtransaction_batch(txhash_list, *args, **kwargs)
+    monkeypatch.setattr('counterpartylib.lib.backend.getrawtransaction', mocked_getrawtransaction)
+    monkeypatch.setattr('counterpartylib.lib.backend.getrawtransaction_batch', mocked_getrawtransaction_batch)
+
+    with util_test.ConfigContext(DISABLE_ARC4_MOCKING=True, TX_DECODE_WORKERS=tx_decode_workers):
+        assert blocks.get_block_tx_info(server_db, txhash_list, raw_transactions) == expected
+    assert len(calls) == 1
+    assert calls[0][0] == 'getrawtransaction_batch'
+    prevout_hashes = calls[0][1]
+
+    # outputs created in the block are served from the block
+    del calls[:]
+    for tx_hash in prevout_hashes:
+        raw_transactions[tx_hash] = getrawtransaction(tx_hash)
+    txhash_list = prevout_hashes + txhash_list
+    with util_test.ConfigContext(DISABLE_ARC4_MOCKING=True, TX_DECODE_WORKERS=tx_decode_workers):
+        tx_info = blocks.get_block_tx_info(server_db, txhash_list, raw_transactions)
+    assert calls == []
+    for tx_hash in expected:
+        assert tx_info[tx_hash] == expected[tx_hash]
+
+    blocks.stop_decode_pool()
+    assert blocks.DECODE_POOL is None
+
+
+def test_backend_notifier():
+    zmq = pytest.importorskip('zmq')
+    context = zmq.Context()
+    publisher = context.socket(zmq.PUB)
+    port = publisher.bind_to_random_port('tcp://127.0.0.1')
+    notifier = blocks.BackendNotifier(['tcp://127.0.0.1:{}'.format(port)])
+    try:
+        # wait for the subscription to reach the publisher
+        for i in range(50):
+            publisher.send_multipart([b'rawtx', b'\x00', b'\x00\x00\x00\x00'])
+            if notifier.wait(0.1) != (False, []):
+                break
+        else:
+            assert False, 'no notification received'
+        while notifier.wait(0.1) != (False, []):
+            pass
+
+        publisher.send_multipart([b'rawtx', b'\x01\x02', b'\x01\x00\x00\x00'])
+        publisher.send_multipart([b'rawtx', b'\xab', b'\x02\x00\x00\x00'])
+        publisher.send_multipart([b'hashblock', b'\x00' * 32, b'\x00\x00\x00\x00'])
+        time.sleep(0.2)  # queued notifications are drained without waiting
+        assert notifier.wait(1) == (True, ['0102', 'ab'])
+
+        # quiet socket
+        assert notifier.wait(0.1) == (False, [])
+    finally:
+        notifier.close()
+        publisher.close(linger=0)
+        context.term()
+
+
+def test_mempool_speculation(server_db):
+    tx_hex = UNITTEST_VECTOR['blocks']['get_tx_info'][0]['in'][0]
+    tx_hash = bitcoinlib.core.b2lx(backend.deserialize(tx_hex).GetTxid())
+    block_index, tx_index = util.CURRENT_BLOCK_INDEX + 1, blocks.get_next_tx_index(server_db)
+    cursor = server_db.cursor()
+    def count(table):
+        return list(cursor.execute('''SELECT COUNT(*) AS c FROM {}'''.format(table)))[0]['c']
+    counts = dict((table, count(table)) for table in ('messages', 'undolog', 'transactions', 'blocks'))
+
+    with util_test.ConfigContext(DISABLE_ARC4_MOCKING=True):
+        with blocks.MempoolSpeculation(server_db, 0) as speculation:
+            supported, messages, next_tx_index = speculation.parse(tx_hash, tx_hex, block_index, tx_index)
+            assert supported
+            assert messages
+            assert all(message['block_index'] == config.MEMPOOL_BLOCK_INDEX for message in messages)
+            # the next transaction is listed after this one
+            assert next_tx_index == tx_index + 1
+            # each transaction is rolled back on its own
+            assert speculation.parse(tx_hash, tx_hex, block_index, tx_index) == (supported, messages, next_tx_index)
+            supported, messages, after_next_tx_index = speculation.parse(tx_hash, tx_hex, block_index, next_tx_index)
+            assert after_next_tx_index == next_tx_index + 1
+            # no undolog, no messages, no consensus bookkeeping
+            assert count('undolog') == counts['undolog']
+            assert count('messages') == counts['messages']
+            assert database.BLOCK_MESSAGES == [] and util.BLOCK_LEDGER == []
+
+    # the database is rolled back, triggers included
+    for table in counts:
+        assert count(table) == counts[table]
+    assert list(cursor.execute('''SELECT * FROM sqlite_master WHERE type = ? AND name = ?''', ('trigger', '_sends_insert')))
+    assert util.SPECULATIVE_MESSAGES is None
+
+    # not a Counterparty transaction
+    with blocks.MempoolSpeculation(server_db, 0) as speculation:
+        assert speculation.parse(tx_hash, tx_hex, block_index, tx_index) == (False, [], tx_index)
+
+
+def test_mempool_engine(server_db, monkeypatch):
+    raw_transactions = {}
+    xcp_hashes, btc_hashes = [], []
+    for vector in UNITTEST_VECTOR['blocks']['get_tx_info'][:2]:
+        tx_hex = vector['in'][0]
+        ctx = backend.deserialize(tx_hex)
+        xcp_hashes.append(bitcoinlib.core.b2lx(ctx.GetTxid()))
+        raw_transactions[xcp_hashes[-1]] = tx_hex
+        # not a Counterparty transaction
+        funding_hash = bitcoinlib.core.b2lx(ctx.vin[0].prevout.hash)
+        if funding_hash not in raw_transactions:
+            btc_hashes.append(funding_hash)
+            raw_transactions[funding_hash] = backend.getrawtransaction(funding_hash)
+
+    fetched = []
+    def getrawtransaction_batch(txhash_list, *args, **kwargs):
+        fetched.extend(txhash_list)
+        return dict((tx_hash, raw_transactions[tx_hash]) for tx_hash in txhash_list)
+    monkeypatch.setattr('counterpartylib.lib.backend.getrawtransaction_batch', getrawtransaction_batch)
+
+    def mempool_table():
+        cursor = server_db.cursor()
+        rows = list(cursor.execute('''SELECT * FROM mempool'''))
+        cursor.close()
+        return sorted(set(row['tx_hash'] for row in rows))
+
+    block_index, tx_index = util.CURRENT_BLOCK_INDEX + 1, blocks.get_next_tx_index(server_db)
+    mempool = blocks.MempoolEngine(server_db)
+    with util_test.ConfigContext(DISABLE_ARC4_MOCKING=True, MEMPOOL_PARSE_CHUNK_SIZE=len(raw_transactions) - 1):
+        # large mempools are parsed in chunks
+        assert mempool.refresh(list(raw_transactions), block_index, tx_index) == 1
+        assert mempool.refresh(list(raw_transactions), block_index, tx_index) == 0
+        assert sorted(fetched) == sorted(raw_transactions)
+        assert mempool_table() == sorted(xcp_hashes)
+        assert sorted(mempool.not_supported) == sorted(btc_hashes)
+
+        # known transactions are not parsed again
+        del fetched[:]
+        assert mempool.refresh(list(raw_transactions), block_index, tx_index) == 0
+        assert fetched == []
+
+        # only the transactions which left the mempool are removed
+        assert mempool.refresh(xcp_hashes[1:], block_index, tx_index) == 0
+        assert mempool_table() == sorted(xcp_hashes[1:])
+
+        # announced transactions
+        mempool.add([raw_transactions[xcp_hashes[0]]], block_index, tx_index)
+        assert mempool_table() == sorted(xcp_hashes)
+        assert fetched == []
+
+    # non-supported transactions are forgotten after ten blocks
+    mempool.prune(block_index + 10)
+    assert mempool.not_supported == {}
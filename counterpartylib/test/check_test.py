@@ -0,0 +1,133 @@
+#! /usr/bin/python3
+import os
+import json
+import tempfile
+
+import pytest
+
+from counterpartylib.test import conftest  # this is require near the top to do setup of the test suite
+from counterpartylib.test.util_test import CURR_DIR
+from counterpartylib.test import util_test
+
+from counterpartylib.lib import (blocks, check, config, database, util)
+
+
+FIXTURE_SQL_FILE = CURR_DIR + '/fixtures/scenarios/unittest_fixture.sql'
+FIXTURE_DB = tempfile.gettempdir() + '/fixtures.unittest_fixture.db'
+
+
+class FakeResponse(object):
+    def __init__(self, versions):
+        self.text = json.dumps(versions)
+
+
+@pytest.fixture
+def protocol_changes(cp_server, monkeypatch):
+    monkeypatch.setattr('counterpartylib.lib.check.PROTOCOL_CHANGES', None)
+    monkeypatch.setattr('counterpartylib.lib.check.PROTOCOL_CHANGES_TIME', 0)
+    monkeypatch.setattr('counterpartylib.lib.check.PROTOCOL_CHANGES_THREAD', None)
+
+    versions = {'test_change': {'minimum_version_major': 0, 'minimum_version_minor': 0, 'minimum_version_revision': 0, 'block_index': 0}}
+    requests = []
+    def get(url, *args, **kwargs):
+        assert kwargs['timeout'] == config.REQUESTS_TIMEOUT
+        requests.append(url)
+        return FakeResponse(versions)
+    monkeypatch.setattr('requests.get', get)
+    return versions, requests
+
+
+def test_software_version_cache(protocol_changes):
+    versions, requests = protocol_changes
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        cache = os.path.join(data_dir, 'test.protocol_changes.json')
+        with util_test.ConfigContext(FORCE=False, PROTOCOL_CHANGES_CACHE=cache, VERSION_CHECK_INTERVAL=3600):
+            # fetched once, then served from memory
+            check.software_version()
+            check.software_version()
+            assert len(requests) == 1
+            with open(cache, 'r') as f:
+                assert json.load(f) == versions
+
+            # refreshed in the background
+            check.PROTOCOL_CHANGES_TIME -= 3600
+            check.software_version()
+            check.PROTOCOL_CHANGES_THREAD.join()
+            assert len(requests) == 2
+
+            # read from the cache after a restart
+            check.PROTOCOL_CHANGES, check.PROTOCOL_CHANGES_TIME = None, 0
+            check.software_version()
+            assert len(requests) == 2
+            assert check.PROTOCOL_CHANGES == versions
+
+
+def test_software_version_update_required(protocol_changes):
+    versions, requests = protocol_changes
+    versions['test_change']['minimum_version_major'] = config.VERSION_MAJOR + 1
+
+    with util_test.ConfigContext(FORCE=False, PROTOCOL_CHANGES_CACHE=None, VERSION_CHECK_INTERVAL=3600):
+        with pytest.raises(SystemExit) as e:
+            check.software_version()
+        assert e.value.code == config.EXITCODE_UPDATE_REQUIRED
+
+        # not yet in force
+        versions['test_change']['block_index'] = util.CURRENT_BLOCK_INDEX + 1
+        check.PROTOCOL_CHANGES_TIME = 0
+        with pytest.warns(UserWarning):
+            check.software_version()
+
+
+def test_consensus_hasher():
+    previous_consensus_hash = util.dhash_string(check.CONSENSUS_HASH_SEED)
+    entries = ['send{}'.format(i) for i in range(10)] + ['', 'é', '[(\'memo\', None)]']
+    hasher = check.ConsensusHasher(previous_consensus_hash, 2)
+    for entry in entries:
+        hasher.append(entry)
+    assert hasher.hexdigest() == util.dhash_string(previous_consensus_hash + '{}{}'.format(2, ''.join(entries)))
+    assert check.ConsensusHasher(previous_consensus_hash, 2).hexdigest() == util.dhash_string(previous_consensus_hash + '2')
+
+
+def test_consensus_hashes_equivalence(cp_server, monkeypatch):
+    """Parse the blocks of the fixture, including its checkpoint blocks, and
+    check the hashes against the reference ones, as calculated before the
+    entries were streamed into the hashers (by joining them)."""
+    with open(CURR_DIR + '/fixtures/consensus_hashes.json', 'r') as f:
+        reference_hashes = [tuple(block) for block in json.load(f)]
+
+    db = database.get_connection(read_only=False, integrity_check=False)
+    cursor = db.cursor()
+    block_indexes = [block['block_index'] for block in cursor.execute('''SELECT block_index FROM blocks ORDER BY block_index''')]
+    assert set(check.CHECKPOINTS_TESTNET) & set(block_indexes)
+    # The hashes stored in the fixture are of an older protocol: the reference
+    # hashes are the ones of the fixture parsed from scratch, without checkpoints.
+    monkeypatch.setattr(config, 'BLOCK_FIRST', block_indexes[0])
+    monkeypatch.setattr(check, 'CHECKPOINTS_TESTNET', {})
+
+    def parse_blocks(previous_hashes_in_memory):
+        with db:
+            for table in blocks.TABLES + ['balances', 'supplies', 'expirations_due']:
+                cursor.execute('''DROP TABLE IF EXISTS {}'''.format(table))
+            blocks.initialise(db)
+            cursor.execute('''UPDATE blocks SET ledger_hash = NULL, txlist_hash = NULL, messages_hash = NULL''')
+            hashes, previous_hashes = [], {}
+            for block in list(cursor.execute('''SELECT * FROM blocks ORDER BY block_index''')):
+                util.CURRENT_BLOCK_INDEX = block['block_index']
+                if previous_hashes_in_memory:
+                    previous_hashes = {}
+                ledger_hash, txlist_hash, messages_hash, found_messages_hash = blocks.parse_block(
+                    db, block['block_index'], block['block_time'], **previous_hashes)
+                previous_hashes = {'previous_ledger_hash': ledger_hash,
+                                   'previous_txlist_hash': txlist_hash,
+                                   'previous_messages_hash': messages_hash}
+                hashes.append((block['block_index'], ledger_hash, txlist_hash, messages_hash))
+        assert list(cursor.execute('''SELECT block_index, ledger_hash, txlist_hash, messages_hash FROM blocks
+                                      ORDER BY block_index''')) == [dict(zip(('block_index', 'ledger_hash', 'txlist_hash', 'messages_hash'), block))
+                                                                       for block in hashes]
+        return hashes
+
+    # Previous hashes passed to `parse_block()`, or kept in memory.
+    assert parse_blocks(False) == reference_hashes
+    assert parse_blocks(True) == reference_hashes
+    db.close()
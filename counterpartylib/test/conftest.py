@@ -27,7 +27,7 @@ from counterpartylib.test.fixtures.vectors import UNITTEST_VECTOR
 from counterpartylib.test.fixtures.params import DEFAULT_PARAMS
 from counterpartylib.test.fixtures.scenarios import INTEGRATION_SCENARIOS
 
-from counterpartylib.lib import config, util, database, api, script, arc4
+from counterpartylib.lib import config, util, database, api, script, arc4, blocks, check
 
 # used to increment RPC port between test modules to avoid conflicts
 TEST_RPC_PORT = 9999
@@ -157,6 +157,26 @@ def server_db(request, cp_server, api_server):
 
     request.addfinalizer(lambda: cursor.execute('''ROLLBACK'''))
     request.addfinalizer(lambda: util_test.reset_current_block_index(db))
+    request.addfinalizer(util.reset_balances)
+
+    return db
+
+
+@pytest.fixture(scope='function')
+def parsed_db(request, cp_server, monkeypatch):
+    """Writable database of the module's fixture, initialised as by the server
+    and with its first block as the first block of the chain, to create, roll
+    back and reparse blocks on."""
+    db = database.get_connection(read_only=False, integrity_check=False)
+    cursor = db.cursor()
+    first_block = list(cursor.execute('''SELECT * FROM blocks ORDER BY block_index LIMIT 1'''))[0]
+    cursor.close()
+    monkeypatch.setattr(config, 'BLOCK_FIRST', first_block['block_index'])
+    monkeypatch.setitem(check.CHECKPOINTS_TESTNET, first_block['block_index'], first_block)
+    blocks.initialise(db) # migrate the schema of the fixture
+    util_test.reset_current_block_index(db)
+
+    request.addfinalizer(db.close)
 
     return db
 
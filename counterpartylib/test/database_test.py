@@ -0,0 +1,126 @@
+#! /usr/bin/python3
+import json
+import tempfile
+import threading
+import pytest
+import apsw
+
+from counterpartylib.test import conftest  # this is require near the top to do setup of the test suite
+from counterpartylib.test.util_test import CURR_DIR
+
+from counterpartylib.lib import (database, exceptions)
+
+
+FIXTURE_SQL_FILE = CURR_DIR + '/fixtures/scenarios/unittest_fixture.sql'
+FIXTURE_DB = tempfile.gettempdir() + '/fixtures.unittest_fixture.db'
+
+
+def test_rowtracer(server_db):
+    cursor = server_db.cursor()
+    rows = list(cursor.execute('''SELECT address, asset, quantity FROM balances ORDER BY rowid LIMIT 2'''))
+    assert all(type(row) is dict for row in rows)
+    assert list(rows[0].keys()) == ['address', 'asset', 'quantity']
+
+    # Each statement gets its own columns, even run by the same cursor.
+    assert list(cursor.execute('''SELECT 1 AS one; SELECT 2 AS two''')) == [{'one': 1}, {'two': 2}]
+    cursor.setexectrace(None)
+    assert list(cursor.execute('''SELECT 1 AS one; SELECT 2 AS two''')) == [{'one': 1}, {'two': 2}]
+    cursor.close()
+
+
+def test_row_cursor(server_db):
+    cursor = database.row_cursor(server_db)
+    rows = list(cursor.execute('''SELECT * FROM balances ORDER BY rowid LIMIT 2'''))
+    dict_rows = list(server_db.cursor().execute('''SELECT * FROM balances ORDER BY rowid LIMIT 2'''))
+
+    row = rows[0]
+    assert isinstance(row, database.Row)
+    assert row == dict_rows[0] and dict_rows[0] == row
+    assert row != dict_rows[1]
+    assert row['quantity'] == dict_rows[0]['quantity'] and row[2] == row['quantity']
+    assert row.get('quantity') == row['quantity'] and row.get('foo', 'bar') == 'bar'
+    assert 'asset' in row and 'foo' not in row
+    assert list(row) == list(row.keys()) == ['address', 'asset', 'quantity']
+    assert dict(row) == dict(row.items()) == row._asdict() == dict_rows[0]
+    assert json.loads(json.dumps(row._asdict())) == dict_rows[0]
+    assert type(rows[1]) is type(row)
+    assert list(cursor.execute('''SELECT 1 AS one; SELECT 2 AS two''')) == [{'one': 1}, {'two': 2}]
+    cursor.close()
+
+    cursor = database.tuple_cursor(server_db)
+    assert list(cursor.execute('''SELECT * FROM balances ORDER BY rowid LIMIT 2''')) == [tuple(row.values()) for row in rows]
+    cursor.close()
+
+    # the row types are looked up again for each statement, without the exec
+    # tracer of the connection too
+    cursor = database.row_cursor(server_db, exectrace=False)
+    assert list(cursor.execute('''SELECT COUNT(*) AS count FROM balances'''))[0]['count'] > 2
+    assert list(cursor.execute('''SELECT * FROM balances ORDER BY rowid LIMIT 2''')) == rows
+    cursor.close()
+
+    assert list(database.dict_rows(server_db, '''SELECT * FROM balances ORDER BY rowid LIMIT 2''')) == dict_rows
+    assert all(type(row) is dict for row in database.dict_rows(server_db, '''SELECT * FROM balances LIMIT 2'''))
+    assert list(database.dict_rows(server_db, '''SELECT 1 AS one; SELECT 2 AS two, 3 AS three''')) == [{'one': 1}, {'two': 2, 'three': 3}]
+    assert list(database.dict_rows(server_db, '''SELECT * FROM balances WHERE address = ?''', ('foo',))) == []
+
+
+def test_classify_statement():
+    assert database.classify_statement('''INSERT INTO sends VALUES(:tx_index, :tx_hash)''') == ('insert', 'sends', True, True)
+    assert database.classify_statement('''UPDATE orders SET status = :status WHERE tx_hash = :tx_hash''') == ('update', 'orders', False, True)
+    assert database.classify_statement('''INSERT INTO orders VALUES(:tx_index, :tx_hash)''') == ('insert', 'orders', True, True)
+    assert database.classify_statement('''update balances set quantity = :quantity''') == ('update', 'balances', False, False)
+    assert database.classify_statement('''SELECT * FROM sends''') is None
+    assert database.classify_statement('''CREATE TRIGGER _sends_insert AFTER INSERT ON sends BEGIN INSERT INTO undolog VALUES(NULL, 1); END;''') is None
+
+
+def test_connection_pool(server_db):
+    pool = database.ConnectionPool(2, timeout=0.1)
+    db = pool.get()
+    assert pool.get() is db
+    assert list(db.cursor().execute('''SELECT COUNT(*) AS c FROM blocks'''))[0]['c'] > 0
+
+    # Each thread checks out its own connection, up to the size of the pool.
+    checked_out = []
+    def check_out():
+        try:
+            checked_out.append(pool.get())
+        except exceptions.DatabaseError as e:
+            checked_out.append(e)
+    for i in range(2):
+        thread = threading.Thread(target=check_out)
+        thread.start()
+        thread.join()
+    assert checked_out[0] is not db
+    assert isinstance(checked_out[1], exceptions.DatabaseError)
+
+    # Released connections are reused, until the pool is recycled.
+    pool.release()
+    assert pool.get() is db
+    pool.release()
+    pool.recycle()
+    other_db = pool.get()
+    assert other_db is not db
+    pool.release(discard=True)
+    with pytest.raises(apsw.ConnectionClosedError):
+        other_db.cursor()
+    pool.close()
+
+
+def test_integrity_check(server_db, monkeypatch):
+    monkeypatch.setattr(database, 'INTEGRITY_CHECK', dict(database.INTEGRITY_CHECK))
+    for per_table in (False, True):
+        database.IntegrityCheck(per_table=per_table).run()
+        assert database.INTEGRITY_CHECK['status'] == 'ok'
+        assert database.INTEGRITY_CHECK['checks_done'] == database.INTEGRITY_CHECK['checks']
+        assert database.INTEGRITY_CHECK['checks'] > 2 if per_table else database.INTEGRITY_CHECK['checks'] == 2
+    database.check_integrity_status()
+
+    monkeypatch.setattr(database.IntegrityCheck, 'check', lambda self, cursor, pragma: ['corrupted'])
+    check = database.IntegrityCheck()
+    check.start()
+    check.join()
+    assert database.INTEGRITY_CHECK['status'] == 'failed'
+    with pytest.raises(database.DatabaseIntegrityError):
+        database.check_integrity_status()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,71 @@
+#! /usr/bin/python3
+import tempfile
+
+from counterpartylib.test import conftest  # this is require near the top to do setup of the test suite
+from counterpartylib.test.util_test import CURR_DIR
+from counterpartylib.test import util_test
+
+from counterpartylib.lib import (blocks, expirations, util)
+
+
+FIXTURE_SQL_FILE = CURR_DIR + '/fixtures/scenarios/unittest_fixture.sql'
+FIXTURE_DB = tempfile.gettempdir() + '/fixtures.expirations_test.db'
+
+# The searches the schedule replaces.
+LEGACY = {
+    'orders': ('''SELECT * FROM orders WHERE (status = ? AND expire_index < ?)''', ('open',)),
+    'order_matches': ('''SELECT * FROM order_matches WHERE (status = ? and match_expire_index < ?)''', ('pending',)),
+    'bets': ('''SELECT * FROM bets WHERE (status = ? AND expire_index < ?)''', ('open',)),
+    'bet_matches': ('''SELECT * FROM bet_matches WHERE (status = ? AND deadline < ?)''', ('pending',)),
+    'rps': ('''SELECT * FROM rps WHERE (status = ? AND expire_index < ?)''', ('open',)),
+    'rps_matches': ('''SELECT * FROM rps_matches WHERE (status IN (?, ?, ?) AND match_expire_index < ?)''',
+                    ('pending', 'pending and resolved', 'resolved and pending')),
+}
+
+
+def test_expirations(parsed_db):
+    db = parsed_db
+    tip = util.CURRENT_BLOCK_INDEX
+    cursor = db.cursor()
+    raw_cursor = db.cursor()
+    raw_cursor.setexectrace(None) # not messages
+    def schedule():
+        return list(cursor.execute('''SELECT * FROM expirations_due ORDER BY kind, due, item'''))
+    def rebuilt():
+        raw_cursor.execute('''SAVEPOINT rebuild''')
+        expirations.rebuild(raw_cursor)
+        rows = schedule()
+        raw_cursor.execute('''ROLLBACK TO SAVEPOINT rebuild''')
+        raw_cursor.execute('''RELEASE SAVEPOINT rebuild''')
+        return rows
+    def check_due():
+        # The same rows as the searches, in the same order, at each expiration.
+        for table, (sql, bindings) in LEGACY.items():
+            expiration_column = expirations.SCHEDULE[table][1]
+            dues = [row[expiration_column] for row in cursor.execute('''SELECT {} FROM {}'''.format(expiration_column, table))]
+            for expiration in sorted(set(due + 1 for due in dues if due is not None)) + [2 ** 62]:
+                assert expirations.due(db, table, expiration) == list(cursor.execute(sql, bindings + (expiration,)))
+
+    # Computed for the database that had no schedule.
+    before = schedule()
+    assert before
+    check_due()
+
+    # Kept in step with the expirations (of an order match and a bet) and
+    # other changes.
+    util_test.create_next_block(db, block_index=tip + 90)
+    assert list(cursor.execute('''SELECT COUNT(*) AS count FROM order_match_expirations WHERE block_index > ?''', (tip,)))[0]['count'] == 1
+    assert list(cursor.execute('''SELECT COUNT(*) AS count FROM bet_expirations WHERE block_index > ?''', (tip,)))[0]['count'] == 1
+    with db:
+        raw_cursor.execute('''UPDATE orders SET expire_index = expire_index - 1000 WHERE tx_index =
+                              (SELECT MIN(tx_index) FROM orders WHERE status = 'open')''')
+        raw_cursor.execute('''UPDATE bets SET status = 'cancelled' WHERE tx_index =
+                              (SELECT MIN(tx_index) FROM bets WHERE status = 'open')''')
+    assert schedule() == rebuilt()
+    assert schedule() != before
+    check_due()
+
+    # Rolled back with the changes of the blocks.
+    blocks.reparse(db, block_index=tip)
+    assert schedule() == before
+    check_due()
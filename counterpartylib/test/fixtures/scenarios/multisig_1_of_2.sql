@@ -13,14 +13,14 @@ CREATE TABLE addresses(
                       block_index INTEGER);
 -- Triggers and indices on  addresses
 CREATE TRIGGER _addresses_delete BEFORE DELETE ON addresses BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO addresses(rowid,address,options,block_index) VALUES('||old.rowid||','||quote(old.address)||','||quote(old.options)||','||quote(old.block_index)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3) VALUES('addresses', 2, old.rowid, old.address,old.options,old.block_index);
+                                END;
 CREATE TRIGGER _addresses_insert AFTER INSERT ON addresses BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM addresses WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('addresses', 0, new.rowid);
                             END;
 CREATE TRIGGER _addresses_update AFTER UPDATE ON addresses BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE addresses SET address='||quote(old.address)||',options='||quote(old.options)||',block_index='||quote(old.block_index)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3) VALUES('addresses', 1, old.rowid, old.address,old.options,old.block_index);
+                                END;
 CREATE INDEX addresses_idx ON addresses (address);
 
 -- Table  assets
@@ -36,14 +36,14 @@ INSERT INTO assets VALUES('18279','BBBB',310005,NULL);
 INSERT INTO assets VALUES('18280','BBBC',310006,NULL);
 -- Triggers and indices on  assets
 CREATE TRIGGER _assets_delete BEFORE DELETE ON assets BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO assets(rowid,asset_id,asset_name,block_index,asset_longname) VALUES('||old.rowid||','||quote(old.asset_id)||','||quote(old.asset_name)||','||quote(old.block_index)||','||quote(old.asset_longname)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4) VALUES('assets', 2, old.rowid, old.asset_id,old.asset_name,old.block_index,old.asset_longname);
+                                END;
 CREATE TRIGGER _assets_insert AFTER INSERT ON assets BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM assets WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('assets', 0, new.rowid);
                             END;
 CREATE TRIGGER _assets_update AFTER UPDATE ON assets BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE assets SET asset_id='||quote(old.asset_id)||',asset_name='||quote(old.asset_name)||',block_index='||quote(old.block_index)||',asset_longname='||quote(old.asset_longname)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4) VALUES('assets', 1, old.rowid, old.asset_id,old.asset_name,old.block_index,old.asset_longname);
+                                END;
 CREATE UNIQUE INDEX asset_longname_idx ON assets(asset_longname);
 CREATE INDEX id_idx ON assets (asset_id);
 CREATE INDEX name_idx ON assets (asset_name);
@@ -62,15 +62,15 @@ INSERT INTO balances VALUES('1_mnfAHmddVibnZNSkh8DvKaQoiEfNsxjXzH_mtQheFaSfWELRB
 INSERT INTO balances VALUES('1_mnfAHmddVibnZNSkh8DvKaQoiEfNsxjXzH_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','BBBC',10526);
 -- Triggers and indices on  balances
 CREATE TRIGGER _balances_delete BEFORE DELETE ON balances BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO balances(rowid,address,asset,quantity) VALUES('||old.rowid||','||quote(old.address)||','||quote(old.asset)||','||quote(old.quantity)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3) VALUES('balances', 2, old.rowid, old.address,old.asset,old.quantity);
+                                END;
 CREATE TRIGGER _balances_insert AFTER INSERT ON balances BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM balances WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('balances', 0, new.rowid);
                             END;
 CREATE TRIGGER _balances_update AFTER UPDATE ON balances BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE balances SET address='||quote(old.address)||',asset='||quote(old.asset)||',quantity='||quote(old.quantity)||' WHERE rowid='||old.rowid);
-                            END;
-CREATE INDEX address_asset_idx ON balances (address, asset);
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3) VALUES('balances', 1, old.rowid, old.address,old.asset,old.quantity);
+                                END;
+CREATE UNIQUE INDEX address_asset_idx ON balances (address, asset);
 
 -- Table  bet_expirations
 DROP TABLE IF EXISTS bet_expirations;
@@ -84,14 +84,14 @@ CREATE TABLE bet_expirations(
 INSERT INTO bet_expirations VALUES(13,'19f4bb0c6c99045ec307905d8e15ff885413cdee3525269b25f03971dd8019b9','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',310023);
 -- Triggers and indices on  bet_expirations
 CREATE TRIGGER _bet_expirations_delete BEFORE DELETE ON bet_expirations BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO bet_expirations(rowid,bet_index,bet_hash,source,block_index) VALUES('||old.rowid||','||quote(old.bet_index)||','||quote(old.bet_hash)||','||quote(old.source)||','||quote(old.block_index)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4) VALUES('bet_expirations', 2, old.rowid, old.bet_index,old.bet_hash,old.source,old.block_index);
+                                END;
 CREATE TRIGGER _bet_expirations_insert AFTER INSERT ON bet_expirations BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM bet_expirations WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('bet_expirations', 0, new.rowid);
                             END;
 CREATE TRIGGER _bet_expirations_update AFTER UPDATE ON bet_expirations BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE bet_expirations SET bet_index='||quote(old.bet_index)||',bet_hash='||quote(old.bet_hash)||',source='||quote(old.source)||',block_index='||quote(old.block_index)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4) VALUES('bet_expirations', 1, old.rowid, old.bet_index,old.bet_hash,old.source,old.block_index);
+                                END;
 
 -- Table  bet_match_expirations
 DROP TABLE IF EXISTS bet_match_expirations;
@@ -104,14 +104,14 @@ CREATE TABLE bet_match_expirations(
                       FOREIGN KEY (block_index) REFERENCES blocks(block_index));
 -- Triggers and indices on  bet_match_expirations
 CREATE TRIGGER _bet_match_expirations_delete BEFORE DELETE ON bet_match_expirations BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO bet_match_expirations(rowid,bet_match_id,tx0_address,tx1_address,block_index) VALUES('||old.rowid||','||quote(old.bet_match_id)||','||quote(old.tx0_address)||','||quote(old.tx1_address)||','||quote(old.block_index)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4) VALUES('bet_match_expirations', 2, old.rowid, old.bet_match_id,old.tx0_address,old.tx1_address,old.block_index);
+                                END;
 CREATE TRIGGER _bet_match_expirations_insert AFTER INSERT ON bet_match_expirations BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM bet_match_expirations WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('bet_match_expirations', 0, new.rowid);
                             END;
 CREATE TRIGGER _bet_match_expirations_update AFTER UPDATE ON bet_match_expirations BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE bet_match_expirations SET bet_match_id='||quote(old.bet_match_id)||',tx0_address='||quote(old.tx0_address)||',tx1_address='||quote(old.tx1_address)||',block_index='||quote(old.block_index)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4) VALUES('bet_match_expirations', 1, old.rowid, old.bet_match_id,old.tx0_address,old.tx1_address,old.block_index);
+                                END;
 
 -- Table  bet_match_resolutions
 DROP TABLE IF EXISTS bet_match_resolutions;
@@ -132,14 +132,14 @@ INSERT INTO bet_match_resolutions VALUES('1cc9fa85ad3849ffa70d00b586b75fa07e2676
 INSERT INTO bet_match_resolutions VALUES('e1f35692651c646ba75bbdf931aa9240e23711f221960865410a03dd400243da_dac4afb8fd0b05fd03635f95edd43fb2c8caf5e648c87dad32272f565714d1b9',5,310020,NULL,NULL,NULL,'NotEqual',1330000000,70000000);
 -- Triggers and indices on  bet_match_resolutions
 CREATE TRIGGER _bet_match_resolutions_delete BEFORE DELETE ON bet_match_resolutions BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO bet_match_resolutions(rowid,bet_match_id,bet_match_type_id,block_index,winner,settled,bull_credit,bear_credit,escrow_less_fee,fee) VALUES('||old.rowid||','||quote(old.bet_match_id)||','||quote(old.bet_match_type_id)||','||quote(old.block_index)||','||quote(old.winner)||','||quote(old.settled)||','||quote(old.bull_credit)||','||quote(old.bear_credit)||','||quote(old.escrow_less_fee)||','||quote(old.fee)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9) VALUES('bet_match_resolutions', 2, old.rowid, old.bet_match_id,old.bet_match_type_id,old.block_index,old.winner,old.settled,old.bull_credit,old.bear_credit,old.escrow_less_fee,old.fee);
+                                END;
 CREATE TRIGGER _bet_match_resolutions_insert AFTER INSERT ON bet_match_resolutions BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM bet_match_resolutions WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('bet_match_resolutions', 0, new.rowid);
                             END;
 CREATE TRIGGER _bet_match_resolutions_update AFTER UPDATE ON bet_match_resolutions BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE bet_match_resolutions SET bet_match_id='||quote(old.bet_match_id)||',bet_match_type_id='||quote(old.bet_match_type_id)||',block_index='||quote(old.block_index)||',winner='||quote(old.winner)||',settled='||quote(old.settled)||',bull_credit='||quote(old.bull_credit)||',bear_credit='||quote(old.bear_credit)||',escrow_less_fee='||quote(old.escrow_less_fee)||',fee='||quote(old.fee)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9) VALUES('bet_match_resolutions', 1, old.rowid, old.bet_match_id,old.bet_match_type_id,old.block_index,old.winner,old.settled,old.bull_credit,old.bear_credit,old.escrow_less_fee,old.fee);
+                                END;
 
 -- Table  bet_matches
 DROP TABLE IF EXISTS bet_matches;
@@ -175,14 +175,14 @@ INSERT INTO bet_matches VALUES('1cc9fa85ad3849ffa70d00b586b75fa07e2676cfa57d3146
 INSERT INTO bet_matches VALUES('e1f35692651c646ba75bbdf931aa9240e23711f221960865410a03dd400243da_dac4afb8fd0b05fd03635f95edd43fb2c8caf5e648c87dad32272f565714d1b9',17,'e1f35692651c646ba75bbdf931aa9240e23711f221960865410a03dd400243da','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',18,'dac4afb8fd0b05fd03635f95edd43fb2c8caf5e648c87dad32272f565714d1b9','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',2,3,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',100,1388000200,1.0,5040,750000000,650000000,310016,310017,310017,10,10,310026,99999999,'settled: for notequal');
 -- Triggers and indices on  bet_matches
 CREATE TRIGGER _bet_matches_delete BEFORE DELETE ON bet_matches BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO bet_matches(rowid,id,tx0_index,tx0_hash,tx0_address,tx1_index,tx1_hash,tx1_address,tx0_bet_type,tx1_bet_type,feed_address,initial_value,deadline,target_value,leverage,forward_quantity,backward_quantity,tx0_block_index,tx1_block_index,block_index,tx0_expiration,tx1_expiration,match_expire_index,fee_fraction_int,status) VALUES('||old.rowid||','||quote(old.id)||','||quote(old.tx0_index)||','||quote(old.tx0_hash)||','||quote(old.tx0_address)||','||quote(old.tx1_index)||','||quote(old.tx1_hash)||','||quote(old.tx1_address)||','||quote(old.tx0_bet_type)||','||quote(old.tx1_bet_type)||','||quote(old.feed_address)||','||quote(old.initial_value)||','||quote(old.deadline)||','||quote(old.target_value)||','||quote(old.leverage)||','||quote(old.forward_quantity)||','||quote(old.backward_quantity)||','||quote(old.tx0_block_index)||','||quote(old.tx1_block_index)||','||quote(old.block_index)||','||quote(old.tx0_expiration)||','||quote(old.tx1_expiration)||','||quote(old.match_expire_index)||','||quote(old.fee_fraction_int)||','||quote(old.status)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9,v10,v11,v12,v13,v14,v15,v16,v17,v18,v19,v20,v21,v22,v23,v24) VALUES('bet_matches', 2, old.rowid, old.id,old.tx0_index,old.tx0_hash,old.tx0_address,old.tx1_index,old.tx1_hash,old.tx1_address,old.tx0_bet_type,old.tx1_bet_type,old.feed_address,old.initial_value,old.deadline,old.target_value,old.leverage,old.forward_quantity,old.backward_quantity,old.tx0_block_index,old.tx1_block_index,old.block_index,old.tx0_expiration,old.tx1_expiration,old.match_expire_index,old.fee_fraction_int,old.status);
+                                END;
 CREATE TRIGGER _bet_matches_insert AFTER INSERT ON bet_matches BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM bet_matches WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('bet_matches', 0, new.rowid);
                             END;
 CREATE TRIGGER _bet_matches_update AFTER UPDATE ON bet_matches BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE bet_matches SET id='||quote(old.id)||',tx0_index='||quote(old.tx0_index)||',tx0_hash='||quote(old.tx0_hash)||',tx0_address='||quote(old.tx0_address)||',tx1_index='||quote(old.tx1_index)||',tx1_hash='||quote(old.tx1_hash)||',tx1_address='||quote(old.tx1_address)||',tx0_bet_type='||quote(old.tx0_bet_type)||',tx1_bet_type='||quote(old.tx1_bet_type)||',feed_address='||quote(old.feed_address)||',initial_value='||quote(old.initial_value)||',deadline='||quote(old.deadline)||',target_value='||quote(old.target_value)||',leverage='||quote(old.leverage)||',forward_quantity='||quote(old.forward_quantity)||',backward_quantity='||quote(old.backward_quantity)||',tx0_block_index='||quote(old.tx0_block_index)||',tx1_block_index='||quote(old.tx1_block_index)||',block_index='||quote(old.block_index)||',tx0_expiration='||quote(old.tx0_expiration)||',tx1_expiration='||quote(old.tx1_expiration)||',match_expire_index='||quote(old.match_expire_index)||',fee_fraction_int='||quote(old.fee_fraction_int)||',status='||quote(old.status)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9,v10,v11,v12,v13,v14,v15,v16,v17,v18,v19,v20,v21,v22,v23,v24) VALUES('bet_matches', 1, old.rowid, old.id,old.tx0_index,old.tx0_hash,old.tx0_address,old.tx1_index,old.tx1_hash,old.tx1_address,old.tx0_bet_type,old.tx1_bet_type,old.feed_address,old.initial_value,old.deadline,old.target_value,old.leverage,old.forward_quantity,old.backward_quantity,old.tx0_block_index,old.tx1_block_index,old.block_index,old.tx0_expiration,old.tx1_expiration,old.match_expire_index,old.fee_fraction_int,old.status);
+                                END;
 CREATE INDEX valid_feed_idx ON bet_matches (feed_address, status);
 
 -- Table  bets
@@ -215,14 +215,14 @@ INSERT INTO bets VALUES(17,'e1f35692651c646ba75bbdf931aa9240e23711f221960865410a
 INSERT INTO bets VALUES(18,'dac4afb8fd0b05fd03635f95edd43fb2c8caf5e648c87dad32272f565714d1b9',310017,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',3,1388000200,650000000,0,750000000,0,1.0,5040,10,310027,99999999,'filled');
 -- Triggers and indices on  bets
 CREATE TRIGGER _bets_delete BEFORE DELETE ON bets BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO bets(rowid,tx_index,tx_hash,block_index,source,feed_address,bet_type,deadline,wager_quantity,wager_remaining,counterwager_quantity,counterwager_remaining,target_value,leverage,expiration,expire_index,fee_fraction_int,status) VALUES('||old.rowid||','||quote(old.tx_index)||','||quote(old.tx_hash)||','||quote(old.block_index)||','||quote(old.source)||','||quote(old.feed_address)||','||quote(old.bet_type)||','||quote(old.deadline)||','||quote(old.wager_quantity)||','||quote(old.wager_remaining)||','||quote(old.counterwager_quantity)||','||quote(old.counterwager_remaining)||','||quote(old.target_value)||','||quote(old.leverage)||','||quote(old.expiration)||','||quote(old.expire_index)||','||quote(old.fee_fraction_int)||','||quote(old.status)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9,v10,v11,v12,v13,v14,v15,v16,v17) VALUES('bets', 2, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.feed_address,old.bet_type,old.deadline,old.wager_quantity,old.wager_remaining,old.counterwager_quantity,old.counterwager_remaining,old.target_value,old.leverage,old.expiration,old.expire_index,old.fee_fraction_int,old.status);
+                                END;
 CREATE TRIGGER _bets_insert AFTER INSERT ON bets BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM bets WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('bets', 0, new.rowid);
                             END;
 CREATE TRIGGER _bets_update AFTER UPDATE ON bets BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE bets SET tx_index='||quote(old.tx_index)||',tx_hash='||quote(old.tx_hash)||',block_index='||quote(old.block_index)||',source='||quote(old.source)||',feed_address='||quote(old.feed_address)||',bet_type='||quote(old.bet_type)||',deadline='||quote(old.deadline)||',wager_quantity='||quote(old.wager_quantity)||',wager_remaining='||quote(old.wager_remaining)||',counterwager_quantity='||quote(old.counterwager_quantity)||',counterwager_remaining='||quote(old.counterwager_remaining)||',target_value='||quote(old.target_value)||',leverage='||quote(old.leverage)||',expiration='||quote(old.expiration)||',expire_index='||quote(old.expire_index)||',fee_fraction_int='||quote(old.fee_fraction_int)||',status='||quote(old.status)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9,v10,v11,v12,v13,v14,v15,v16,v17) VALUES('bets', 1, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.feed_address,old.bet_type,old.deadline,old.wager_quantity,old.wager_remaining,old.counterwager_quantity,old.counterwager_remaining,old.target_value,old.leverage,old.expiration,old.expire_index,old.fee_fraction_int,old.status);
+                                END;
 CREATE INDEX feed_valid_bettype_idx ON bets (feed_address, status, bet_type);
 
 -- Table  blocks
@@ -361,14 +361,14 @@ INSERT INTO broadcasts VALUES(20,'720f72ac87f58f8763cccee598dbd4e39c2f27f7e37aed
 INSERT INTO broadcasts VALUES(21,'6e29568b84864b47c5e677a8a32b4e5527998f9bc3f6cb9aedece456e267cd3c',310020,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',1388000201,2.0,5000000,'Unit Test',0,'valid');
 -- Triggers and indices on  broadcasts
 CREATE TRIGGER _broadcasts_delete BEFORE DELETE ON broadcasts BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO broadcasts(rowid,tx_index,tx_hash,block_index,source,timestamp,value,fee_fraction_int,text,locked,status) VALUES('||old.rowid||','||quote(old.tx_index)||','||quote(old.tx_hash)||','||quote(old.block_index)||','||quote(old.source)||','||quote(old.timestamp)||','||quote(old.value)||','||quote(old.fee_fraction_int)||','||quote(old.text)||','||quote(old.locked)||','||quote(old.status)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9,v10) VALUES('broadcasts', 2, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.timestamp,old.value,old.fee_fraction_int,old.text,old.locked,old.status);
+                                END;
 CREATE TRIGGER _broadcasts_insert AFTER INSERT ON broadcasts BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM broadcasts WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('broadcasts', 0, new.rowid);
                             END;
 CREATE TRIGGER _broadcasts_update AFTER UPDATE ON broadcasts BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE broadcasts SET tx_index='||quote(old.tx_index)||',tx_hash='||quote(old.tx_hash)||',block_index='||quote(old.block_index)||',source='||quote(old.source)||',timestamp='||quote(old.timestamp)||',value='||quote(old.value)||',fee_fraction_int='||quote(old.fee_fraction_int)||',text='||quote(old.text)||',locked='||quote(old.locked)||',status='||quote(old.status)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9,v10) VALUES('broadcasts', 1, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.timestamp,old.value,old.fee_fraction_int,old.text,old.locked,old.status);
+                                END;
 CREATE INDEX status_source_idx ON broadcasts (status, source);
 CREATE INDEX status_source_index_idx ON broadcasts (status, source, tx_index);
 CREATE INDEX timestamp_idx ON broadcasts (timestamp);
@@ -388,14 +388,14 @@ CREATE TABLE btcpays(
 INSERT INTO btcpays VALUES(5,'5a00de6476865f69b816639038b56d348e105a9ee9f7cfd741c42bc0841bec61',310004,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',50000000,'7a78df734fd910fcf9170d4af753c2ceda92974684b929ff595e6063ca5a2cf1_e75417825d1fe276bfb329960a3367c711dcb256aa2ed21da0f79a58120e2433','valid');
 -- Triggers and indices on  btcpays
 CREATE TRIGGER _btcpays_delete BEFORE DELETE ON btcpays BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO btcpays(rowid,tx_index,tx_hash,block_index,source,destination,btc_amount,order_match_id,status) VALUES('||old.rowid||','||quote(old.tx_index)||','||quote(old.tx_hash)||','||quote(old.block_index)||','||quote(old.source)||','||quote(old.destination)||','||quote(old.btc_amount)||','||quote(old.order_match_id)||','||quote(old.status)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8) VALUES('btcpays', 2, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.destination,old.btc_amount,old.order_match_id,old.status);
+                                END;
 CREATE TRIGGER _btcpays_insert AFTER INSERT ON btcpays BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM btcpays WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('btcpays', 0, new.rowid);
                             END;
 CREATE TRIGGER _btcpays_update AFTER UPDATE ON btcpays BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE btcpays SET tx_index='||quote(old.tx_index)||',tx_hash='||quote(old.tx_hash)||',block_index='||quote(old.block_index)||',source='||quote(old.source)||',destination='||quote(old.destination)||',btc_amount='||quote(old.btc_amount)||',order_match_id='||quote(old.order_match_id)||',status='||quote(old.status)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8) VALUES('btcpays', 1, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.destination,old.btc_amount,old.order_match_id,old.status);
+                                END;
 
 -- Table  burns
 DROP TABLE IF EXISTS burns;
@@ -412,14 +412,14 @@ INSERT INTO burns VALUES(1,'9b6b1abb696d8d1b70c5beed046d7cddd23cd95b69ef18946cb1
 INSERT INTO burns VALUES(23,'c81cd36f1efabd22f1a00923714fd5a5f1ba07852ef1f0763223563e3f55dfda',310022,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',38000000,56999887262,'valid');
 -- Triggers and indices on  burns
 CREATE TRIGGER _burns_delete BEFORE DELETE ON burns BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO burns(rowid,tx_index,tx_hash,block_index,source,burned,earned,status) VALUES('||old.rowid||','||quote(old.tx_index)||','||quote(old.tx_hash)||','||quote(old.block_index)||','||quote(old.source)||','||quote(old.burned)||','||quote(old.earned)||','||quote(old.status)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7) VALUES('burns', 2, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.burned,old.earned,old.status);
+                                END;
 CREATE TRIGGER _burns_insert AFTER INSERT ON burns BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM burns WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('burns', 0, new.rowid);
                             END;
 CREATE TRIGGER _burns_update AFTER UPDATE ON burns BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE burns SET tx_index='||quote(old.tx_index)||',tx_hash='||quote(old.tx_hash)||',block_index='||quote(old.block_index)||',source='||quote(old.source)||',burned='||quote(old.burned)||',earned='||quote(old.earned)||',status='||quote(old.status)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7) VALUES('burns', 1, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.burned,old.earned,old.status);
+                                END;
 
 -- Table  cancels
 DROP TABLE IF EXISTS cancels;
@@ -433,14 +433,14 @@ CREATE TABLE cancels(
                       FOREIGN KEY (tx_index, tx_hash, block_index) REFERENCES transactions(tx_index, tx_hash, block_index));
 -- Triggers and indices on  cancels
 CREATE TRIGGER _cancels_delete BEFORE DELETE ON cancels BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO cancels(rowid,tx_index,tx_hash,block_index,source,offer_hash,status) VALUES('||old.rowid||','||quote(old.tx_index)||','||quote(old.tx_hash)||','||quote(old.block_index)||','||quote(old.source)||','||quote(old.offer_hash)||','||quote(old.status)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6) VALUES('cancels', 2, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.offer_hash,old.status);
+                                END;
 CREATE TRIGGER _cancels_insert AFTER INSERT ON cancels BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM cancels WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('cancels', 0, new.rowid);
                             END;
 CREATE TRIGGER _cancels_update AFTER UPDATE ON cancels BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE cancels SET tx_index='||quote(old.tx_index)||',tx_hash='||quote(old.tx_hash)||',block_index='||quote(old.block_index)||',source='||quote(old.source)||',offer_hash='||quote(old.offer_hash)||',status='||quote(old.status)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6) VALUES('cancels', 1, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.offer_hash,old.status);
+                                END;
 CREATE INDEX cancels_block_index_idx ON cancels (block_index);
 
 -- Table  credits
@@ -481,14 +481,14 @@ INSERT INTO credits VALUES(310023,'1_mnfAHmddVibnZNSkh8DvKaQoiEfNsxjXzH_mtQheFaS
 INSERT INTO credits VALUES(310032,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','BBBB',50000000,'cancel order','9611941b4e1ce19312e3cb19847439ec1c4efc614f017ad72ac232ebf54739b3');
 -- Triggers and indices on  credits
 CREATE TRIGGER _credits_delete BEFORE DELETE ON credits BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO credits(rowid,block_index,address,asset,quantity,calling_function,event) VALUES('||old.rowid||','||quote(old.block_index)||','||quote(old.address)||','||quote(old.asset)||','||quote(old.quantity)||','||quote(old.calling_function)||','||quote(old.event)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6) VALUES('credits', 2, old.rowid, old.block_index,old.address,old.asset,old.quantity,old.calling_function,old.event);
+                                END;
 CREATE TRIGGER _credits_insert AFTER INSERT ON credits BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM credits WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('credits', 0, new.rowid);
                             END;
 CREATE TRIGGER _credits_update AFTER UPDATE ON credits BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE credits SET block_index='||quote(old.block_index)||',address='||quote(old.address)||',asset='||quote(old.asset)||',quantity='||quote(old.quantity)||',calling_function='||quote(old.calling_function)||',event='||quote(old.event)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6) VALUES('credits', 1, old.rowid, old.block_index,old.address,old.asset,old.quantity,old.calling_function,old.event);
+                                END;
 
 -- Table  debits
 DROP TABLE IF EXISTS debits;
@@ -520,14 +520,14 @@ INSERT INTO debits VALUES(310021,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSf
 INSERT INTO debits VALUES(310023,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','BBBC',10000,'send','d37210d41a23ada8baf982a85190a742f7de9901f585e99e30ed3c9694efb657');
 -- Triggers and indices on  debits
 CREATE TRIGGER _debits_delete BEFORE DELETE ON debits BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO debits(rowid,block_index,address,asset,quantity,action,event) VALUES('||old.rowid||','||quote(old.block_index)||','||quote(old.address)||','||quote(old.asset)||','||quote(old.quantity)||','||quote(old.action)||','||quote(old.event)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6) VALUES('debits', 2, old.rowid, old.block_index,old.address,old.asset,old.quantity,old.action,old.event);
+                                END;
 CREATE TRIGGER _debits_insert AFTER INSERT ON debits BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM debits WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('debits', 0, new.rowid);
                             END;
 CREATE TRIGGER _debits_update AFTER UPDATE ON debits BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE debits SET block_index='||quote(old.block_index)||',address='||quote(old.address)||',asset='||quote(old.asset)||',quantity='||quote(old.quantity)||',action='||quote(old.action)||',event='||quote(old.event)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6) VALUES('debits', 1, old.rowid, old.block_index,old.address,old.asset,old.quantity,old.action,old.event);
+                                END;
 CREATE INDEX address_idx ON debits (address);
 CREATE INDEX asset_idx ON debits (asset);
 
@@ -545,14 +545,14 @@ CREATE TABLE destructions(
                       FOREIGN KEY (tx_index, tx_hash, block_index) REFERENCES transactions(tx_index, tx_hash, block_index));
 -- Triggers and indices on  destructions
 CREATE TRIGGER _destructions_delete BEFORE DELETE ON destructions BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO destructions(rowid,tx_index,tx_hash,block_index,source,asset,quantity,tag,status) VALUES('||old.rowid||','||quote(old.tx_index)||','||quote(old.tx_hash)||','||quote(old.block_index)||','||quote(old.source)||','||quote(old.asset)||','||quote(old.quantity)||','||quote(old.tag)||','||quote(old.status)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8) VALUES('destructions', 2, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.asset,old.quantity,old.tag,old.status);
+                                END;
 CREATE TRIGGER _destructions_insert AFTER INSERT ON destructions BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM destructions WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('destructions', 0, new.rowid);
                             END;
 CREATE TRIGGER _destructions_update AFTER UPDATE ON destructions BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE destructions SET tx_index='||quote(old.tx_index)||',tx_hash='||quote(old.tx_hash)||',block_index='||quote(old.block_index)||',source='||quote(old.source)||',asset='||quote(old.asset)||',quantity='||quote(old.quantity)||',tag='||quote(old.tag)||',status='||quote(old.status)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8) VALUES('destructions', 1, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.asset,old.quantity,old.tag,old.status);
+                                END;
 CREATE INDEX status_idx ON destructions (status);
 
 -- Table  dispensers
@@ -571,14 +571,14 @@ CREATE TABLE dispensers(
                       FOREIGN KEY (tx_index, tx_hash, block_index) REFERENCES transactions(tx_index, tx_hash, block_index));
 -- Triggers and indices on  dispensers
 CREATE TRIGGER _dispensers_delete BEFORE DELETE ON dispensers BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO dispensers(rowid,tx_index,tx_hash,block_index,source,asset,give_quantity,escrow_quantity,satoshirate,status,give_remaining) VALUES('||old.rowid||','||quote(old.tx_index)||','||quote(old.tx_hash)||','||quote(old.block_index)||','||quote(old.source)||','||quote(old.asset)||','||quote(old.give_quantity)||','||quote(old.escrow_quantity)||','||quote(old.satoshirate)||','||quote(old.status)||','||quote(old.give_remaining)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9,v10) VALUES('dispensers', 2, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.asset,old.give_quantity,old.escrow_quantity,old.satoshirate,old.status,old.give_remaining);
+                                END;
 CREATE TRIGGER _dispensers_insert AFTER INSERT ON dispensers BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM dispensers WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('dispensers', 0, new.rowid);
                             END;
 CREATE TRIGGER _dispensers_update AFTER UPDATE ON dispensers BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE dispensers SET tx_index='||quote(old.tx_index)||',tx_hash='||quote(old.tx_hash)||',block_index='||quote(old.block_index)||',source='||quote(old.source)||',asset='||quote(old.asset)||',give_quantity='||quote(old.give_quantity)||',escrow_quantity='||quote(old.escrow_quantity)||',satoshirate='||quote(old.satoshirate)||',status='||quote(old.status)||',give_remaining='||quote(old.give_remaining)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9,v10) VALUES('dispensers', 1, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.asset,old.give_quantity,old.escrow_quantity,old.satoshirate,old.status,old.give_remaining);
+                                END;
 
 -- Table  dispenses
 DROP TABLE IF EXISTS dispenses;
@@ -596,14 +596,14 @@ CREATE TABLE dispenses(
                       FOREIGN KEY (tx_index, tx_hash, block_index) REFERENCES transactions(tx_index, tx_hash, block_index));
 -- Triggers and indices on  dispenses
 CREATE TRIGGER _dispenses_delete BEFORE DELETE ON dispenses BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO dispenses(rowid,tx_index,dispense_index,tx_hash,block_index,source,destination,asset,dispense_quantity,dispenser_tx_hash) VALUES('||old.rowid||','||quote(old.tx_index)||','||quote(old.dispense_index)||','||quote(old.tx_hash)||','||quote(old.block_index)||','||quote(old.source)||','||quote(old.destination)||','||quote(old.asset)||','||quote(old.dispense_quantity)||','||quote(old.dispenser_tx_hash)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9) VALUES('dispenses', 2, old.rowid, old.tx_index,old.dispense_index,old.tx_hash,old.block_index,old.source,old.destination,old.asset,old.dispense_quantity,old.dispenser_tx_hash);
+                                END;
 CREATE TRIGGER _dispenses_insert AFTER INSERT ON dispenses BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM dispenses WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('dispenses', 0, new.rowid);
                             END;
 CREATE TRIGGER _dispenses_update AFTER UPDATE ON dispenses BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE dispenses SET tx_index='||quote(old.tx_index)||',dispense_index='||quote(old.dispense_index)||',tx_hash='||quote(old.tx_hash)||',block_index='||quote(old.block_index)||',source='||quote(old.source)||',destination='||quote(old.destination)||',asset='||quote(old.asset)||',dispense_quantity='||quote(old.dispense_quantity)||',dispenser_tx_hash='||quote(old.dispenser_tx_hash)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9) VALUES('dispenses', 1, old.rowid, old.tx_index,old.dispense_index,old.tx_hash,old.block_index,old.source,old.destination,old.asset,old.dispense_quantity,old.dispenser_tx_hash);
+                                END;
 
 -- Table  dividends
 DROP TABLE IF EXISTS dividends;
@@ -622,14 +622,14 @@ INSERT INTO dividends VALUES(10,'6034362e83be4663c7782fd2f4695d672656a7c78e89a47
 INSERT INTO dividends VALUES(11,'462fcf127cd185723fd0027955f8749e9cfe6c20ebdfc997ff626ab2cae93087',310010,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','BBBC','XCP',800,20000,'valid');
 -- Triggers and indices on  dividends
 CREATE TRIGGER _dividends_delete BEFORE DELETE ON dividends BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO dividends(rowid,tx_index,tx_hash,block_index,source,asset,dividend_asset,quantity_per_unit,fee_paid,status) VALUES('||old.rowid||','||quote(old.tx_index)||','||quote(old.tx_hash)||','||quote(old.block_index)||','||quote(old.source)||','||quote(old.asset)||','||quote(old.dividend_asset)||','||quote(old.quantity_per_unit)||','||quote(old.fee_paid)||','||quote(old.status)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9) VALUES('dividends', 2, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.asset,old.dividend_asset,old.quantity_per_unit,old.fee_paid,old.status);
+                                END;
 CREATE TRIGGER _dividends_insert AFTER INSERT ON dividends BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM dividends WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('dividends', 0, new.rowid);
                             END;
 CREATE TRIGGER _dividends_update AFTER UPDATE ON dividends BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE dividends SET tx_index='||quote(old.tx_index)||',tx_hash='||quote(old.tx_hash)||',block_index='||quote(old.block_index)||',source='||quote(old.source)||',asset='||quote(old.asset)||',dividend_asset='||quote(old.dividend_asset)||',quantity_per_unit='||quote(old.quantity_per_unit)||',fee_paid='||quote(old.fee_paid)||',status='||quote(old.status)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9) VALUES('dividends', 1, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.asset,old.dividend_asset,old.quantity_per_unit,old.fee_paid,old.status);
+                                END;
 
 -- Table  issuances
 DROP TABLE IF EXISTS issuances;
@@ -659,14 +659,14 @@ INSERT INTO issuances VALUES(6,'59c87f1f8a28eece244652b6284b40681a2620bfae8b58c3
 INSERT INTO issuances VALUES(7,'6573e8856c4451ae0b0fa39453dc25be1050599a1473933b57b0c093d63e6291',0,310006,'BBBC',100000,0,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',0,0,0,0.0,'foobar',50000000,0,'valid',NULL);
 -- Triggers and indices on  issuances
 CREATE TRIGGER _issuances_delete BEFORE DELETE ON issuances BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO issuances(rowid,tx_index,tx_hash,msg_index,block_index,asset,quantity,divisible,source,issuer,transfer,callable,call_date,call_price,description,fee_paid,locked,status,asset_longname) VALUES('||old.rowid||','||quote(old.tx_index)||','||quote(old.tx_hash)||','||quote(old.msg_index)||','||quote(old.block_index)||','||quote(old.asset)||','||quote(old.quantity)||','||quote(old.divisible)||','||quote(old.source)||','||quote(old.issuer)||','||quote(old.transfer)||','||quote(old.callable)||','||quote(old.call_date)||','||quote(old.call_price)||','||quote(old.description)||','||quote(old.fee_paid)||','||quote(old.locked)||','||quote(old.status)||','||quote(old.asset_longname)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9,v10,v11,v12,v13,v14,v15,v16,v17,v18) VALUES('issuances', 2, old.rowid, old.tx_index,old.tx_hash,old.msg_index,old.block_index,old.asset,old.quantity,old.divisible,old.source,old.issuer,old.transfer,old.callable,old.call_date,old.call_price,old.description,old.fee_paid,old.locked,old.status,old.asset_longname);
+                                END;
 CREATE TRIGGER _issuances_insert AFTER INSERT ON issuances BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM issuances WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('issuances', 0, new.rowid);
                             END;
 CREATE TRIGGER _issuances_update AFTER UPDATE ON issuances BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE issuances SET tx_index='||quote(old.tx_index)||',tx_hash='||quote(old.tx_hash)||',msg_index='||quote(old.msg_index)||',block_index='||quote(old.block_index)||',asset='||quote(old.asset)||',quantity='||quote(old.quantity)||',divisible='||quote(old.divisible)||',source='||quote(old.source)||',issuer='||quote(old.issuer)||',transfer='||quote(old.transfer)||',callable='||quote(old.callable)||',call_date='||quote(old.call_date)||',call_price='||quote(old.call_price)||',description='||quote(old.description)||',fee_paid='||quote(old.fee_paid)||',locked='||quote(old.locked)||',status='||quote(old.status)||',asset_longname='||quote(old.asset_longname)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9,v10,v11,v12,v13,v14,v15,v16,v17,v18) VALUES('issuances', 1, old.rowid, old.tx_index,old.tx_hash,old.msg_index,old.block_index,old.asset,old.quantity,old.divisible,old.source,old.issuer,old.transfer,old.callable,old.call_date,old.call_price,old.description,old.fee_paid,old.locked,old.status,old.asset_longname);
+                                END;
 CREATE INDEX valid_asset_idx ON issuances (asset, status);
 
 -- Table  mempool
@@ -799,14 +799,14 @@ INSERT INTO order_expirations VALUES(4,'e75417825d1fe276bfb329960a3367c711dcb256
 INSERT INTO order_expirations VALUES(22,'9611941b4e1ce19312e3cb19847439ec1c4efc614f017ad72ac232ebf54739b3','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',310032);
 -- Triggers and indices on  order_expirations
 CREATE TRIGGER _order_expirations_delete BEFORE DELETE ON order_expirations BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO order_expirations(rowid,order_index,order_hash,source,block_index) VALUES('||old.rowid||','||quote(old.order_index)||','||quote(old.order_hash)||','||quote(old.source)||','||quote(old.block_index)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4) VALUES('order_expirations', 2, old.rowid, old.order_index,old.order_hash,old.source,old.block_index);
+                                END;
 CREATE TRIGGER _order_expirations_insert AFTER INSERT ON order_expirations BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM order_expirations WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('order_expirations', 0, new.rowid);
                             END;
 CREATE TRIGGER _order_expirations_update AFTER UPDATE ON order_expirations BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE order_expirations SET order_index='||quote(old.order_index)||',order_hash='||quote(old.order_hash)||',source='||quote(old.source)||',block_index='||quote(old.block_index)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4) VALUES('order_expirations', 1, old.rowid, old.order_index,old.order_hash,old.source,old.block_index);
+                                END;
 
 -- Table  order_match_expirations
 DROP TABLE IF EXISTS order_match_expirations;
@@ -819,14 +819,14 @@ CREATE TABLE order_match_expirations(
                       FOREIGN KEY (block_index) REFERENCES blocks(block_index));
 -- Triggers and indices on  order_match_expirations
 CREATE TRIGGER _order_match_expirations_delete BEFORE DELETE ON order_match_expirations BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO order_match_expirations(rowid,order_match_id,tx0_address,tx1_address,block_index) VALUES('||old.rowid||','||quote(old.order_match_id)||','||quote(old.tx0_address)||','||quote(old.tx1_address)||','||quote(old.block_index)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4) VALUES('order_match_expirations', 2, old.rowid, old.order_match_id,old.tx0_address,old.tx1_address,old.block_index);
+                                END;
 CREATE TRIGGER _order_match_expirations_insert AFTER INSERT ON order_match_expirations BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM order_match_expirations WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('order_match_expirations', 0, new.rowid);
                             END;
 CREATE TRIGGER _order_match_expirations_update AFTER UPDATE ON order_match_expirations BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE order_match_expirations SET order_match_id='||quote(old.order_match_id)||',tx0_address='||quote(old.tx0_address)||',tx1_address='||quote(old.tx1_address)||',block_index='||quote(old.block_index)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4) VALUES('order_match_expirations', 1, old.rowid, old.order_match_id,old.tx0_address,old.tx1_address,old.block_index);
+                                END;
 
 -- Table  order_matches
 DROP TABLE IF EXISTS order_matches;
@@ -855,14 +855,14 @@ CREATE TABLE order_matches(
 INSERT INTO order_matches VALUES('7a78df734fd910fcf9170d4af753c2ceda92974684b929ff595e6063ca5a2cf1_e75417825d1fe276bfb329960a3367c711dcb256aa2ed21da0f79a58120e2433',3,'7a78df734fd910fcf9170d4af753c2ceda92974684b929ff595e6063ca5a2cf1','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',4,'e75417825d1fe276bfb329960a3367c711dcb256aa2ed21da0f79a58120e2433','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','BTC',50000000,'XCP',100000000,310002,310003,310003,10,10,310023,857142,'completed');
 -- Triggers and indices on  order_matches
 CREATE TRIGGER _order_matches_delete BEFORE DELETE ON order_matches BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO order_matches(rowid,id,tx0_index,tx0_hash,tx0_address,tx1_index,tx1_hash,tx1_address,forward_asset,forward_quantity,backward_asset,backward_quantity,tx0_block_index,tx1_block_index,block_index,tx0_expiration,tx1_expiration,match_expire_index,fee_paid,status) VALUES('||old.rowid||','||quote(old.id)||','||quote(old.tx0_index)||','||quote(old.tx0_hash)||','||quote(old.tx0_address)||','||quote(old.tx1_index)||','||quote(old.tx1_hash)||','||quote(old.tx1_address)||','||quote(old.forward_asset)||','||quote(old.forward_quantity)||','||quote(old.backward_asset)||','||quote(old.backward_quantity)||','||quote(old.tx0_block_index)||','||quote(old.tx1_block_index)||','||quote(old.block_index)||','||quote(old.tx0_expiration)||','||quote(old.tx1_expiration)||','||quote(old.match_expire_index)||','||quote(old.fee_paid)||','||quote(old.status)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9,v10,v11,v12,v13,v14,v15,v16,v17,v18,v19) VALUES('order_matches', 2, old.rowid, old.id,old.tx0_index,old.tx0_hash,old.tx0_address,old.tx1_index,old.tx1_hash,old.tx1_address,old.forward_asset,old.forward_quantity,old.backward_asset,old.backward_quantity,old.tx0_block_index,old.tx1_block_index,old.block_index,old.tx0_expiration,old.tx1_expiration,old.match_expire_index,old.fee_paid,old.status);
+                                END;
 CREATE TRIGGER _order_matches_insert AFTER INSERT ON order_matches BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM order_matches WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('order_matches', 0, new.rowid);
                             END;
 CREATE TRIGGER _order_matches_update AFTER UPDATE ON order_matches BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE order_matches SET id='||quote(old.id)||',tx0_index='||quote(old.tx0_index)||',tx0_hash='||quote(old.tx0_hash)||',tx0_address='||quote(old.tx0_address)||',tx1_index='||quote(old.tx1_index)||',tx1_hash='||quote(old.tx1_hash)||',tx1_address='||quote(old.tx1_address)||',forward_asset='||quote(old.forward_asset)||',forward_quantity='||quote(old.forward_quantity)||',backward_asset='||quote(old.backward_asset)||',backward_quantity='||quote(old.backward_quantity)||',tx0_block_index='||quote(old.tx0_block_index)||',tx1_block_index='||quote(old.tx1_block_index)||',block_index='||quote(old.block_index)||',tx0_expiration='||quote(old.tx0_expiration)||',tx1_expiration='||quote(old.tx1_expiration)||',match_expire_index='||quote(old.match_expire_index)||',fee_paid='||quote(old.fee_paid)||',status='||quote(old.status)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9,v10,v11,v12,v13,v14,v15,v16,v17,v18,v19) VALUES('order_matches', 1, old.rowid, old.id,old.tx0_index,old.tx0_hash,old.tx0_address,old.tx1_index,old.tx1_hash,old.tx1_address,old.forward_asset,old.forward_quantity,old.backward_asset,old.backward_quantity,old.tx0_block_index,old.tx1_block_index,old.block_index,old.tx0_expiration,old.tx1_expiration,old.match_expire_index,old.fee_paid,old.status);
+                                END;
 CREATE INDEX backward_status_idx ON order_matches (backward_asset, status);
 CREATE INDEX forward_status_idx ON order_matches (forward_asset, status);
 CREATE INDEX match_expire_idx ON order_matches (status, match_expire_index);
@@ -896,14 +896,14 @@ INSERT INTO orders VALUES(4,'e75417825d1fe276bfb329960a3367c711dcb256aa2ed21da0f
 INSERT INTO orders VALUES(22,'9611941b4e1ce19312e3cb19847439ec1c4efc614f017ad72ac232ebf54739b3',310021,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','BBBB',50000000,50000000,'XCP',50000000,50000000,10,310031,0,0,6800,6800,'expired');
 -- Triggers and indices on  orders
 CREATE TRIGGER _orders_delete BEFORE DELETE ON orders BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO orders(rowid,tx_index,tx_hash,block_index,source,give_asset,give_quantity,give_remaining,get_asset,get_quantity,get_remaining,expiration,expire_index,fee_required,fee_required_remaining,fee_provided,fee_provided_remaining,status) VALUES('||old.rowid||','||quote(old.tx_index)||','||quote(old.tx_hash)||','||quote(old.block_index)||','||quote(old.source)||','||quote(old.give_asset)||','||quote(old.give_quantity)||','||quote(old.give_remaining)||','||quote(old.get_asset)||','||quote(old.get_quantity)||','||quote(old.get_remaining)||','||quote(old.expiration)||','||quote(old.expire_index)||','||quote(old.fee_required)||','||quote(old.fee_required_remaining)||','||quote(old.fee_provided)||','||quote(old.fee_provided_remaining)||','||quote(old.status)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9,v10,v11,v12,v13,v14,v15,v16,v17) VALUES('orders', 2, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.give_asset,old.give_quantity,old.give_remaining,old.get_asset,old.get_quantity,old.get_remaining,old.expiration,old.expire_index,old.fee_required,old.fee_required_remaining,old.fee_provided,old.fee_provided_remaining,old.status);
+                                END;
 CREATE TRIGGER _orders_insert AFTER INSERT ON orders BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM orders WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('orders', 0, new.rowid);
                             END;
 CREATE TRIGGER _orders_update AFTER UPDATE ON orders BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE orders SET tx_index='||quote(old.tx_index)||',tx_hash='||quote(old.tx_hash)||',block_index='||quote(old.block_index)||',source='||quote(old.source)||',give_asset='||quote(old.give_asset)||',give_quantity='||quote(old.give_quantity)||',give_remaining='||quote(old.give_remaining)||',get_asset='||quote(old.get_asset)||',get_quantity='||quote(old.get_quantity)||',get_remaining='||quote(old.get_remaining)||',expiration='||quote(old.expiration)||',expire_index='||quote(old.expire_index)||',fee_required='||quote(old.fee_required)||',fee_required_remaining='||quote(old.fee_required_remaining)||',fee_provided='||quote(old.fee_provided)||',fee_provided_remaining='||quote(old.fee_provided_remaining)||',status='||quote(old.status)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9,v10,v11,v12,v13,v14,v15,v16,v17) VALUES('orders', 1, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.give_asset,old.give_quantity,old.give_remaining,old.get_asset,old.get_quantity,old.get_remaining,old.expiration,old.expire_index,old.fee_required,old.fee_required_remaining,old.fee_provided,old.fee_provided_remaining,old.status);
+                                END;
 CREATE INDEX expire_idx ON orders (expire_index, status);
 CREATE INDEX give_asset_idx ON orders (give_asset);
 CREATE INDEX give_get_status_idx ON orders (get_asset, give_asset, status);
@@ -927,14 +927,14 @@ CREATE TABLE rps(
                       PRIMARY KEY (tx_index, tx_hash));
 -- Triggers and indices on  rps
 CREATE TRIGGER _rps_delete BEFORE DELETE ON rps BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO rps(rowid,tx_index,tx_hash,block_index,source,possible_moves,wager,move_random_hash,expiration,expire_index,status) VALUES('||old.rowid||','||quote(old.tx_index)||','||quote(old.tx_hash)||','||quote(old.block_index)||','||quote(old.source)||','||quote(old.possible_moves)||','||quote(old.wager)||','||quote(old.move_random_hash)||','||quote(old.expiration)||','||quote(old.expire_index)||','||quote(old.status)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9,v10) VALUES('rps', 2, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.possible_moves,old.wager,old.move_random_hash,old.expiration,old.expire_index,old.status);
+                                END;
 CREATE TRIGGER _rps_insert AFTER INSERT ON rps BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM rps WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('rps', 0, new.rowid);
                             END;
 CREATE TRIGGER _rps_update AFTER UPDATE ON rps BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE rps SET tx_index='||quote(old.tx_index)||',tx_hash='||quote(old.tx_hash)||',block_index='||quote(old.block_index)||',source='||quote(old.source)||',possible_moves='||quote(old.possible_moves)||',wager='||quote(old.wager)||',move_random_hash='||quote(old.move_random_hash)||',expiration='||quote(old.expiration)||',expire_index='||quote(old.expire_index)||',status='||quote(old.status)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9,v10) VALUES('rps', 1, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.possible_moves,old.wager,old.move_random_hash,old.expiration,old.expire_index,old.status);
+                                END;
 CREATE INDEX matching_idx ON rps (wager, possible_moves);
 
 -- Table  rps_expirations
@@ -948,14 +948,14 @@ CREATE TABLE rps_expirations(
                       FOREIGN KEY (rps_index, rps_hash) REFERENCES rps(tx_index, tx_hash));
 -- Triggers and indices on  rps_expirations
 CREATE TRIGGER _rps_expirations_delete BEFORE DELETE ON rps_expirations BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO rps_expirations(rowid,rps_index,rps_hash,source,block_index) VALUES('||old.rowid||','||quote(old.rps_index)||','||quote(old.rps_hash)||','||quote(old.source)||','||quote(old.block_index)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4) VALUES('rps_expirations', 2, old.rowid, old.rps_index,old.rps_hash,old.source,old.block_index);
+                                END;
 CREATE TRIGGER _rps_expirations_insert AFTER INSERT ON rps_expirations BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM rps_expirations WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('rps_expirations', 0, new.rowid);
                             END;
 CREATE TRIGGER _rps_expirations_update AFTER UPDATE ON rps_expirations BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE rps_expirations SET rps_index='||quote(old.rps_index)||',rps_hash='||quote(old.rps_hash)||',source='||quote(old.source)||',block_index='||quote(old.block_index)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4) VALUES('rps_expirations', 1, old.rowid, old.rps_index,old.rps_hash,old.source,old.block_index);
+                                END;
 
 -- Table  rps_match_expirations
 DROP TABLE IF EXISTS rps_match_expirations;
@@ -968,14 +968,14 @@ CREATE TABLE rps_match_expirations(
                       FOREIGN KEY (block_index) REFERENCES blocks(block_index));
 -- Triggers and indices on  rps_match_expirations
 CREATE TRIGGER _rps_match_expirations_delete BEFORE DELETE ON rps_match_expirations BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO rps_match_expirations(rowid,rps_match_id,tx0_address,tx1_address,block_index) VALUES('||old.rowid||','||quote(old.rps_match_id)||','||quote(old.tx0_address)||','||quote(old.tx1_address)||','||quote(old.block_index)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4) VALUES('rps_match_expirations', 2, old.rowid, old.rps_match_id,old.tx0_address,old.tx1_address,old.block_index);
+                                END;
 CREATE TRIGGER _rps_match_expirations_insert AFTER INSERT ON rps_match_expirations BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM rps_match_expirations WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('rps_match_expirations', 0, new.rowid);
                             END;
 CREATE TRIGGER _rps_match_expirations_update AFTER UPDATE ON rps_match_expirations BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE rps_match_expirations SET rps_match_id='||quote(old.rps_match_id)||',tx0_address='||quote(old.tx0_address)||',tx1_address='||quote(old.tx1_address)||',block_index='||quote(old.block_index)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4) VALUES('rps_match_expirations', 1, old.rowid, old.rps_match_id,old.tx0_address,old.tx1_address,old.block_index);
+                                END;
 
 -- Table  rps_matches
 DROP TABLE IF EXISTS rps_matches;
@@ -1002,14 +1002,14 @@ CREATE TABLE rps_matches(
                       FOREIGN KEY (tx1_index, tx1_hash, tx1_block_index) REFERENCES transactions(tx_index, tx_hash, block_index));
 -- Triggers and indices on  rps_matches
 CREATE TRIGGER _rps_matches_delete BEFORE DELETE ON rps_matches BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO rps_matches(rowid,id,tx0_index,tx0_hash,tx0_address,tx1_index,tx1_hash,tx1_address,tx0_move_random_hash,tx1_move_random_hash,wager,possible_moves,tx0_block_index,tx1_block_index,block_index,tx0_expiration,tx1_expiration,match_expire_index,status) VALUES('||old.rowid||','||quote(old.id)||','||quote(old.tx0_index)||','||quote(old.tx0_hash)||','||quote(old.tx0_address)||','||quote(old.tx1_index)||','||quote(old.tx1_hash)||','||quote(old.tx1_address)||','||quote(old.tx0_move_random_hash)||','||quote(old.tx1_move_random_hash)||','||quote(old.wager)||','||quote(old.possible_moves)||','||quote(old.tx0_block_index)||','||quote(old.tx1_block_index)||','||quote(old.block_index)||','||quote(old.tx0_expiration)||','||quote(old.tx1_expiration)||','||quote(old.match_expire_index)||','||quote(old.status)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9,v10,v11,v12,v13,v14,v15,v16,v17,v18) VALUES('rps_matches', 2, old.rowid, old.id,old.tx0_index,old.tx0_hash,old.tx0_address,old.tx1_index,old.tx1_hash,old.tx1_address,old.tx0_move_random_hash,old.tx1_move_random_hash,old.wager,old.possible_moves,old.tx0_block_index,old.tx1_block_index,old.block_index,old.tx0_expiration,old.tx1_expiration,old.match_expire_index,old.status);
+                                END;
 CREATE TRIGGER _rps_matches_insert AFTER INSERT ON rps_matches BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM rps_matches WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('rps_matches', 0, new.rowid);
                             END;
 CREATE TRIGGER _rps_matches_update AFTER UPDATE ON rps_matches BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE rps_matches SET id='||quote(old.id)||',tx0_index='||quote(old.tx0_index)||',tx0_hash='||quote(old.tx0_hash)||',tx0_address='||quote(old.tx0_address)||',tx1_index='||quote(old.tx1_index)||',tx1_hash='||quote(old.tx1_hash)||',tx1_address='||quote(old.tx1_address)||',tx0_move_random_hash='||quote(old.tx0_move_random_hash)||',tx1_move_random_hash='||quote(old.tx1_move_random_hash)||',wager='||quote(old.wager)||',possible_moves='||quote(old.possible_moves)||',tx0_block_index='||quote(old.tx0_block_index)||',tx1_block_index='||quote(old.tx1_block_index)||',block_index='||quote(old.block_index)||',tx0_expiration='||quote(old.tx0_expiration)||',tx1_expiration='||quote(old.tx1_expiration)||',match_expire_index='||quote(old.match_expire_index)||',status='||quote(old.status)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9,v10,v11,v12,v13,v14,v15,v16,v17,v18) VALUES('rps_matches', 1, old.rowid, old.id,old.tx0_index,old.tx0_hash,old.tx0_address,old.tx1_index,old.tx1_hash,old.tx1_address,old.tx0_move_random_hash,old.tx1_move_random_hash,old.wager,old.possible_moves,old.tx0_block_index,old.tx1_block_index,old.block_index,old.tx0_expiration,old.tx1_expiration,old.match_expire_index,old.status);
+                                END;
 CREATE INDEX rps_match_expire_idx ON rps_matches (status, match_expire_index);
 CREATE INDEX rps_tx0_address_idx ON rps_matches (tx0_address);
 CREATE INDEX rps_tx1_address_idx ON rps_matches (tx1_address);
@@ -1028,14 +1028,14 @@ CREATE TABLE rpsresolves(
                       FOREIGN KEY (tx_index, tx_hash, block_index) REFERENCES transactions(tx_index, tx_hash, block_index));
 -- Triggers and indices on  rpsresolves
 CREATE TRIGGER _rpsresolves_delete BEFORE DELETE ON rpsresolves BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO rpsresolves(rowid,tx_index,tx_hash,block_index,source,move,random,rps_match_id,status) VALUES('||old.rowid||','||quote(old.tx_index)||','||quote(old.tx_hash)||','||quote(old.block_index)||','||quote(old.source)||','||quote(old.move)||','||quote(old.random)||','||quote(old.rps_match_id)||','||quote(old.status)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8) VALUES('rpsresolves', 2, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.move,old.random,old.rps_match_id,old.status);
+                                END;
 CREATE TRIGGER _rpsresolves_insert AFTER INSERT ON rpsresolves BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM rpsresolves WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('rpsresolves', 0, new.rowid);
                             END;
 CREATE TRIGGER _rpsresolves_update AFTER UPDATE ON rpsresolves BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE rpsresolves SET tx_index='||quote(old.tx_index)||',tx_hash='||quote(old.tx_hash)||',block_index='||quote(old.block_index)||',source='||quote(old.source)||',move='||quote(old.move)||',random='||quote(old.random)||',rps_match_id='||quote(old.rps_match_id)||',status='||quote(old.status)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8) VALUES('rpsresolves', 1, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.move,old.random,old.rps_match_id,old.status);
+                                END;
 CREATE INDEX rps_match_id_idx ON rpsresolves (rps_match_id);
 
 -- Table  sends
@@ -1059,14 +1059,14 @@ INSERT INTO sends VALUES(9,'1935e06458e6ab179a84307d47dcd442e0b2e1c172c5fb929eaf
 INSERT INTO sends VALUES(24,'d37210d41a23ada8baf982a85190a742f7de9901f585e99e30ed3c9694efb657',310023,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','1_mnfAHmddVibnZNSkh8DvKaQoiEfNsxjXzH_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','BBBC',10000,'valid',0,NULL);
 -- Triggers and indices on  sends
 CREATE TRIGGER _sends_delete BEFORE DELETE ON sends BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO sends(rowid,tx_index,tx_hash,block_index,source,destination,asset,quantity,status,msg_index,memo) VALUES('||old.rowid||','||quote(old.tx_index)||','||quote(old.tx_hash)||','||quote(old.block_index)||','||quote(old.source)||','||quote(old.destination)||','||quote(old.asset)||','||quote(old.quantity)||','||quote(old.status)||','||quote(old.msg_index)||','||quote(old.memo)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9,v10) VALUES('sends', 2, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.destination,old.asset,old.quantity,old.status,old.msg_index,old.memo);
+                                END;
 CREATE TRIGGER _sends_insert AFTER INSERT ON sends BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM sends WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('sends', 0, new.rowid);
                             END;
 CREATE TRIGGER _sends_update AFTER UPDATE ON sends BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE sends SET tx_index='||quote(old.tx_index)||',tx_hash='||quote(old.tx_hash)||',block_index='||quote(old.block_index)||',source='||quote(old.source)||',destination='||quote(old.destination)||',asset='||quote(old.asset)||',quantity='||quote(old.quantity)||',status='||quote(old.status)||',msg_index='||quote(old.msg_index)||',memo='||quote(old.memo)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9,v10) VALUES('sends', 1, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.destination,old.asset,old.quantity,old.status,old.msg_index,old.memo);
+                                END;
 CREATE INDEX destination_idx ON sends (destination);
 CREATE INDEX memo_idx ON sends (memo);
 CREATE INDEX source_idx ON sends (source);
@@ -1086,14 +1086,14 @@ CREATE TABLE sweeps(
                       FOREIGN KEY (tx_index, tx_hash, block_index) REFERENCES transactions(tx_index, tx_hash, block_index));
 -- Triggers and indices on  sweeps
 CREATE TRIGGER _sweeps_delete BEFORE DELETE ON sweeps BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO sweeps(rowid,tx_index,tx_hash,block_index,source,destination,flags,status,memo,fee_paid) VALUES('||old.rowid||','||quote(old.tx_index)||','||quote(old.tx_hash)||','||quote(old.block_index)||','||quote(old.source)||','||quote(old.destination)||','||quote(old.flags)||','||quote(old.status)||','||quote(old.memo)||','||quote(old.fee_paid)||')');
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9) VALUES('sweeps', 2, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.destination,old.flags,old.status,old.memo,old.fee_paid);
+                                END;
 CREATE TRIGGER _sweeps_insert AFTER INSERT ON sweeps BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM sweeps WHERE rowid='||new.rowid);
+                            INSERT INTO undolog(table_name, op, row_id) VALUES('sweeps', 0, new.rowid);
                             END;
 CREATE TRIGGER _sweeps_update AFTER UPDATE ON sweeps BEGIN
-                            INSERT INTO undolog VALUES(NULL, 'UPDATE sweeps SET tx_index='||quote(old.tx_index)||',tx_hash='||quote(old.tx_hash)||',block_index='||quote(old.block_index)||',source='||quote(old.source)||',destination='||quote(old.destination)||',flags='||quote(old.flags)||',status='||quote(old.status)||',memo='||quote(old.memo)||',fee_paid='||quote(old.fee_paid)||' WHERE rowid='||old.rowid);
-                            END;
+                                INSERT INTO undolog(table_name, op, row_id, v1,v2,v3,v4,v5,v6,v7,v8,v9) VALUES('sweeps', 1, old.rowid, old.tx_index,old.tx_hash,old.block_index,old.source,old.destination,old.flags,old.status,old.memo,old.fee_paid);
+                                END;
 
 -- Table  transactions
 DROP TABLE IF EXISTS transactions;
@@ -1145,145 +1145,147 @@ CREATE INDEX tx_index_idx ON transactions (tx_index);
 DROP TABLE IF EXISTS undolog;
 CREATE TABLE undolog(
                         undo_index INTEGER PRIMARY KEY AUTOINCREMENT,
-                        sql TEXT);
-INSERT INTO undolog VALUES(4,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=93000000000 WHERE rowid=1');
-INSERT INTO undolog VALUES(5,'DELETE FROM debits WHERE rowid=1');
-INSERT INTO undolog VALUES(6,'DELETE FROM balances WHERE rowid=2');
-INSERT INTO undolog VALUES(7,'DELETE FROM credits WHERE rowid=2');
-INSERT INTO undolog VALUES(8,'DELETE FROM sends WHERE rowid=1');
-INSERT INTO undolog VALUES(9,'DELETE FROM orders WHERE rowid=1');
-INSERT INTO undolog VALUES(10,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=92950000000 WHERE rowid=1');
-INSERT INTO undolog VALUES(11,'DELETE FROM debits WHERE rowid=2');
-INSERT INTO undolog VALUES(12,'DELETE FROM orders WHERE rowid=2');
-INSERT INTO undolog VALUES(13,'UPDATE orders SET tx_index=3,tx_hash=''7a78df734fd910fcf9170d4af753c2ceda92974684b929ff595e6063ca5a2cf1'',block_index=310002,source=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',give_asset=''BTC'',give_quantity=50000000,give_remaining=50000000,get_asset=''XCP'',get_quantity=100000000,get_remaining=100000000,expiration=10,expire_index=310012,fee_required=0,fee_required_remaining=0,fee_provided=1000000,fee_provided_remaining=1000000,status=''open'' WHERE rowid=1');
-INSERT INTO undolog VALUES(14,'UPDATE orders SET tx_index=4,tx_hash=''e75417825d1fe276bfb329960a3367c711dcb256aa2ed21da0f79a58120e2433'',block_index=310003,source=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',give_asset=''XCP'',give_quantity=105000000,give_remaining=105000000,get_asset=''BTC'',get_quantity=50000000,get_remaining=50000000,expiration=10,expire_index=310013,fee_required=900000,fee_required_remaining=900000,fee_provided=6800,fee_provided_remaining=6800,status=''open'' WHERE rowid=2');
-INSERT INTO undolog VALUES(15,'DELETE FROM order_matches WHERE rowid=1');
-INSERT INTO undolog VALUES(16,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=92845000000 WHERE rowid=1');
-INSERT INTO undolog VALUES(17,'DELETE FROM credits WHERE rowid=3');
-INSERT INTO undolog VALUES(18,'UPDATE order_matches SET id=''7a78df734fd910fcf9170d4af753c2ceda92974684b929ff595e6063ca5a2cf1_e75417825d1fe276bfb329960a3367c711dcb256aa2ed21da0f79a58120e2433'',tx0_index=3,tx0_hash=''7a78df734fd910fcf9170d4af753c2ceda92974684b929ff595e6063ca5a2cf1'',tx0_address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',tx1_index=4,tx1_hash=''e75417825d1fe276bfb329960a3367c711dcb256aa2ed21da0f79a58120e2433'',tx1_address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',forward_asset=''BTC'',forward_quantity=50000000,backward_asset=''XCP'',backward_quantity=100000000,tx0_block_index=310002,tx1_block_index=310003,block_index=310003,tx0_expiration=10,tx1_expiration=10,match_expire_index=310023,fee_paid=857142,status=''pending'' WHERE rowid=1');
-INSERT INTO undolog VALUES(19,'DELETE FROM btcpays WHERE rowid=5');
-INSERT INTO undolog VALUES(20,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=92945000000 WHERE rowid=1');
-INSERT INTO undolog VALUES(21,'DELETE FROM debits WHERE rowid=3');
-INSERT INTO undolog VALUES(22,'DELETE FROM assets WHERE rowid=3');
-INSERT INTO undolog VALUES(23,'DELETE FROM issuances WHERE rowid=1');
-INSERT INTO undolog VALUES(24,'DELETE FROM balances WHERE rowid=3');
-INSERT INTO undolog VALUES(25,'DELETE FROM credits WHERE rowid=4');
-INSERT INTO undolog VALUES(26,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=92895000000 WHERE rowid=1');
-INSERT INTO undolog VALUES(27,'DELETE FROM debits WHERE rowid=4');
-INSERT INTO undolog VALUES(28,'DELETE FROM assets WHERE rowid=4');
-INSERT INTO undolog VALUES(29,'DELETE FROM issuances WHERE rowid=2');
-INSERT INTO undolog VALUES(30,'DELETE FROM balances WHERE rowid=4');
-INSERT INTO undolog VALUES(31,'DELETE FROM credits WHERE rowid=5');
-INSERT INTO undolog VALUES(32,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''BBBB'',quantity=1000000000 WHERE rowid=3');
-INSERT INTO undolog VALUES(33,'DELETE FROM debits WHERE rowid=5');
-INSERT INTO undolog VALUES(34,'DELETE FROM balances WHERE rowid=5');
-INSERT INTO undolog VALUES(35,'DELETE FROM credits WHERE rowid=6');
-INSERT INTO undolog VALUES(36,'DELETE FROM sends WHERE rowid=2');
-INSERT INTO undolog VALUES(37,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''BBBC'',quantity=100000 WHERE rowid=4');
-INSERT INTO undolog VALUES(38,'DELETE FROM debits WHERE rowid=6');
-INSERT INTO undolog VALUES(39,'DELETE FROM balances WHERE rowid=6');
-INSERT INTO undolog VALUES(40,'DELETE FROM credits WHERE rowid=7');
-INSERT INTO undolog VALUES(41,'DELETE FROM sends WHERE rowid=3');
-INSERT INTO undolog VALUES(42,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=92845000000 WHERE rowid=1');
-INSERT INTO undolog VALUES(43,'DELETE FROM debits WHERE rowid=7');
-INSERT INTO undolog VALUES(44,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=92844999976 WHERE rowid=1');
-INSERT INTO undolog VALUES(45,'DELETE FROM debits WHERE rowid=8');
-INSERT INTO undolog VALUES(46,'UPDATE balances SET address=''1_mnfAHmddVibnZNSkh8DvKaQoiEfNsxjXzH_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=50000000 WHERE rowid=2');
-INSERT INTO undolog VALUES(47,'DELETE FROM credits WHERE rowid=8');
-INSERT INTO undolog VALUES(48,'DELETE FROM dividends WHERE rowid=10');
-INSERT INTO undolog VALUES(49,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=92844979976 WHERE rowid=1');
-INSERT INTO undolog VALUES(50,'DELETE FROM debits WHERE rowid=9');
-INSERT INTO undolog VALUES(51,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=92844559176 WHERE rowid=1');
-INSERT INTO undolog VALUES(52,'DELETE FROM debits WHERE rowid=10');
-INSERT INTO undolog VALUES(53,'UPDATE balances SET address=''1_mnfAHmddVibnZNSkh8DvKaQoiEfNsxjXzH_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=50000024 WHERE rowid=2');
-INSERT INTO undolog VALUES(54,'DELETE FROM credits WHERE rowid=9');
-INSERT INTO undolog VALUES(55,'DELETE FROM dividends WHERE rowid=11');
-INSERT INTO undolog VALUES(56,'DELETE FROM broadcasts WHERE rowid=12');
-INSERT INTO undolog VALUES(57,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=92844539176 WHERE rowid=1');
-INSERT INTO undolog VALUES(58,'DELETE FROM debits WHERE rowid=11');
-INSERT INTO undolog VALUES(59,'DELETE FROM bets WHERE rowid=1');
-INSERT INTO undolog VALUES(60,'UPDATE orders SET tx_index=3,tx_hash=''7a78df734fd910fcf9170d4af753c2ceda92974684b929ff595e6063ca5a2cf1'',block_index=310002,source=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',give_asset=''BTC'',give_quantity=50000000,give_remaining=0,get_asset=''XCP'',get_quantity=100000000,get_remaining=0,expiration=10,expire_index=310012,fee_required=0,fee_required_remaining=0,fee_provided=1000000,fee_provided_remaining=142858,status=''open'' WHERE rowid=1');
-INSERT INTO undolog VALUES(61,'DELETE FROM order_expirations WHERE rowid=3');
-INSERT INTO undolog VALUES(62,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=92794539176 WHERE rowid=1');
-INSERT INTO undolog VALUES(63,'DELETE FROM debits WHERE rowid=12');
-INSERT INTO undolog VALUES(64,'DELETE FROM bets WHERE rowid=2');
-INSERT INTO undolog VALUES(65,'UPDATE bets SET tx_index=13,tx_hash=''19f4bb0c6c99045ec307905d8e15ff885413cdee3525269b25f03971dd8019b9'',block_index=310012,source=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',feed_address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',bet_type=0,deadline=1388000100,wager_quantity=50000000,wager_remaining=50000000,counterwager_quantity=25000000,counterwager_remaining=25000000,target_value=0.0,leverage=15120,expiration=10,expire_index=310022,fee_fraction_int=99999999,status=''open'' WHERE rowid=1');
-INSERT INTO undolog VALUES(66,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=92769539176 WHERE rowid=1');
-INSERT INTO undolog VALUES(67,'DELETE FROM credits WHERE rowid=10');
-INSERT INTO undolog VALUES(68,'UPDATE bets SET tx_index=14,tx_hash=''43ee1168ce7525c84fbeee2e49ac0edc3daa3ee8c2edbbba326d566ab63d5e84'',block_index=310013,source=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',feed_address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',bet_type=1,deadline=1388000100,wager_quantity=25000000,wager_remaining=25000000,counterwager_quantity=41500000,counterwager_remaining=41500000,target_value=0.0,leverage=15120,expiration=10,expire_index=310023,fee_fraction_int=99999999,status=''open'' WHERE rowid=2');
-INSERT INTO undolog VALUES(69,'DELETE FROM bet_matches WHERE rowid=1');
-INSERT INTO undolog VALUES(70,'UPDATE orders SET tx_index=4,tx_hash=''e75417825d1fe276bfb329960a3367c711dcb256aa2ed21da0f79a58120e2433'',block_index=310003,source=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',give_asset=''XCP'',give_quantity=105000000,give_remaining=5000000,get_asset=''BTC'',get_quantity=50000000,get_remaining=0,expiration=10,expire_index=310013,fee_required=900000,fee_required_remaining=42858,fee_provided=6800,fee_provided_remaining=6800,status=''open'' WHERE rowid=2');
-INSERT INTO undolog VALUES(71,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=92773789176 WHERE rowid=1');
-INSERT INTO undolog VALUES(72,'DELETE FROM credits WHERE rowid=11');
-INSERT INTO undolog VALUES(73,'DELETE FROM order_expirations WHERE rowid=4');
-INSERT INTO undolog VALUES(74,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=92778789176 WHERE rowid=1');
-INSERT INTO undolog VALUES(75,'DELETE FROM debits WHERE rowid=13');
-INSERT INTO undolog VALUES(76,'DELETE FROM bets WHERE rowid=3');
-INSERT INTO undolog VALUES(77,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=92628789176 WHERE rowid=1');
-INSERT INTO undolog VALUES(78,'DELETE FROM debits WHERE rowid=14');
-INSERT INTO undolog VALUES(79,'DELETE FROM bets WHERE rowid=4');
-INSERT INTO undolog VALUES(80,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=92278789176 WHERE rowid=1');
-INSERT INTO undolog VALUES(81,'DELETE FROM credits WHERE rowid=12');
-INSERT INTO undolog VALUES(82,'UPDATE bets SET tx_index=15,tx_hash=''1cc9fa85ad3849ffa70d00b586b75fa07e2676cfa57d31460ec34eaabf82717d'',block_index=310014,source=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',feed_address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',bet_type=0,deadline=1388000100,wager_quantity=150000000,wager_remaining=150000000,counterwager_quantity=350000000,counterwager_remaining=350000000,target_value=0.0,leverage=5040,expiration=10,expire_index=310024,fee_fraction_int=99999999,status=''open'' WHERE rowid=3');
-INSERT INTO undolog VALUES(83,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=92278789176 WHERE rowid=1');
-INSERT INTO undolog VALUES(84,'DELETE FROM credits WHERE rowid=13');
-INSERT INTO undolog VALUES(85,'UPDATE bets SET tx_index=16,tx_hash=''005f98de7188c26ee7e5ce182204ec7c795284be40c684ad71da1d7999820531'',block_index=310015,source=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',feed_address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',bet_type=1,deadline=1388000100,wager_quantity=350000000,wager_remaining=350000000,counterwager_quantity=150000000,counterwager_remaining=150000000,target_value=0.0,leverage=5040,expiration=10,expire_index=310025,fee_fraction_int=99999999,status=''open'' WHERE rowid=4');
-INSERT INTO undolog VALUES(86,'DELETE FROM bet_matches WHERE rowid=2');
-INSERT INTO undolog VALUES(87,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=92278789176 WHERE rowid=1');
-INSERT INTO undolog VALUES(88,'DELETE FROM debits WHERE rowid=15');
-INSERT INTO undolog VALUES(89,'DELETE FROM bets WHERE rowid=5');
-INSERT INTO undolog VALUES(90,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=91528789176 WHERE rowid=1');
-INSERT INTO undolog VALUES(91,'DELETE FROM debits WHERE rowid=16');
-INSERT INTO undolog VALUES(92,'DELETE FROM bets WHERE rowid=6');
-INSERT INTO undolog VALUES(93,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=90878789176 WHERE rowid=1');
-INSERT INTO undolog VALUES(94,'DELETE FROM credits WHERE rowid=14');
-INSERT INTO undolog VALUES(95,'UPDATE bets SET tx_index=17,tx_hash=''e1f35692651c646ba75bbdf931aa9240e23711f221960865410a03dd400243da'',block_index=310016,source=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',feed_address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',bet_type=2,deadline=1388000200,wager_quantity=750000000,wager_remaining=750000000,counterwager_quantity=650000000,counterwager_remaining=650000000,target_value=1.0,leverage=5040,expiration=10,expire_index=310026,fee_fraction_int=99999999,status=''open'' WHERE rowid=5');
-INSERT INTO undolog VALUES(96,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=90878789176 WHERE rowid=1');
-INSERT INTO undolog VALUES(97,'DELETE FROM credits WHERE rowid=15');
-INSERT INTO undolog VALUES(98,'UPDATE bets SET tx_index=18,tx_hash=''dac4afb8fd0b05fd03635f95edd43fb2c8caf5e648c87dad32272f565714d1b9'',block_index=310017,source=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',feed_address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',bet_type=3,deadline=1388000200,wager_quantity=650000000,wager_remaining=650000000,counterwager_quantity=750000000,counterwager_remaining=750000000,target_value=1.0,leverage=5040,expiration=10,expire_index=310027,fee_fraction_int=99999999,status=''open'' WHERE rowid=6');
-INSERT INTO undolog VALUES(99,'DELETE FROM bet_matches WHERE rowid=3');
-INSERT INTO undolog VALUES(100,'DELETE FROM broadcasts WHERE rowid=19');
-INSERT INTO undolog VALUES(101,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=90878789176 WHERE rowid=1');
-INSERT INTO undolog VALUES(102,'DELETE FROM credits WHERE rowid=16');
-INSERT INTO undolog VALUES(103,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=90937926676 WHERE rowid=1');
-INSERT INTO undolog VALUES(104,'DELETE FROM credits WHERE rowid=17');
-INSERT INTO undolog VALUES(105,'DELETE FROM bet_match_resolutions WHERE rowid=1');
-INSERT INTO undolog VALUES(106,'UPDATE bet_matches SET id=''19f4bb0c6c99045ec307905d8e15ff885413cdee3525269b25f03971dd8019b9_43ee1168ce7525c84fbeee2e49ac0edc3daa3ee8c2edbbba326d566ab63d5e84'',tx0_index=13,tx0_hash=''19f4bb0c6c99045ec307905d8e15ff885413cdee3525269b25f03971dd8019b9'',tx0_address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',tx1_index=14,tx1_hash=''43ee1168ce7525c84fbeee2e49ac0edc3daa3ee8c2edbbba326d566ab63d5e84'',tx1_address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',tx0_bet_type=0,tx1_bet_type=1,feed_address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',initial_value=100,deadline=1388000100,target_value=0.0,leverage=15120,forward_quantity=41500000,backward_quantity=20750000,tx0_block_index=310012,tx1_block_index=310013,block_index=310013,tx0_expiration=10,tx1_expiration=10,match_expire_index=310022,fee_fraction_int=99999999,status=''pending'' WHERE rowid=1');
-INSERT INTO undolog VALUES(107,'DELETE FROM broadcasts WHERE rowid=20');
-INSERT INTO undolog VALUES(108,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=90941039176 WHERE rowid=1');
-INSERT INTO undolog VALUES(109,'DELETE FROM credits WHERE rowid=18');
-INSERT INTO undolog VALUES(110,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=91100339176 WHERE rowid=1');
-INSERT INTO undolog VALUES(111,'DELETE FROM credits WHERE rowid=19');
-INSERT INTO undolog VALUES(112,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=91416039176 WHERE rowid=1');
-INSERT INTO undolog VALUES(113,'DELETE FROM credits WHERE rowid=20');
-INSERT INTO undolog VALUES(114,'DELETE FROM bet_match_resolutions WHERE rowid=2');
-INSERT INTO undolog VALUES(115,'UPDATE bet_matches SET id=''1cc9fa85ad3849ffa70d00b586b75fa07e2676cfa57d31460ec34eaabf82717d_005f98de7188c26ee7e5ce182204ec7c795284be40c684ad71da1d7999820531'',tx0_index=15,tx0_hash=''1cc9fa85ad3849ffa70d00b586b75fa07e2676cfa57d31460ec34eaabf82717d'',tx0_address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',tx1_index=16,tx1_hash=''005f98de7188c26ee7e5ce182204ec7c795284be40c684ad71da1d7999820531'',tx1_address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',tx0_bet_type=0,tx1_bet_type=1,feed_address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',initial_value=100,deadline=1388000100,target_value=0.0,leverage=5040,forward_quantity=150000000,backward_quantity=350000000,tx0_block_index=310014,tx1_block_index=310015,block_index=310015,tx0_expiration=10,tx1_expiration=10,match_expire_index=310024,fee_fraction_int=99999999,status=''pending'' WHERE rowid=2');
-INSERT INTO undolog VALUES(116,'DELETE FROM broadcasts WHERE rowid=21');
-INSERT INTO undolog VALUES(117,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=91441039176 WHERE rowid=1');
-INSERT INTO undolog VALUES(118,'DELETE FROM credits WHERE rowid=21');
-INSERT INTO undolog VALUES(119,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=92771039176 WHERE rowid=1');
-INSERT INTO undolog VALUES(120,'DELETE FROM credits WHERE rowid=22');
-INSERT INTO undolog VALUES(121,'DELETE FROM bet_match_resolutions WHERE rowid=3');
-INSERT INTO undolog VALUES(122,'UPDATE bet_matches SET id=''e1f35692651c646ba75bbdf931aa9240e23711f221960865410a03dd400243da_dac4afb8fd0b05fd03635f95edd43fb2c8caf5e648c87dad32272f565714d1b9'',tx0_index=17,tx0_hash=''e1f35692651c646ba75bbdf931aa9240e23711f221960865410a03dd400243da'',tx0_address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',tx1_index=18,tx1_hash=''dac4afb8fd0b05fd03635f95edd43fb2c8caf5e648c87dad32272f565714d1b9'',tx1_address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',tx0_bet_type=2,tx1_bet_type=3,feed_address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',initial_value=100,deadline=1388000200,target_value=1.0,leverage=5040,forward_quantity=750000000,backward_quantity=650000000,tx0_block_index=310016,tx1_block_index=310017,block_index=310017,tx0_expiration=10,tx1_expiration=10,match_expire_index=310026,fee_fraction_int=99999999,status=''pending'' WHERE rowid=3');
-INSERT INTO undolog VALUES(123,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''BBBB'',quantity=996000000 WHERE rowid=3');
-INSERT INTO undolog VALUES(124,'DELETE FROM debits WHERE rowid=17');
-INSERT INTO undolog VALUES(125,'DELETE FROM orders WHERE rowid=3');
-INSERT INTO undolog VALUES(126,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=92841039176 WHERE rowid=1');
-INSERT INTO undolog VALUES(127,'DELETE FROM credits WHERE rowid=23');
-INSERT INTO undolog VALUES(128,'DELETE FROM burns WHERE rowid=23');
-INSERT INTO undolog VALUES(129,'UPDATE bets SET tx_index=13,tx_hash=''19f4bb0c6c99045ec307905d8e15ff885413cdee3525269b25f03971dd8019b9'',block_index=310012,source=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',feed_address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',bet_type=0,deadline=1388000100,wager_quantity=50000000,wager_remaining=8500000,counterwager_quantity=25000000,counterwager_remaining=4250000,target_value=0.0,leverage=15120,expiration=10,expire_index=310022,fee_fraction_int=99999999,status=''open'' WHERE rowid=1');
-INSERT INTO undolog VALUES(130,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''XCP'',quantity=149840926438 WHERE rowid=1');
-INSERT INTO undolog VALUES(131,'DELETE FROM credits WHERE rowid=24');
-INSERT INTO undolog VALUES(132,'DELETE FROM bet_expirations WHERE rowid=13');
-INSERT INTO undolog VALUES(133,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''BBBC'',quantity=99474 WHERE rowid=4');
-INSERT INTO undolog VALUES(134,'DELETE FROM debits WHERE rowid=18');
-INSERT INTO undolog VALUES(135,'UPDATE balances SET address=''1_mnfAHmddVibnZNSkh8DvKaQoiEfNsxjXzH_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''BBBC'',quantity=526 WHERE rowid=6');
-INSERT INTO undolog VALUES(136,'DELETE FROM credits WHERE rowid=25');
-INSERT INTO undolog VALUES(137,'DELETE FROM sends WHERE rowid=4');
-INSERT INTO undolog VALUES(138,'UPDATE orders SET tx_index=22,tx_hash=''9611941b4e1ce19312e3cb19847439ec1c4efc614f017ad72ac232ebf54739b3'',block_index=310021,source=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',give_asset=''BBBB'',give_quantity=50000000,give_remaining=50000000,get_asset=''XCP'',get_quantity=50000000,get_remaining=50000000,expiration=10,expire_index=310031,fee_required=0,fee_required_remaining=0,fee_provided=6800,fee_provided_remaining=6800,status=''open'' WHERE rowid=3');
-INSERT INTO undolog VALUES(139,'UPDATE balances SET address=''1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2'',asset=''BBBB'',quantity=946000000 WHERE rowid=3');
-INSERT INTO undolog VALUES(140,'DELETE FROM credits WHERE rowid=26');
-INSERT INTO undolog VALUES(141,'DELETE FROM order_expirations WHERE rowid=22');
+                        table_name TEXT,
+                        op INTEGER,
+                        row_id INTEGER, v1, v2, v3, v4, v5, v6, v7, v8, v9, v10, v11, v12, v13, v14, v15, v16, v17, v18, v19, v20, v21, v22, v23, v24);
+INSERT INTO undolog VALUES(4,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',93000000000,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(5,'debits',0,1,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(6,'balances',0,2,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(7,'credits',0,2,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(8,'sends',0,1,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(9,'orders',0,1,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(10,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',92950000000,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(11,'debits',0,2,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(12,'orders',0,2,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(13,'orders',1,1,3,'7a78df734fd910fcf9170d4af753c2ceda92974684b929ff595e6063ca5a2cf1',310002,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','BTC',50000000,50000000,'XCP',100000000,100000000,10,310012,0,0,1000000,1000000,'open',NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(14,'orders',1,2,4,'e75417825d1fe276bfb329960a3367c711dcb256aa2ed21da0f79a58120e2433',310003,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',105000000,105000000,'BTC',50000000,50000000,10,310013,900000,900000,6800,6800,'open',NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(15,'order_matches',0,1,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(16,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',92845000000,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(17,'credits',0,3,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(18,'order_matches',1,1,'7a78df734fd910fcf9170d4af753c2ceda92974684b929ff595e6063ca5a2cf1_e75417825d1fe276bfb329960a3367c711dcb256aa2ed21da0f79a58120e2433',3,'7a78df734fd910fcf9170d4af753c2ceda92974684b929ff595e6063ca5a2cf1','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',4,'e75417825d1fe276bfb329960a3367c711dcb256aa2ed21da0f79a58120e2433','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','BTC',50000000,'XCP',100000000,310002,310003,310003,10,10,310023,857142,'pending',NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(19,'btcpays',0,5,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(20,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',92945000000,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(21,'debits',0,3,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(22,'assets',0,3,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(23,'issuances',0,1,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(24,'balances',0,3,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(25,'credits',0,4,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(26,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',92895000000,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(27,'debits',0,4,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(28,'assets',0,4,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(29,'issuances',0,2,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(30,'balances',0,4,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(31,'credits',0,5,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(32,'balances',1,3,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','BBBB',1000000000,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(33,'debits',0,5,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(34,'balances',0,5,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(35,'credits',0,6,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(36,'sends',0,2,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(37,'balances',1,4,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','BBBC',100000,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(38,'debits',0,6,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(39,'balances',0,6,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(40,'credits',0,7,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(41,'sends',0,3,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(42,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',92845000000,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(43,'debits',0,7,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(44,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',92844999976,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(45,'debits',0,8,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(46,'balances',1,2,'1_mnfAHmddVibnZNSkh8DvKaQoiEfNsxjXzH_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',50000000,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(47,'credits',0,8,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(48,'dividends',0,10,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(49,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',92844979976,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(50,'debits',0,9,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(51,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',92844559176,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(52,'debits',0,10,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(53,'balances',1,2,'1_mnfAHmddVibnZNSkh8DvKaQoiEfNsxjXzH_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',50000024,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(54,'credits',0,9,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(55,'dividends',0,11,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(56,'broadcasts',0,12,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(57,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',92844539176,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(58,'debits',0,11,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(59,'bets',0,1,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(60,'orders',1,1,3,'7a78df734fd910fcf9170d4af753c2ceda92974684b929ff595e6063ca5a2cf1',310002,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','BTC',50000000,0,'XCP',100000000,0,10,310012,0,0,1000000,142858,'open',NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(61,'order_expirations',0,3,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(62,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',92794539176,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(63,'debits',0,12,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(64,'bets',0,2,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(65,'bets',1,1,13,'19f4bb0c6c99045ec307905d8e15ff885413cdee3525269b25f03971dd8019b9',310012,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',0,1388000100,50000000,50000000,25000000,25000000,0.0,15120,10,310022,99999999,'open',NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(66,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',92769539176,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(67,'credits',0,10,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(68,'bets',1,2,14,'43ee1168ce7525c84fbeee2e49ac0edc3daa3ee8c2edbbba326d566ab63d5e84',310013,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',1,1388000100,25000000,25000000,41500000,41500000,0.0,15120,10,310023,99999999,'open',NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(69,'bet_matches',0,1,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(70,'orders',1,2,4,'e75417825d1fe276bfb329960a3367c711dcb256aa2ed21da0f79a58120e2433',310003,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',105000000,5000000,'BTC',50000000,0,10,310013,900000,42858,6800,6800,'open',NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(71,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',92773789176,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(72,'credits',0,11,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(73,'order_expirations',0,4,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(74,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',92778789176,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(75,'debits',0,13,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(76,'bets',0,3,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(77,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',92628789176,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(78,'debits',0,14,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(79,'bets',0,4,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(80,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',92278789176,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(81,'credits',0,12,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(82,'bets',1,3,15,'1cc9fa85ad3849ffa70d00b586b75fa07e2676cfa57d31460ec34eaabf82717d',310014,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',0,1388000100,150000000,150000000,350000000,350000000,0.0,5040,10,310024,99999999,'open',NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(83,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',92278789176,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(84,'credits',0,13,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(85,'bets',1,4,16,'005f98de7188c26ee7e5ce182204ec7c795284be40c684ad71da1d7999820531',310015,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',1,1388000100,350000000,350000000,150000000,150000000,0.0,5040,10,310025,99999999,'open',NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(86,'bet_matches',0,2,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(87,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',92278789176,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(88,'debits',0,15,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(89,'bets',0,5,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(90,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',91528789176,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(91,'debits',0,16,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(92,'bets',0,6,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(93,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',90878789176,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(94,'credits',0,14,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(95,'bets',1,5,17,'e1f35692651c646ba75bbdf931aa9240e23711f221960865410a03dd400243da',310016,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',2,1388000200,750000000,750000000,650000000,650000000,1.0,5040,10,310026,99999999,'open',NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(96,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',90878789176,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(97,'credits',0,15,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(98,'bets',1,6,18,'dac4afb8fd0b05fd03635f95edd43fb2c8caf5e648c87dad32272f565714d1b9',310017,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',3,1388000200,650000000,650000000,750000000,750000000,1.0,5040,10,310027,99999999,'open',NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(99,'bet_matches',0,3,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(100,'broadcasts',0,19,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(101,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',90878789176,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(102,'credits',0,16,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(103,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',90937926676,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(104,'credits',0,17,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(105,'bet_match_resolutions',0,1,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(106,'bet_matches',1,1,'19f4bb0c6c99045ec307905d8e15ff885413cdee3525269b25f03971dd8019b9_43ee1168ce7525c84fbeee2e49ac0edc3daa3ee8c2edbbba326d566ab63d5e84',13,'19f4bb0c6c99045ec307905d8e15ff885413cdee3525269b25f03971dd8019b9','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',14,'43ee1168ce7525c84fbeee2e49ac0edc3daa3ee8c2edbbba326d566ab63d5e84','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',0,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',100,1388000100,0.0,15120,41500000,20750000,310012,310013,310013,10,10,310022,99999999,'pending');
+INSERT INTO undolog VALUES(107,'broadcasts',0,20,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(108,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',90941039176,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(109,'credits',0,18,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(110,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',91100339176,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(111,'credits',0,19,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(112,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',91416039176,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(113,'credits',0,20,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(114,'bet_match_resolutions',0,2,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(115,'bet_matches',1,2,'1cc9fa85ad3849ffa70d00b586b75fa07e2676cfa57d31460ec34eaabf82717d_005f98de7188c26ee7e5ce182204ec7c795284be40c684ad71da1d7999820531',15,'1cc9fa85ad3849ffa70d00b586b75fa07e2676cfa57d31460ec34eaabf82717d','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',16,'005f98de7188c26ee7e5ce182204ec7c795284be40c684ad71da1d7999820531','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',0,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',100,1388000100,0.0,5040,150000000,350000000,310014,310015,310015,10,10,310024,99999999,'pending');
+INSERT INTO undolog VALUES(116,'broadcasts',0,21,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(117,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',91441039176,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(118,'credits',0,21,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(119,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',92771039176,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(120,'credits',0,22,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(121,'bet_match_resolutions',0,3,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(122,'bet_matches',1,3,'e1f35692651c646ba75bbdf931aa9240e23711f221960865410a03dd400243da_dac4afb8fd0b05fd03635f95edd43fb2c8caf5e648c87dad32272f565714d1b9',17,'e1f35692651c646ba75bbdf931aa9240e23711f221960865410a03dd400243da','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',18,'dac4afb8fd0b05fd03635f95edd43fb2c8caf5e648c87dad32272f565714d1b9','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',2,3,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',100,1388000200,1.0,5040,750000000,650000000,310016,310017,310017,10,10,310026,99999999,'pending');
+INSERT INTO undolog VALUES(123,'balances',1,3,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','BBBB',996000000,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(124,'debits',0,17,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(125,'orders',0,3,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(126,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',92841039176,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(127,'credits',0,23,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(128,'burns',0,23,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(129,'bets',1,1,13,'19f4bb0c6c99045ec307905d8e15ff885413cdee3525269b25f03971dd8019b9',310012,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2',0,1388000100,50000000,8500000,25000000,4250000,0.0,15120,10,310022,99999999,'open',NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(130,'balances',1,1,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','XCP',149840926438,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(131,'credits',0,24,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(132,'bet_expirations',0,13,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(133,'balances',1,4,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','BBBC',99474,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(134,'debits',0,18,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(135,'balances',1,6,'1_mnfAHmddVibnZNSkh8DvKaQoiEfNsxjXzH_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','BBBC',526,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(136,'credits',0,25,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(137,'sends',0,4,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(138,'orders',1,3,22,'9611941b4e1ce19312e3cb19847439ec1c4efc614f017ad72ac232ebf54739b3',310021,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','BBBB',50000000,50000000,'XCP',50000000,50000000,10,310031,0,0,6800,6800,'open',NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(139,'balances',1,3,'1_mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc_mtQheFaSfWELRB2MyMBaiWjdDm6ux9Ezns_2','BBBB',946000000,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(140,'credits',0,26,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
+INSERT INTO undolog VALUES(141,'order_expirations',0,22,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL);
 
 -- Table  undolog_block
 DROP TABLE IF EXISTS undolog_block;
@@ -0,0 +1,43 @@
+#! /usr/bin/python3
+import json
+import tempfile
+
+from counterpartylib.test import conftest  # this is require near the top to do setup of the test suite
+from counterpartylib.test.util_test import CURR_DIR
+
+from counterpartylib.lib import (log, util)
+
+
+FIXTURE_SQL_FILE = CURR_DIR + '/fixtures/scenarios/unittest_fixture.sql'
+FIXTURE_DB = tempfile.gettempdir() + '/fixtures.unittest_fixture.db'
+
+
+def test_message_index(server_db):
+    cursor = server_db.cursor()
+    def last_message_index():
+        return list(cursor.execute('''SELECT MAX(message_index) AS m FROM messages'''))[0]['m']
+
+    log.reset_message_index()
+    first_message_index = last_message_index() + 1
+    block_index = util.CURRENT_BLOCK_INDEX
+    for i in range(3):
+        log.message(server_db, block_index, 'update', 'order', {'tx_hash': str(i), 'status': 'open'})
+    assert [row['message_index'] for row in cursor.execute('''SELECT message_index FROM messages WHERE message_index >= ?''', (first_message_index,))] \
+        == [first_message_index, first_message_index + 1, first_message_index + 2]
+
+    # Rolled back messages are allocated again.
+    cursor.execute('''DELETE FROM messages WHERE message_index > ?''', (first_message_index,))
+    log.reset_message_index()
+    log.message(server_db, block_index, 'update', 'order', {'tx_hash': 'again', 'status': 'open'})
+    assert last_message_index() == first_message_index + 1
+
+
+def test_message_bindings(server_db):
+    log.reset_message_index()
+    bindings = {'tx_hash': 'deadbeef', 'status': 'open', 'memo': b'\x00\xff', 'asset': 'XCP'}
+    log.message(server_db, util.CURRENT_BLOCK_INDEX, 'update', 'order', bindings)
+    message = util.last_message(server_db)
+    assert message['bindings'] == '{"asset": "XCP", "memo": "00ff", "status": "open", "tx_hash": "deadbeef"}'
+    assert json.loads(message['bindings'])['memo'] == '00ff'
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
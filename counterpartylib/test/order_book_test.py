@@ -0,0 +1,65 @@
+#! /usr/bin/python3
+import tempfile
+
+from counterpartylib.test import conftest  # this is require near the top to do setup of the test suite
+from counterpartylib.test.util_test import CURR_DIR
+from counterpartylib.test import util_test
+
+from counterpartylib.lib import (blocks, util)
+from counterpartylib.lib.messages import order
+
+
+FIXTURE_SQL_FILE = CURR_DIR + '/fixtures/scenarios/unittest_fixture.sql'
+FIXTURE_DB = tempfile.gettempdir() + '/fixtures.order_book_test.db'
+
+
+def test_order_book(parsed_db):
+    db = parsed_db
+    tip = util.CURRENT_BLOCK_INDEX
+    cursor = db.cursor()
+    cursor.setexectrace(None) # not messages
+    pairs = [('XCP', 'DIVISIBLE'), ('XCP', 'BTC'), ('BTC', 'XCP'), ('DIVISIBLE', 'XCP')]
+    def open_orders(give_asset, get_asset):
+        """`match()` as it was."""
+        orders = list(cursor.execute('''SELECT * FROM orders WHERE (give_asset=? AND get_asset=? AND status=?)''',
+                                     (give_asset, get_asset, 'open')))
+        orders = sorted(orders, key=lambda x: x['tx_index'])
+        return sorted(orders, key=lambda x: util.price(x['get_quantity'], x['give_quantity']))
+    def check_order_book():
+        for pair in pairs:
+            assert order.get_order_book(db).open_orders(*pair) == open_orders(*pair)
+
+    check_order_book()
+    book = order.get_order_book(db)
+    tokens = dict((pair, book.pairs[pair]['token']) for pair in pairs)
+
+    # Kept in step with the changes, which aren't rolled back.
+    cursor.execute('''SAVEPOINT test''')
+    cursor.execute('''UPDATE orders SET status = 'cancelled' WHERE tx_index = 7''')
+    cursor.execute('''UPDATE orders SET status = 'open', get_quantity = 50000000 WHERE status = 'filled' ''')
+    cursor.execute('''UPDATE orders SET give_remaining = 0 WHERE tx_index = 11''')
+    cursor.execute('''DELETE FROM orders WHERE tx_index = 12''')
+    loaded = book.pairs.copy()
+    check_order_book()
+    assert book.pairs == loaded
+    assert book.pairs[('XCP', 'DIVISIBLE')]['token'] != tokens[('XCP', 'DIVISIBLE')]
+
+    # Loaded again once they are.
+    cursor.execute('''ROLLBACK TO SAVEPOINT test''')
+    cursor.execute('''RELEASE SAVEPOINT test''')
+    check_order_book()
+    assert book.pairs[('XCP', 'DIVISIBLE')] is not loaded[('XCP', 'DIVISIBLE')]
+    assert book.pairs[('XCP', 'BTC')] is not loaded[('XCP', 'BTC')]
+    assert book.pairs[('DIVISIBLE', 'XCP')] is loaded[('DIVISIBLE', 'XCP')]
+
+    # Rolled back from the undolog, or reinitialised.
+    util_test.create_next_block(db)
+    with db:
+        cursor.execute('''UPDATE orders SET status = 'expired' WHERE tx_index = 10''')
+    check_order_book()
+    blocks.reparse(db, block_index=tip)
+    check_order_book()
+    with db:
+        blocks.reinitialise(db, tip) # the tables are dropped, with the triggers
+    check_order_book()
+    assert len(list(cursor.execute('''SELECT * FROM sqlite_temp_master WHERE type = 'trigger' '''))) == 3
@@ -0,0 +1,70 @@
+#! /usr/bin/python3
+import collections
+import tempfile
+import os
+import apsw
+
+import bitcoin as bitcoinlib
+
+from counterpartylib.test import conftest  # this is require near the top to do setup of the test suite
+from counterpartylib.test.fixtures.vectors import UNITTEST_VECTOR
+from counterpartylib.test import util_test
+
+from counterpartylib.lib import (blocks, backend, config, outpoints)
+
+
+FakeBlock = collections.namedtuple('FakeBlock', ['vtx'])
+
+
+def test_outpoint_index(monkeypatch):
+    spending_ctx = backend.deserialize(UNITTEST_VECTOR['blocks']['get_tx_info'][0]['in'][0])
+    vin = spending_ctx.vin[0]
+    funding_hash = bitcoinlib.core.b2lx(vin.prevout.hash)
+    funding_ctx = backend.deserialize(backend.getrawtransaction(funding_hash))
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        with util_test.ConfigContext(OUTPOINT_INDEX=True, OUTPOINTS_DATABASE=os.path.join(data_dir, 'test.outpoints.db')):
+            try:
+                outpoints.index_block(FakeBlock([funding_ctx]), 1000)
+                assert outpoints.get_txout(funding_hash, vin.prevout.n) == funding_ctx.vout[vin.prevout.n]
+
+                # served from the index, not the backend
+                def getrawtransaction(tx_hash, *args, **kwargs):
+                    raise Exception('backend unreachable')
+                monkeypatch.setattr('counterpartylib.lib.backend.getrawtransaction', getrawtransaction)
+                assert blocks.get_prevout(vin) == funding_ctx.vout[vin.prevout.n]
+
+                # unspendable outputs are never indexed
+                outpoints.index_block(FakeBlock([spending_ctx]), 1001)
+                spending_hash = bitcoinlib.core.b2lx(spending_ctx.GetTxid())
+                for n, vout in enumerate(spending_ctx.vout):
+                    if vout.scriptPubKey[0] == outpoints.OP_RETURN:
+                        assert outpoints.get_txout(spending_hash, n) is None
+                    else:
+                        assert outpoints.get_txout(spending_hash, n) == vout
+
+                # spent outputs are kept while their spending block can be
+                # rolled back, and pruned after
+                assert outpoints.get_txout(funding_hash, vin.prevout.n) == funding_ctx.vout[vin.prevout.n]
+                outpoints.index_block(FakeBlock([]), 1001 + config.UNDOLOG_MAX_PAST_BLOCKS)
+                assert outpoints.get_txout(funding_hash, vin.prevout.n) == funding_ctx.vout[vin.prevout.n]
+                outpoints.rollback(1000)
+                outpoints.index_block(FakeBlock([]), 1002 + config.UNDOLOG_MAX_PAST_BLOCKS)
+                assert outpoints.get_txout(funding_hash, vin.prevout.n) == funding_ctx.vout[vin.prevout.n]
+                outpoints.index_block(FakeBlock([spending_ctx]), 1003 + config.UNDOLOG_MAX_PAST_BLOCKS)
+                outpoints.index_block(FakeBlock([]), 1004 + 2 * config.UNDOLOG_MAX_PAST_BLOCKS)
+                assert outpoints.get_txout(funding_hash, vin.prevout.n) is None
+            finally:
+                outpoints.close()
+
+            # indexes without the spending blocks are rebuilt
+            db = apsw.Connection(config.OUTPOINTS_DATABASE)
+            db.cursor().execute('''DROP TABLE outpoints; CREATE TABLE outpoints(tx_hash BLOB, vout INTEGER, script_pubkey BLOB, value INTEGER)''')
+            db.close()
+            try:
+                outpoints.index_block(FakeBlock([funding_ctx]), 1000)
+                assert outpoints.get_txout(funding_hash, vin.prevout.n) == funding_ctx.vout[vin.prevout.n]
+            finally:
+                outpoints.close()
+
+    assert outpoints.get_txout(funding_hash, vin.prevout.n) is None
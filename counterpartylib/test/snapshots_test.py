@@ -0,0 +1,64 @@
+#! /usr/bin/python3
+import tempfile
+
+from counterpartylib.test import conftest  # this is require near the top to do setup of the test suite
+from counterpartylib.test.util_test import CURR_DIR
+from counterpartylib.test import util_test
+
+from counterpartylib.lib import (blocks, snapshots, util)
+
+
+FIXTURE_SQL_FILE = CURR_DIR + '/fixtures/scenarios/unittest_fixture.sql'
+FIXTURE_DB = tempfile.gettempdir() + '/fixtures.snapshots_test.db'
+
+
+def test_snapshots(parsed_db, monkeypatch):
+    db = parsed_db
+    tip = util.CURRENT_BLOCK_INDEX
+    cursor = db.cursor()
+    def ledger():
+        return dict((table, list(cursor.execute('''SELECT rowid, * FROM {} ORDER BY rowid'''.format(table))))
+                    for table in blocks.TABLES + ['balances'])
+    def block_hashes():
+        return list(cursor.execute('''SELECT block_index, ledger_hash, txlist_hash, messages_hash FROM blocks
+                                      ORDER BY block_index'''))
+
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        with util_test.ConfigContext(SNAPSHOT_DIR=snapshot_dir):
+            assert snapshots.take() == tip
+            before = ledger()
+            for i in range(3):
+                util_test.create_next_block(db)
+            hashes = block_hashes()
+            assert snapshots.take() == tip + 3
+            assert snapshots.list_snapshots() == [tip, tip + 3]
+
+            # Out of reach of the undolog: the snapshot of `tip` is restored
+            # (without the change made since), then the next block parsed.
+            cursor.execute('''DELETE FROM undolog_block''')
+            cursor.execute('''UPDATE balances SET quantity = quantity + 1 WHERE rowid = 1''')
+            parsed = []
+            parse_block = blocks.parse_block
+            def parse_block_spy(db, block_index, *args, **kwargs):
+                parsed.append(block_index)
+                return parse_block(db, block_index, *args, **kwargs)
+            monkeypatch.setattr(blocks, 'parse_block', parse_block_spy)
+            blocks.reparse(db, block_index=tip + 1)
+            assert parsed == [tip + 1]
+            assert block_hashes() == hashes[:-2]
+            assert snapshots.list_snapshots() == [tip]
+            blocks.reparse(db, block_index=tip)
+            assert ledger() == before
+
+            # Snapshots of another chain are not restored.
+            cursor.execute('''UPDATE blocks SET block_hash = ? WHERE block_index = ?''', ('orphan', tip))
+            assert snapshots.find(db, tip) is None
+
+            manager = snapshots.SnapshotManager(10, 1)
+            manager.block_committed(tip + 5)
+            manager.join()
+            assert snapshots.list_snapshots() == [tip]
+            manager.block_committed(tip + 10)
+            manager.join()
+            assert snapshots.list_snapshots() == [tip]
+            assert snapshots.find(db, tip) == tip
@@ -0,0 +1,63 @@
+#! /usr/bin/python3
+import tempfile
+import pytest
+
+from counterpartylib.test import conftest  # this is require near the top to do setup of the test suite
+from counterpartylib.test.util_test import CURR_DIR
+from counterpartylib.test import util_test
+
+from counterpartylib.lib import (blocks, check, config, supplies, util)
+
+
+FIXTURE_SQL_FILE = CURR_DIR + '/fixtures/scenarios/unittest_fixture.sql'
+FIXTURE_DB = tempfile.gettempdir() + '/fixtures.supplies_test.db'
+
+
+def test_supplies(parsed_db):
+    db = parsed_db
+    tip = util.CURRENT_BLOCK_INDEX
+    cursor = db.cursor()
+    raw_cursor = db.cursor()
+    raw_cursor.setexectrace(None) # not messages
+    def rebuilt():
+        raw_cursor.execute('''SAVEPOINT rebuild''')
+        supplies.rebuild(raw_cursor)
+        totals = supplies.totals(db)
+        raw_cursor.execute('''ROLLBACK TO SAVEPOINT rebuild''')
+        raw_cursor.execute('''RELEASE SAVEPOINT rebuild''')
+        return totals
+
+    # Computed for the database that had no totals.
+    check.asset_conservation(db, deep=True)
+    before = supplies.totals(db)
+
+    # Kept in step with credits, debits, escrows and expirations.
+    util_test.create_next_block(db)
+    order = list(cursor.execute('''SELECT * FROM orders WHERE status = 'open' ORDER BY tx_index LIMIT 1'''))[0]
+    with db:
+        util.credit(db, order['source'], order['give_asset'], order['give_remaining'], action='test', event='test')
+        raw_cursor.execute('''UPDATE orders SET status = 'expired' WHERE tx_index = ?''', (order['tx_index'],))
+        util.debit(db, order['source'], config.XCP, 100, action='test', event='test')
+        util.credit(db, 'test', config.XCP, 100, action='test', event='test')
+        util.flush_balances()
+    assert supplies.totals(db) == rebuilt()
+    check.asset_conservation(db, deep=True)
+
+    # Not conserved: the escrowed quantities are gone, an issuance is undone.
+    with db:
+        raw_cursor.execute('''UPDATE orders SET status = 'cancelled' WHERE status = 'open' ''')
+        raw_cursor.execute('''UPDATE issuances SET status = 'invalid: test' WHERE tx_index =
+                              (SELECT MIN(tx_index) FROM issuances WHERE status = 'valid')''')
+    with pytest.raises(check.SanityError):
+        check.asset_conservation(db)
+    assert supplies.totals(db) == rebuilt()
+    with db:
+        raw_cursor.execute('''UPDATE supplies SET balances = balances + 1 WHERE asset = ?''', (config.XCP,))
+    with pytest.raises(check.SanityError, match='running totals'):
+        check.asset_conservation(db, deep=True)
+
+    # Rolled back with the changes of the block.
+    with db:
+        raw_cursor.execute('''UPDATE supplies SET balances = balances - 1 WHERE asset = ?''', (config.XCP,))
+    blocks.reparse(db, block_index=tip)
+    assert supplies.totals(db) == before
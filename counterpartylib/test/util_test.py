@@ -29,7 +29,7 @@ CURR_DIR = os.path.dirname(os.path.realpath(os.path.join(os.getcwd(), os.path.ex
 sys.path.append(os.path.normpath(os.path.join(CURR_DIR, '..')))
 
 from counterpartylib import server
-from counterpartylib.lib import (config, util, blocks, check, backend, database, transaction, exceptions)
+from counterpartylib.lib import (config, util, blocks, check, backend, database, expirations, transaction, exceptions)
 from counterpartylib.lib.backend.indexd import extract_addresses, extract_addresses_from_txlist
 
 from counterpartylib.test.fixtures.params import DEFAULT_PARAMS as DP
@@ -73,6 +73,7 @@ def init_database(sqlfile, dbfile, options=None):
     restore_database(config.DATABASE, sqlfile)
     db = database.get_connection(read_only=False)  # reinit the DB to deal with the restoring
     database.update_version(db)
+    expirations.initialise(db)  # the dumps predate the schedule of the expirations
     util.FIRST_MULTISIG_BLOCK_TESTNET = 1
 
     return db
@@ -213,6 +213,9 @@ setup_options = {
     'zip_safe': False,
     'setup_requires': ['appdirs', 'setuptools-markdown'],
     'install_requires': required_packages,
+    'extras_require': {
+        'zmq': ['pyzmq>=17.1.2'],
+    },
     'include_package_data': True,
     'cmdclass': {
         'install': install,
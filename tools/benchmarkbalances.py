@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+
+# Benchmark `util.credit()` and `util.debit()` with the balances cached in
+# memory and written back at the end of the block, against the functions as
+# they were, which read and wrote the balances table on every call, on the
+# database of the unit test fixture:
+#
+#   python3 tools/benchmarkbalances.py [ROUNDS]
+#
+# - dividend: the issuer is debited once and each of HOLDERS holders credited.
+# - mpma: one source sends to DESTINATIONS destinations, in 10 assets.
+#
+# `batched` is with `util.credit_many()` and `util.debit_many()`.
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+import apsw
+
+from counterpartylib import server
+from counterpartylib.lib import config, util, database
+
+ROUNDS = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+HOLDERS = 10000
+DESTINATIONS = 1000
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'counterpartylib', 'test', 'fixtures', 'scenarios', 'unittest_fixture.sql')
+
+def legacy_debit(db, address, asset, quantity, action=None, event=None):
+    """`util.debit()` as it was, without the argument checks."""
+    cursor = db.cursor()
+    cursor.setrowtrace(None)
+    balances = list(cursor.execute('''SELECT quantity FROM balances \
+                                      WHERE (address = ? AND asset = ?)''', (address, asset)))
+    old_balance = balances[0][0] if len(balances) == 1 else 0
+    if old_balance < quantity:
+        raise util.DebitError('Insufficient funds.')
+    cursor.execute('''update balances set quantity = :quantity where (address = :address and asset = :asset)''',
+                   {'quantity': old_balance - quantity, 'address': address, 'asset': asset})
+    cursor.execute('''insert into debits values(:block_index, :address, :asset, :quantity, :action, :event)''',
+                   {'block_index': util.CURRENT_BLOCK_INDEX, 'address': address, 'asset': asset,
+                    'quantity': quantity, 'action': action, 'event': event})
+    cursor.close()
+    util.BLOCK_LEDGER.append('{}{}{}{}'.format(util.CURRENT_BLOCK_INDEX, address, asset, quantity))
+
+def legacy_credit(db, address, asset, quantity, action=None, event=None):
+    """`util.credit()` as it was, without the argument checks."""
+    cursor = db.cursor()
+    cursor.setrowtrace(None)
+    balances = list(cursor.execute('''SELECT quantity FROM balances \
+                                      WHERE (address = ? AND asset = ?)''', (address, asset)))
+    if not balances:
+        cursor.execute('''insert into balances values(:address, :asset, :quantity)''',
+                       {'address': address, 'asset': asset, 'quantity': quantity})
+    else:
+        cursor.execute('''update balances set quantity = :quantity where (address = :address and asset = :asset)''',
+                       {'quantity': min(balances[0][0] + quantity, config.MAX_INT), 'address': address, 'asset': asset})
+    cursor.execute('''insert into credits values(:block_index, :address, :asset, :quantity, :action, :event)''',
+                   {'block_index': util.CURRENT_BLOCK_INDEX, 'address': address, 'asset': asset,
+                    'quantity': quantity, 'action': action, 'event': event})
+    cursor.close()
+    util.BLOCK_LEDGER.append('{}{}{}{}'.format(util.CURRENT_BLOCK_INDEX, address, asset, quantity))
+
+def dividend(db, debit, credit):
+    debit(db, [('issuer', config.XCP, HOLDERS, 'dividend', 'benchmark')])
+    credit(db, [('holder{}'.format(i), config.XCP, 1, 'dividend', 'benchmark') for i in range(HOLDERS)])
+
+def mpma(db, debit, credit):
+    credit(db, [('destination{}'.format(i), 'BENCHMARK{}'.format(i % 10), 1, 'mpma send', 'benchmark') for i in range(DESTINATIONS)])
+    debit(db, [('issuer', 'BENCHMARK{}'.format(i), DESTINATIONS // 10, 'mpma send', 'benchmark') for i in range(10)])
+
+def one_by_one(ledger):
+    def apply(db, entries):
+        for entry in entries:
+            ledger(db, *entry)
+    return apply
+
+def run(db, operation, debit, credit):
+    """Run `operation` in a transaction that is rolled back, return the time it
+    took and the balances it left."""
+    cursor = db.cursor()
+    cursor.execute('''BEGIN''')
+    try:
+        util.BLOCK_LEDGER = []
+        start = time.perf_counter()
+        operation(db, debit, credit)
+        util.flush_balances()
+        elapsed = time.perf_counter() - start
+        balances = list(cursor.execute('''SELECT rowid, * FROM balances ORDER BY rowid'''))
+    finally:
+        util.reset_balances()
+        cursor.execute('''ROLLBACK''')
+        cursor.close()
+    return elapsed, balances
+
+data_dir = tempfile.mkdtemp()
+database_file = os.path.join(data_dir, 'benchmark.db')
+db = apsw.Connection(database_file)
+cursor = db.cursor()
+with open(FIXTURE, 'r') as sql_dump:
+    cursor.execute(sql_dump.read())
+with db:
+    block_index = list(cursor.execute('''SELECT MAX(block_index) FROM blocks'''))[0][0]
+    cursor.execute('''INSERT INTO balances VALUES(?, ?, ?)''', ('issuer', config.XCP, HOLDERS))
+    for i in range(10):
+        cursor.execute('''INSERT INTO balances VALUES(?, ?, ?)''', ('issuer', 'BENCHMARK{}'.format(i), DESTINATIONS))
+    for i in range(HOLDERS // 2):
+        # Half of the holders already have a balance.
+        cursor.execute('''INSERT INTO balances VALUES(?, ?, ?)''', ('holder{}'.format(i), config.XCP, i))
+db.close()
+
+server.initialise_config(database_file=database_file, testnet=True, log_file=False, api_log_file=False,
+                         backend_password='benchmark', rpc_password='benchmark')
+db = database.get_connection(read_only=False, integrity_check=False)
+util.CURRENT_BLOCK_INDEX = block_index
+
+for name, operation in (('dividend', dividend), ('mpma', mpma)):
+    results = {}
+    for i in range(ROUNDS):
+        for variant, debit, credit in (('legacy', one_by_one(legacy_debit), one_by_one(legacy_credit)),
+                                       ('cached', one_by_one(util.debit), one_by_one(util.credit)),
+                                       ('batched', util.debit_many, util.credit_many)):
+            elapsed, balances = run(db, operation, debit, credit)
+            if variant not in results or elapsed < results[variant][0]:
+                results[variant] = elapsed, balances
+    assert results['legacy'][1] == results['cached'][1] == results['batched'][1]
+    print(name)
+    for variant, (elapsed, balances) in results.items():
+        print("  %-7s %.3fs" % (variant, elapsed))
+
+db.close()
+shutil.rmtree(data_dir)
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+
+# Benchmark the parsing of the blocks of the unit test fixture, committed by
+# batches of K blocks as `follow()` does during catch-up:
+#
+#   python3 tools/benchmarkcommit.py [K,...]
+
+import os
+import sys
+import time
+import collections
+import shutil
+import tempfile
+
+import apsw
+
+from counterpartylib import server
+from counterpartylib.lib import config, util, database, blocks, check
+
+SIZES = [int(k) for k in sys.argv[1].split(',')] if len(sys.argv) > 1 else [1, 10, 100]
+# The fixture has no raw blocks, and the outpoint index is disabled.
+NO_BLOCK = collections.namedtuple('Block', ['vtx'])([])
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'counterpartylib', 'test', 'fixtures', 'scenarios', 'unittest_fixture.sql')
+
+def load_fixture(database_file):
+    db = apsw.Connection(database_file)
+    cursor = db.cursor()
+    with open(FIXTURE, 'r') as sql_dump:
+        cursor.execute(sql_dump.read())
+    cursor.close()
+    db.close()
+
+def benchmark(database_file, size):
+    # Take the blocks and transactions out of the fixture, to list them again.
+    db = database.get_connection(read_only=False, foreign_keys=False, integrity_check=False)
+    cursor = db.cursor()
+    chain = list(cursor.execute('''SELECT * FROM blocks ORDER BY block_index'''))
+    transactions = list(cursor.execute('''SELECT * FROM transactions ORDER BY tx_index'''))
+    with db:
+        cursor.execute('''DELETE FROM transactions''')
+        cursor.execute('''DELETE FROM blocks''')
+        blocks.reinitialise(db)
+    cursor.close()
+    db.close()
+
+    db = database.get_connection(read_only=False, integrity_check=False)
+    cursor = db.cursor()
+
+    batch = blocks.BlockBatch(db, size, float('inf'))
+    start = time.time()
+    for block in chain:
+        batch.begin()
+        with db:
+            util.CURRENT_BLOCK_INDEX = block['block_index']
+            cursor.execute('''INSERT INTO blocks(block_index, block_hash, block_time, previous_block_hash, difficulty)
+                              VALUES(:block_index, :block_hash, :block_time, :previous_block_hash, :difficulty)''', block)
+            for tx in transactions:
+                if tx['block_index'] == block['block_index']:
+                    cursor.execute('''INSERT INTO transactions(tx_index, tx_hash, block_index, block_hash, block_time,
+                                                               source, destination, btc_amount, fee, data, supported)
+                                      VALUES(:tx_index, :tx_hash, :block_index, :block_hash, :block_time,
+                                             :source, :destination, :btc_amount, :fee, :data, :supported)''', tx)
+            blocks.parse_block(db, block['block_index'], block['block_time'])
+        batch.block_parsed(block['block_index'], NO_BLOCK, block is chain[-1])
+    elapsed = time.time() - start
+
+    cursor.close()
+    db.close()
+    return len(chain), elapsed
+
+# The fixture isn't the real testnet, as for the test suite.
+check.CHECKPOINTS_TESTNET = {}
+
+data_dir = tempfile.mkdtemp()
+template = os.path.join(data_dir, 'fixture.db')
+load_fixture(template)
+
+for size in SIZES:
+    database_file = os.path.join(data_dir, 'benchmark{}.db'.format(size))
+    shutil.copy(template, database_file)
+    server.initialise_config(database_file=database_file, testnet=True, log_file=False, api_log_file=False,
+                             backend_password='benchmark', rpc_password='benchmark')
+    block_count, elapsed = benchmark(database_file, size)
+    print("K = %3d  %d blocks  %.3fs  %.1f blocks/s" % (size, block_count, elapsed, block_count / elapsed))
+
+shutil.rmtree(data_dir)
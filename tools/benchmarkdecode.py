@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+
+# Benchmark `blocks.get_block_tx_info()` on a synthetic block, for several
+# numbers of decoding processes:
+#
+#   python3 tools/benchmarkdecode.py [TX_COUNT] [WORKERS,...]
+
+import os
+import sys
+import time
+import tempfile
+
+from bitcoin.core import CMutableTransaction, CMutableTxIn, CMutableTxOut, COutPoint, b2lx, b2x
+from bitcoin.core.script import CScript, OP_DUP, OP_HASH160, OP_EQUALVERIFY, OP_CHECKSIG, OP_RETURN
+
+from counterpartylib import server
+from counterpartylib.lib import config, util, database, blocks, arc4
+
+TX_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+WORKERS = [int(w) for w in sys.argv[2].split(',')] if len(sys.argv) > 2 else [0, 2, 4, os.cpu_count()]
+XCP_RATIO = 10  # one Counterparty transaction every XCP_RATIO transactions
+ROUNDS = 5
+
+def p2pkh(i):
+    return CScript([OP_DUP, OP_HASH160, util.dhash(str(i))[:20], OP_EQUALVERIFY, OP_CHECKSIG])
+
+def make_block():
+    raw_transactions = {}
+    txhash_list = []
+
+    def add(tx):
+        tx_hash = b2lx(tx.GetTxid())
+        raw_transactions[tx_hash] = b2x(tx.serialize())
+        txhash_list.append(tx_hash)
+
+    for i in range(TX_COUNT):
+        if i % XCP_RATIO == 0:
+            # Counterparty transactions spend from a transaction of the same block.
+            funding = CMutableTransaction([CMutableTxIn(COutPoint(util.dhash(str(i)), 0))], [CMutableTxOut(100000, p2pkh(i))])
+            add(funding)
+            funding_hash = funding.GetTxid()
+            data = config.PREFIX + b'\x00\x00\x00\x00' + i.to_bytes(28, 'big')
+            data = arc4.init_arc4(funding_hash[::-1]).encrypt(data)
+            vout = [CMutableTxOut(5430, p2pkh(i + 1)), CMutableTxOut(0, CScript([OP_RETURN, data])), CMutableTxOut(80000, p2pkh(i))]
+            add(CMutableTransaction([CMutableTxIn(COutPoint(funding_hash, 0))], vout))
+        else:
+            vout = [CMutableTxOut(50000, p2pkh(i + 1)), CMutableTxOut(40000, p2pkh(i))]
+            add(CMutableTransaction([CMutableTxIn(COutPoint(util.dhash(str(i)), 0))], vout))
+
+    return txhash_list, raw_transactions
+
+# The decoding processes are spawned, and import this module: only run the
+# benchmark in the main process.
+if __name__ == '__main__':
+    server.initialise_config(database_file=os.path.join(tempfile.mkdtemp(), 'benchmark.db'), testnet=True, log_file=False, api_log_file=False, backend_password='benchmark', rpc_password='benchmark')
+    db = database.get_connection(read_only=False, foreign_keys=False, integrity_check=False)
+    blocks.initialise(db)
+    util.CURRENT_BLOCK_INDEX = 2000000
+
+    txhash_list, raw_transactions = make_block()
+    print("block of %d transactions, %d cpus" % (len(txhash_list), os.cpu_count()))
+
+    for workers in WORKERS:
+        config.TX_DECODE_WORKERS = workers
+        blocks.get_block_tx_info(db, txhash_list, raw_transactions)  # warm up the pool
+        start = time.time()
+        for i in range(ROUNDS):
+            tx_info = blocks.get_block_tx_info(db, txhash_list, raw_transactions)
+        elapsed = (time.time() - start) / ROUNDS
+        assert len([info for info in tx_info.values() if info[0]]) == TX_COUNT // XCP_RATIO
+        print("workers: %2d  %.3fs/block  %.2f blocks/s" % (workers, elapsed, 1 / elapsed))
+
+        blocks.stop_decode_pool()
@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+
+# Benchmark the parsing of mempool transactions, each in a transaction of its
+# own rolled back with an exception (as `follow()` used to), against
+# `blocks.MempoolSpeculation`:
+#
+#   python3 tools/benchmarkmempool.py [TX_COUNT]
+
+import os
+import sys
+import time
+import struct
+import tempfile
+import collections
+
+from bitcoin.core import CMutableTransaction, CMutableTxIn, CMutableTxOut, COutPoint, b2lx, b2x
+from bitcoin.core.script import CScript, OP_DUP, OP_HASH160, OP_EQUALVERIFY, OP_CHECKSIG, OP_RETURN
+
+from counterpartylib import server
+from counterpartylib.lib import config, util, database, blocks, arc4, outpoints
+
+TX_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+XCP_RATIO = 2  # one Counterparty transaction every XCP_RATIO transactions
+ROUNDS = 3
+
+FakeBlock = collections.namedtuple('FakeBlock', ['vtx'])
+
+class Rollback(Exception):
+    pass
+
+def p2pkh(i):
+    return CScript([OP_DUP, OP_HASH160, util.dhash(str(i))[:20], OP_EQUALVERIFY, OP_CHECKSIG])
+
+def make_mempool():
+    """Return the funding transactions and the mempool, as a dict of tx_hash → tx_hex."""
+    funding_txs, mempool = [], collections.OrderedDict()
+    for i in range(TX_COUNT):
+        funding = CMutableTransaction([CMutableTxIn(COutPoint(util.dhash(str(i)), 0))], [CMutableTxOut(100000, p2pkh(i))])
+        funding_txs.append(funding)
+        funding_hash = funding.GetTxid()
+        if i % XCP_RATIO == 0:
+            # Send 1 XCP.
+            data = config.PREFIX + struct.pack(config.TXTYPE_FORMAT, 0) + struct.pack('>QQ', 1, 100000000)
+            data = arc4.init_arc4(funding_hash[::-1]).encrypt(data)
+            vout = [CMutableTxOut(5430, p2pkh(i + 1)), CMutableTxOut(0, CScript([OP_RETURN, data])), CMutableTxOut(80000, p2pkh(i))]
+        else:
+            vout = [CMutableTxOut(50000, p2pkh(i + 1)), CMutableTxOut(40000, p2pkh(i))]
+        tx = CMutableTransaction([CMutableTxIn(COutPoint(funding_hash, 0))], vout)
+        mempool[b2lx(tx.GetTxid())] = b2x(tx.serialize())
+    return funding_txs, mempool
+
+def parse_legacy(db, mempool, block_index, tx_index, curr_time):
+    messages = {}
+    cursor = db.cursor()
+    for tx_hash, tx_hex in mempool.items():
+        try:
+            with db:
+                cursor.execute('''INSERT INTO blocks(block_index, block_hash, block_time) VALUES(?,?,?)''',
+                               (config.MEMPOOL_BLOCK_INDEX, config.MEMPOOL_BLOCK_HASH, curr_time))
+                tx_index = blocks.list_tx(db, None, block_index, curr_time, tx_hash, tx_index=tx_index, tx_hex=tx_hex)
+                transactions = list(cursor.execute('''SELECT * FROM transactions WHERE tx_hash = ?''', (tx_hash,)))
+                if transactions:
+                    blocks.parse_tx(db, transactions[0])
+                messages[tx_hash] = list(cursor.execute('''SELECT * FROM messages WHERE block_index = ?''', (config.MEMPOOL_BLOCK_INDEX,)))
+                raise Rollback
+        except Rollback:
+            pass
+    cursor.close()
+    return messages
+
+def parse_speculative(db, mempool, block_index, tx_index, curr_time):
+    messages = {}
+    with blocks.MempoolSpeculation(db, curr_time) as speculation:
+        for tx_hash, tx_hex in mempool.items():
+            supported, messages[tx_hash], tx_index = speculation.parse(tx_hash, tx_hex, block_index, tx_index)
+    return messages
+
+data_dir = tempfile.mkdtemp()
+server.initialise_config(database_file=os.path.join(data_dir, 'benchmark.db'), testnet=True, log_file=False, api_log_file=False,
+                         backend_password='benchmark', rpc_password='benchmark', outpoint_index=True)
+db = database.get_connection(read_only=False, foreign_keys=False, integrity_check=False)
+blocks.initialise(db)
+util.CURRENT_BLOCK_INDEX = 2000000
+
+funding_txs, mempool = make_mempool()
+outpoints.index_block(FakeBlock(funding_txs), util.CURRENT_BLOCK_INDEX)
+
+# Fund the senders.
+block_index, tx_index = util.CURRENT_BLOCK_INDEX + 1, 0
+with db:
+    db.cursor().execute('''INSERT INTO blocks(block_index, block_hash, block_time) VALUES(?,?,?)''', (util.CURRENT_BLOCK_INDEX, 'benchmark', 0))
+    for tx_hash, tx_hex in mempool.items():
+        source = blocks.get_tx_info(tx_hex, db=db)[0]
+        if source:
+            util.credit(db, source, config.XCP, 10 * config.UNIT, action='benchmark', event=tx_hash)
+print("mempool of %d transactions, %d Counterparty transactions" % (len(mempool), TX_COUNT // XCP_RATIO))
+
+timings = collections.defaultdict(list)
+for i in range(ROUNDS):
+    for name, parse in (('legacy', parse_legacy), ('speculative', parse_speculative)):
+        start = time.time()
+        messages = parse(db, mempool, block_index, tx_index, int(start))
+        timings[name].append(time.time() - start)
+        assert len([tx_hash for tx_hash in messages if messages[tx_hash]]) == TX_COUNT // XCP_RATIO
+
+for name, elapsed in timings.items():
+    print("%-12s %.3fs  %.3fms/tx" % (name, min(elapsed), 1000 * min(elapsed) / len(mempool)))
+
+outpoints.close()
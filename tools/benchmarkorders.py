@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+
+# Benchmark `order.match()` for new orders on a pair with RESTING open orders,
+# on the database of the unit test fixture:
+#
+#   python3 tools/benchmarkorders.py [ROUNDS]
+#
+# - crossing: the new order is filled by the few best resting orders.
+# - not crossing: the new order is below the best resting price.
+#
+# The new orders of each kind are matched one after the other, then rolled
+# back. The digest of the orders and order matches is printed, to compare the
+# results of two revisions.
+
+import os
+import sys
+import time
+import random
+import shutil
+import hashlib
+import tempfile
+
+import apsw
+
+from counterpartylib import server
+from counterpartylib.lib import config, util, database, blocks
+from counterpartylib.lib.messages import order
+
+ROUNDS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+RESTING = 10000
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'counterpartylib', 'test', 'fixtures', 'scenarios', 'unittest_fixture.sql')
+
+def insert_order(cursor, tx_index, block, source, give_asset, give_quantity, get_asset, get_quantity):
+    tx = {'tx_index': tx_index, 'tx_hash': 'benchmark{}'.format(tx_index), 'block_index': block['block_index'],
+          'block_hash': block['block_hash'], 'block_time': block['block_time'], 'source': source,
+          'destination': None, 'btc_amount': 0, 'fee': 10000, 'data': b'', 'supported': 1}
+    cursor.execute('''INSERT INTO transactions VALUES(:tx_index, :tx_hash, :block_index, :block_hash, :block_time,
+                      :source, :destination, :btc_amount, :fee, :data, :supported)''', tx)
+    cursor.execute('''INSERT INTO orders VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                   (tx_index, tx['tx_hash'], block['block_index'], source, give_asset, give_quantity, give_quantity,
+                    get_asset, get_quantity, get_quantity, 2000, block['block_index'] + 2000, 0, 0, 10000, 10000, 'open'))
+    return tx
+
+def run(db, cursor, new_orders):
+    """Match the new orders one after the other, as in a block, return the
+    time it took and a digest of the results, then roll them back."""
+    digest = hashlib.sha256()
+    elapsed = 0
+    cursor.execute('''SAVEPOINT benchmark''')
+    try:
+        for new_order in new_orders:
+            tx = insert_order(cursor, *new_order)
+            start = time.perf_counter()
+            order.match(db, tx)
+            util.flush_balances()
+            elapsed += time.perf_counter() - start
+        for table in ('orders', 'order_matches'):
+            digest.update(repr(list(cursor.execute('''SELECT * FROM {} ORDER BY rowid'''.format(table)))).encode('utf-8'))
+    finally:
+        util.reset_balances()
+        cursor.execute('''ROLLBACK TO SAVEPOINT benchmark''')
+        cursor.execute('''RELEASE SAVEPOINT benchmark''')
+    return elapsed, digest.hexdigest()
+
+data_dir = tempfile.mkdtemp()
+database_file = os.path.join(data_dir, 'benchmark.db')
+db = apsw.Connection(database_file)
+cursor = db.cursor()
+with open(FIXTURE, 'r') as sql_dump:
+    cursor.execute(sql_dump.read())
+db.close()
+
+server.initialise_config(database_file=database_file, testnet=True, log_file=False, api_log_file=False,
+                         backend_password='benchmark', rpc_password='benchmark')
+db = database.get_connection(read_only=False, integrity_check=False)
+cursor = db.cursor()
+cursor.setexectrace(None) # not messages
+config.BLOCK_FIRST = list(cursor.execute('''SELECT MIN(block_index) AS block_index FROM blocks'''))[0]['block_index']
+blocks.initialise(db)
+block = list(cursor.execute('''SELECT * FROM blocks ORDER BY block_index DESC LIMIT 1'''))[0]
+util.CURRENT_BLOCK_INDEX = block['block_index']
+
+rand = random.Random(0)
+with db:
+    for i in range(RESTING):
+        # Asking between 1 and 2 DIVISIBLE per XCP.
+        insert_order(cursor, 100000 + i, block, 'resting{}'.format(i), config.XCP, 100000000,
+                     'DIVISIBLE', rand.randrange(100000000, 200000000))
+
+tx_indexes = iter(range(200000, 300000))
+crossing = [(next(tx_indexes), block, 'mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc', 'DIVISIBLE', 300000000, config.XCP, 200000000)
+            for i in range(ROUNDS)]
+not_crossing = [(next(tx_indexes), block, 'mn6q3dS2EnDUx3bmyWc6D4szJNVGtaR7zc', 'DIVISIBLE', 90000000, config.XCP, 100000000)
+                for i in range(ROUNDS)]
+
+print('%d resting orders, %d new orders' % (RESTING, ROUNDS))
+for name, new_orders in (('crossing', crossing), ('not crossing', not_crossing)):
+    elapsed, digest = run(db, cursor, new_orders)
+    print('  %-12s %7.2fms per order  %s' % (name, elapsed / ROUNDS * 1000, digest[:16]))
+
+db.close()
+shutil.rmtree(data_dir)
@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+
+# Benchmark rolling back BLOCKS busy blocks with the undolog, against the
+# undolog as it was, where each record was the SQL statement undoing a change
+# and the rollback executed them one by one, on the database of the unit test
+# fixture:
+#
+#   python3 tools/benchmarkrollback.py [BLOCKS]
+#
+# In each block, CHANGES balances are updated (a tenth of them new), with as
+# many credits and debits, and a few orders are updated.
+
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+
+import apsw
+
+from counterpartylib import server
+from counterpartylib.lib import config, database, blocks
+
+BLOCKS = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+CHANGES = 200
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'counterpartylib', 'test', 'fixtures', 'scenarios', 'unittest_fixture.sql')
+
+def legacy_create_undolog(cursor):
+    """The undolog table and triggers as they were."""
+    cursor.execute('''CREATE TABLE undolog(undo_index INTEGER PRIMARY KEY AUTOINCREMENT, sql TEXT)''')
+    for table in blocks.UNDOLOG_TABLES:
+        columns = [column['name'] for column in cursor.execute('''PRAGMA table_info({})'''.format(table))]
+        cursor.execute('''CREATE TRIGGER _{}_insert AFTER INSERT ON {} BEGIN
+                            INSERT INTO undolog VALUES(NULL, 'DELETE FROM {} WHERE rowid='||new.rowid);
+                            END;
+                       '''.format(table, table, table))
+        columns_parts = ["{}='||quote(old.{})||'".format(c, c) for c in columns]
+        cursor.execute('''CREATE TRIGGER _{}_update AFTER UPDATE ON {} BEGIN
+                            INSERT INTO undolog VALUES(NULL, 'UPDATE {} SET {} WHERE rowid='||old.rowid);
+                            END;
+                       '''.format(table, table, table, ','.join(columns_parts)))
+        columns_parts = ["'||quote(old.{})||'".format(c) for c in columns]
+        cursor.execute('''CREATE TRIGGER _{}_delete BEFORE DELETE ON {} BEGIN
+                            INSERT INTO undolog VALUES(NULL, 'INSERT INTO {}(rowid,{}) VALUES('||old.rowid||',{})');
+                            END;
+                       '''.format(table, table, table, ','.join(columns), ','.join(columns_parts)))
+
+def legacy_rollback(cursor, first_undo_index):
+    """The rollback as it was, without the logging of each statement."""
+    for undo_index, sql in list(cursor.execute('''SELECT undo_index, sql FROM undolog WHERE undo_index >= ?
+                                                  ORDER BY undo_index DESC''', (first_undo_index,))):
+        cursor.execute(sql)
+
+def workload(cursor, block_index):
+    addresses = [row[0] for row in cursor.execute('''SELECT DISTINCT address FROM balances''')]
+    orders = [row[0] for row in cursor.execute('''SELECT rowid FROM orders''')]
+    rand = random.Random(0)
+    for i in range(BLOCKS):
+        for j in range(CHANGES):
+            if j % 10 == 0:
+                address = 'benchmark{}-{}'.format(i, j)
+                cursor.execute('''INSERT INTO balances VALUES(?, ?, ?)''', (address, config.XCP, j))
+            else:
+                address = rand.choice(addresses)
+                cursor.execute('''UPDATE balances SET quantity = quantity + 1 WHERE address = ? AND asset = ?''', (address, config.XCP))
+            ledger = 'credits' if j % 2 else 'debits'
+            cursor.execute('''INSERT INTO {} VALUES(?, ?, ?, ?, ?, ?)'''.format(ledger), (block_index, address, config.XCP, 1, 'benchmark', 'benchmark'))
+        for rowid in rand.sample(orders, 5):
+            cursor.execute('''UPDATE orders SET give_remaining = give_remaining - 1 WHERE rowid = ?''', (rowid,))
+
+def undolog_size(cursor):
+    """The size of the undolog, as the size of a database with only it."""
+    copy_file = os.path.join(data_dir, 'undolog.db')
+    cursor.execute('''ATTACH ? AS copy''', (copy_file,))
+    cursor.execute('''CREATE TABLE copy.undolog AS SELECT * FROM main.undolog''')
+    cursor.execute('''DETACH copy''')
+    size = os.path.getsize(copy_file)
+    os.remove(copy_file)
+    return size
+
+def run(db, create_undolog, rollback):
+    cursor = db.cursor()
+    cursor.setexectrace(None)
+    cursor.setrowtrace(None)
+    def tables():
+        return dict((table, list(cursor.execute('''SELECT rowid, * FROM {} ORDER BY rowid'''.format(table))))
+                    for table in blocks.UNDOLOG_TABLES)
+    setup_cursor = db.cursor()
+    setup_cursor.setexectrace(None)
+    with db:
+        blocks.drop_undolog_triggers(setup_cursor)
+        setup_cursor.execute('''DROP TABLE undolog''')
+        create_undolog(setup_cursor)
+    setup_cursor.close()
+    before = tables()
+    block_index = list(cursor.execute('''SELECT MAX(block_index) FROM blocks'''))[0][0]
+    with db:
+        workload(cursor, block_index)
+    records = list(cursor.execute('''SELECT COUNT(*) FROM undolog'''))[0][0]
+    size = undolog_size(cursor)
+    first_undo_index = list(cursor.execute('''SELECT MIN(undo_index) FROM undolog'''))[0][0]
+    start = time.perf_counter()
+    with db:
+        rollback(cursor, first_undo_index)
+    elapsed = time.perf_counter() - start
+    assert tables() == before
+    cursor.close()
+    return records, size, elapsed
+
+data_dir = tempfile.mkdtemp()
+database_file = os.path.join(data_dir, 'benchmark.db')
+db = apsw.Connection(database_file)
+cursor = db.cursor()
+with open(FIXTURE, 'r') as sql_dump:
+    cursor.execute(sql_dump.read())
+db.close()
+
+server.initialise_config(database_file=database_file, testnet=True, log_file=False, api_log_file=False,
+                         backend_password='benchmark', rpc_password='benchmark')
+db = database.get_connection(read_only=False, integrity_check=False)
+
+def create_undolog(cursor):
+    blocks.create_undolog_table(cursor)
+    blocks.create_undolog_triggers(cursor)
+
+print('%d blocks of %d changes' % (BLOCKS, CHANGES))
+for variant, create, rollback in (('legacy', legacy_create_undolog, legacy_rollback),
+                                  ('structured', create_undolog, blocks.rollback_undolog)):
+    records, size, elapsed = run(db, create, rollback)
+    print('  %-10s %6d records  %6.2f MB  rollback %.3fs' % (variant, records, size / 1e6, elapsed))
+
+db.close()
+shutil.rmtree(data_dir)
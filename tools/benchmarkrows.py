@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+
+# Benchmark the cost per fetched row of the row tracers, on the database of the
+# unit test fixture:
+#
+#   python3 tools/benchmarkrows.py [ROUNDS]
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+import apsw
+
+from counterpartylib import server
+from counterpartylib.lib import config, database, api
+
+ROUNDS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+ROW_COUNT = 20000  # more balances and credits than in the fixture
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'counterpartylib', 'test', 'fixtures', 'scenarios', 'unittest_fixture.sql')
+
+def select_balances(cursor):
+    return list(cursor.execute('''SELECT * FROM balances'''))
+
+def select_credits(db):
+    """The query of `get_rows('credits')`, with the row tracer of the connection."""
+    return list(db.cursor().execute('''SELECT * FROM credits LIMIT 1000'''))
+
+def get_rows_credits(db):
+    """`get_rows()` builds its dicts from tuples (see `database.dict_rows()`)."""
+    return api.get_rows(db, 'credits', limit=1000)
+
+QUERIES = (
+    ('SELECT * FROM balances', (
+        ('dict', lambda db: select_balances(db.cursor())),
+        ('Row', lambda db: select_balances(database.row_cursor(db))),
+        ('tuple', lambda db: select_balances(database.tuple_cursor(db))),
+    )),
+    # `get_rows()` returns dicts, for JSON.
+    ("get_rows('credits')", (
+        ('dict', select_credits),
+        ('tuple', get_rows_credits),
+    )),
+)
+
+data_dir = tempfile.mkdtemp()
+database_file = os.path.join(data_dir, 'benchmark.db')
+db = apsw.Connection(database_file)
+cursor = db.cursor()
+with open(FIXTURE, 'r') as sql_dump:
+    cursor.execute(sql_dump.read())
+with db:
+    block_index = list(cursor.execute('''SELECT MAX(block_index) FROM blocks'''))[0][0]
+    for i in range(ROW_COUNT):
+        address = 'benchmark{}'.format(i)
+        cursor.execute('''INSERT INTO balances VALUES(?, ?, ?)''', (address, config.XCP, i))
+        cursor.execute('''INSERT INTO credits VALUES(?, ?, ?, ?, ?, ?)''', (block_index, address, config.XCP, i, 'benchmark', 'benchmark'))
+db.close()
+
+server.initialise_config(database_file=database_file, testnet=True, log_file=False, api_log_file=False,
+                         backend_password='benchmark', rpc_password='benchmark')
+db = database.get_connection(read_only=True, integrity_check=False)
+
+for name, queries in QUERIES:
+    print(name)
+    for row_name, query in queries:
+        row_count = len(query(db))
+        timings = []
+        for i in range(ROUNDS):
+            start = time.time()
+            query(db)
+            timings.append(time.time() - start)
+        print("  %-6s %5d rows  %.0fns/row" % (row_name, row_count, 1e9 * min(timings) / row_count))
+
+db.close()
+shutil.rmtree(data_dir)
@@ -0,0 +1,130 @@
+#!/usr/bin/python3
+
+# Measure the time spent in `database.exectracer` while parsing the blocks of
+# the unit test fixture, against the exec tracer as it was, which classified
+# each statement on every call:
+#
+#   python3 tools/benchmarktracer.py [ROUNDS]
+
+import os
+import sys
+import time
+import copy
+import shutil
+import tempfile
+
+import apsw
+
+from counterpartylib import server
+from counterpartylib.lib import config, util, database, blocks, check, log
+
+ROUNDS = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'counterpartylib', 'test', 'fixtures', 'scenarios', 'unittest_fixture.sql')
+
+def legacy_exectracer(cursor, sql, bindings):
+    """The exec tracer as it was."""
+    sql = sql.lower()
+
+    if sql.startswith('create trigger') or sql.startswith('drop trigger'):
+        return True
+
+    array = sql.split('(')[0].split(' ')
+    command = array[0]
+    if 'insert' in sql:
+        category = array[2]
+    elif 'update' in sql:
+        category = array[1]
+    else:
+        return True
+
+    db = cursor.getconnection()
+    dictionary = {'command': command, 'category': category, 'bindings': bindings}
+
+    skip_tables = [
+        'blocks', 'transactions',
+        'balances', 'messages', 'mempool', 'assets',
+        'new_sends', 'new_issuances'
+    ]
+    skip_tables_block_messages = copy.copy(skip_tables)
+    if command == 'update':
+        skip_tables += ['orders', 'bets', 'rps', 'order_matches', 'bet_matches', 'rps_matches']
+
+    if category not in skip_tables:
+        log.message(db, bindings['block_index'], command, category, bindings)
+    if category not in skip_tables_block_messages and util.SPECULATIVE_MESSAGES is None:
+        if category == 'issuances' and not util.enabled('subassets'):
+            if isinstance(bindings, dict) and 'asset_longname' in bindings: del bindings['asset_longname']
+        if category == 'sends' and not util.enabled('enhanced_sends'):
+            if isinstance(bindings, dict) and 'memo' in bindings: del bindings['memo']
+        sorted_bindings = sorted(bindings.items()) if isinstance(bindings, dict) else [bindings,]
+        database.BLOCK_MESSAGES.append('{}{}{}'.format(command, category, sorted_bindings))
+
+    return True
+
+def timed(exectracer, timing):
+    def timed_exectracer(cursor, sql, bindings):
+        start = time.perf_counter()
+        try:
+            return exectracer(cursor, sql, bindings)
+        finally:
+            timing[0] += time.perf_counter() - start
+            timing[1] += 1
+    return timed_exectracer
+
+def reparse(database_file, exectracer):
+    """Parse all the blocks again, return the time spent in total and in the tracer, and the messages hashes."""
+    db = database.get_connection(read_only=False, integrity_check=False)
+    timing = [0, 0]
+    db.setexectrace(timed(exectracer, timing))
+    cursor = db.cursor()
+    chain = list(cursor.execute('''SELECT * FROM blocks ORDER BY block_index'''))
+    with db:
+        blocks.reinitialise(db)
+    start = time.perf_counter()
+    messages_hashes = []
+    previous_ledger_hash, previous_txlist_hash, previous_messages_hash = None, None, None
+    for block in chain:
+        util.CURRENT_BLOCK_INDEX = block['block_index']
+        with db:
+            previous_ledger_hash, previous_txlist_hash, previous_messages_hash, found_messages_hash = blocks.parse_block(
+                db, block['block_index'], block['block_time'],
+                previous_ledger_hash=previous_ledger_hash, previous_txlist_hash=previous_txlist_hash,
+                previous_messages_hash=previous_messages_hash)
+        messages_hashes.append(previous_messages_hash)
+    elapsed = time.perf_counter() - start
+    cursor.close()
+    db.close()
+    return elapsed, timing, messages_hashes
+
+data_dir = tempfile.mkdtemp()
+database_file = os.path.join(data_dir, 'benchmark.db')
+db = apsw.Connection(database_file)
+db.setrowtrace(database.rowtracer)
+cursor = db.cursor()
+with open(FIXTURE, 'r') as sql_dump:
+    cursor.execute(sql_dump.read())
+first_block = list(cursor.execute('''SELECT * FROM blocks ORDER BY block_index LIMIT 1'''))[0]
+db.close()
+server.initialise_config(database_file=database_file, testnet=True, log_file=False, api_log_file=False,
+                         backend_password='benchmark', rpc_password='benchmark')
+
+# The fixture isn't the real testnet: it starts with its own first block.
+config.BLOCK_FIRST = first_block['block_index']
+check.CHECKPOINTS_TESTNET = {config.BLOCK_FIRST: {'ledger_hash': first_block['ledger_hash'], 'txlist_hash': first_block['txlist_hash']}}
+
+results = {}
+for i in range(ROUNDS):
+    for name, exectracer in (('legacy', legacy_exectracer), ('memoized', database.exectracer)):
+        elapsed, timing, messages_hashes = reparse(database_file, exectracer)
+        if name in results:
+            assert messages_hashes == results[name][2]
+            if elapsed > results[name][0]:
+                continue
+        results[name] = elapsed, timing, messages_hashes
+assert results['legacy'][2] == results['memoized'][2]
+
+for name, (elapsed, (tracer_elapsed, calls), messages_hashes) in results.items():
+    print("%-9s %d blocks  %.3fs  exectracer: %d calls  %.3fs  %.2fus/call" % (
+        name, len(messages_hashes), elapsed, calls, tracer_elapsed, 1e6 * tracer_elapsed / calls))
+
+shutil.rmtree(data_dir)